@@ -10,18 +10,37 @@ Mostra:
   - Erros de tipos (se houver)
   - TAC gerado (loadI/load/add/mul/cmpeq/store)
 """
-from typing import List
-import os, importlib.util
+from types import ModuleType
+from typing import Any, Callable, Dict
+import os, sys, importlib.util
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Módulos já carregados (por caminho): evita reexecutar os templates
+_MOD_CACHE: Dict[str, ModuleType] = {}
+
+
 def _load(relpath: str, modname: str):
     path = os.path.join(BASE_DIR, relpath)
+    mod = _MOD_CACHE.get(path)
+    if mod is None:
+        mod = sys.modules.get(modname)
+        if mod is not None and getattr(mod, '__file__', None) != path:
+            mod = None  # mesmo nome, outro arquivo
+    if mod is not None:
+        _MOD_CACHE[path] = mod
+        return mod
     spec = importlib.util.spec_from_file_location(modname, path)
     if not spec or not spec.loader:
         raise ImportError(f"Não foi possível carregar {relpath}")
     mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)  # type: ignore
+    sys.modules[modname] = mod
+    try:
+        spec.loader.exec_module(mod)  # type: ignore
+    except BaseException:
+        sys.modules.pop(modname, None)
+        raise
+    _MOD_CACHE[path] = mod
     return mod
 
 # Reutiliza os nós e typechecker do Lab 06
@@ -35,55 +54,118 @@ Var = ast6.Var
 Num = ast6.Num
 TypeChecker = ast6.TypeChecker
 
+
 # Reutiliza o gerador de TAC do Lab 07
 tac7 = _load('labs/07_ast_ir/tac_template.py', 'tac7')
 TacGen = tac7.TacGen
+Instr = tac7.Instr
+
+
+Write = Callable[[str], Any]
+
 
+def _pp_program(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}Program\n")
+    for st in node.body:
+        pp_ast(st, write, indent + 1)
 
-def pp_ast(node, indent: int = 0) -> List[str]:
+
+def _pp_seq(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}Seq\n")
+    for st in node.items:
+        pp_ast(st, write, indent + 1)
+
+
+def _pp_assign(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}Assign {node.name}\n")
+    pp_ast(node.expr, write, indent + 1)
+
+
+def _pp_if(node, write: Write, indent: int) -> None:
     sp = '  ' * indent
-    out: List[str] = []
-    if isinstance(node, Program):
-        out.append(f"{sp}Program")
-        for st in node.body:
-            out += pp_ast(st, indent + 1)
-    elif isinstance(node, Seq):
-        out.append(f"{sp}Seq")
-        for st in node.items:
-            out += pp_ast(st, indent + 1)
-    elif isinstance(node, Assign):
-        out.append(f"{sp}Assign {node.name}")
-        out += pp_ast(node.expr, indent + 1)
-    elif isinstance(node, IfThenElse):
-        out.append(f"{sp}If")
-        out += pp_ast(node.cond, indent + 1)
-        out.append(f"{sp}Then:")
-        out += pp_ast(node.then_branch, indent + 1)
-        if node.else_branch is not None:
-            out.append(f"{sp}Else:")
-            out += pp_ast(node.else_branch, indent + 1)
-    elif isinstance(node, BinOp):
-        out.append(f"{sp}{node.op}")
-        out += pp_ast(node.left, indent + 1)
-        out += pp_ast(node.right, indent + 1)
-    elif isinstance(node, Var):
-        out.append(f"{sp}Var({node.name})")
-    elif isinstance(node, Num):
-        out.append(f"{sp}Num({node.value})")
+    write(f"{sp}If\n")
+    pp_ast(node.cond, write, indent + 1)
+    write(f"{sp}Then:\n")
+    pp_ast(node.then_branch, write, indent + 1)
+    if node.else_branch is not None:
+        write(f"{sp}Else:\n")
+        pp_ast(node.else_branch, write, indent + 1)
+
+
+def _pp_binop(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}{node.op}\n")
+    pp_ast(node.left, write, indent + 1)
+    pp_ast(node.right, write, indent + 1)
+
+
+def _pp_var(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}Var({node.name})\n")
+
+
+def _pp_num(node, write: Write, indent: int) -> None:
+    write(f"{'  ' * indent}Num({node.value})\n")
+
+
+# Despacho pelo tipo exato do nó (uma busca em dict em vez da escada de isinstance)
+_PP_HANDLERS: Dict[type, Callable[[Any, Write, int], None]] = {
+    Program: _pp_program,
+    Seq: _pp_seq,
+    Assign: _pp_assign,
+    IfThenElse: _pp_if,
+    BinOp: _pp_binop,
+    Var: _pp_var,
+    Num: _pp_num,
+}
+
+
+def pp_ast(node, write: Write, indent: int = 0) -> None:
+    """Escreve a AST linha a linha via write (ex.: sys.stdout.write, list.append)."""
+    handler = _PP_HANDLERS.get(type(node))
+    if handler is not None:
+        handler(node, write, indent)
     else:
-        out.append(f"{sp}{node}")
-    return out
+        write(f"{'  ' * indent}{node}\n")
+
+
+# Mesmo mapeamento de operadores do TacGen.gen_expr
+_TAC_OPS = {"+": "add", "*": "mul", "==": "cmpeq"}
 
 
 def gen_tac_from_program(p: Program) -> TacGen:
     g = TacGen()
-    for st in p.body:
-        if isinstance(st, Assign):
-            g.gen_assign(st.name, st.expr)
-        elif isinstance(st, Seq):
-            for it in st.items:
-                if isinstance(it, Assign):
-                    g.gen_assign(it.name, it.expr)
+    code = g.code
+    newtmp = g.newtmp
+    # nomes internados ao entrar no TAC (os literais dos exemplos já vêm internados)
+    intern = sys.intern
+
+    # Versão especializada de TacGen.gen_expr para Num/Var/BinOp: despacho por tipo
+    # exato em vez dos hasattr do gerador genérico; TAC idêntico.
+    def _emit(e) -> str:
+        te = type(e)
+        if te is BinOp:
+            a = _emit(e.left)
+            b = _emit(e.right)
+            t = newtmp()
+            code.append(Instr(_TAC_OPS.get(e.op, e.op), (a, b, t)))
+        elif te is Num:
+            t = newtmp()
+            code.append(Instr("loadI", (str(e.value), t)))
+        elif te is Var:
+            t = newtmp()
+            code.append(Instr("load", (intern(e.name), t)))
+        else:
+            return g.gen_expr(e)
+        return t
+
+    # Pilha explícita: Seq aninhados em qualquer profundidade, na ordem do fonte
+    stack = list(reversed(p.body))
+    while stack:
+        st = stack.pop()
+        t = type(st)
+        if t is Assign:
+            code.append(Instr("store", (_emit(st.expr), intern(st.name))))
+        elif t is Seq:
+            stack.extend(reversed(st.items))
         # IfThenElse e controle de fluxo não são cobertos neste demo simples
     return g
 
@@ -115,7 +197,7 @@ def exemplo_3_com_erro() -> Program:
 def run_case(p: Program, titulo: str):
     print(f"\n=== {titulo} ===")
     print("-- AST --")
-    print("\n".join(pp_ast(p)))
+    pp_ast(p, sys.stdout.write)
     tc = TypeChecker()
     errs = tc.check(p)
     if errs:
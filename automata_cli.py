@@ -5,21 +5,106 @@ CLI para construção de NFA/DFA a partir de regex, teste de cadeias e export em
 Exemplos:
   python3 automata_cli.py --regex "(a|b)*abb" --export-dfa-svg dfa.svg --export-nfa-dot nfa.dot --test abb
   python3 automata_cli.py --regex "a(b|c)+" --steps
+
+Também pode ser usado no mesmo processo (sem recarregar a lib a cada chamada):
+  import automata_cli; automata_cli.run(['--regex', 'ab', '--test', 'ab'])
 """
 import argparse
+from array import array
+import hashlib
 import os
+import pickle
+import sys
 import importlib.util
+from typing import List, Optional
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LIB_PATH = os.path.join(BASE_DIR, 'labs', '11_automatos', 'automata_lib.py')
-spec = importlib.util.spec_from_file_location('automata_lib', LIB_PATH)
-if spec is None or spec.loader is None:
-    raise ImportError('Não foi possível carregar automata_lib')
-lib = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(lib)  # type: ignore
+lib = sys.modules.get('automata_lib')
+if lib is None or getattr(lib, '__file__', None) != LIB_PATH:
+    spec = importlib.util.spec_from_file_location('automata_lib', LIB_PATH)
+    if spec is None or spec.loader is None:
+        raise ImportError('Não foi possível carregar automata_lib')
+    lib = importlib.util.module_from_spec(spec)
+    # Registrado antes de executar: o pickle do cache resolve automata_lib.DFA por nome
+    # e outros importadores no mesmo processo reaproveitam o módulo
+    sys.modules['automata_lib'] = lib
+    spec.loader.exec_module(lib)  # type: ignore
 
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'automata_cli')
 
-def main():
+
+def _cache_path(regex: str) -> str:
+    # A chave inclui o mtime da lib: DFAs gerados por outra versão são ignorados
+    h = hashlib.blake2b(regex.encode('utf-8'), digest_size=16)
+    h.update(str(os.stat(LIB_PATH).st_mtime_ns).encode())
+    return os.path.join(CACHE_DIR, h.hexdigest() + '.pkl')
+
+
+def _cache_load(regex: str):
+    try:
+        path = _cache_path(regex)
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    try:
+        mdfa, alpha = pickle.loads(data)
+    except Exception:
+        # arquivo corrompido ou de outra versão (qualquer erro do unpickle):
+        # descarta e deixa o chamador reconstruir
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return mdfa, alpha
+
+
+def _cache_store(regex: str, mdfa, alpha) -> None:
+    path = _cache_path(regex)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump((mdfa, alpha), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _dense_table(dfa, alpha):
+    """Projeta o DFA numa tabela densa nxt[q*k + c] (-1 = sem transição)."""
+    sym = {c: i for i, c in enumerate(sorted(alpha))}
+    states = sorted({dfa.start} | {s for s, _ in dfa.trans} | set(dfa.trans.values()) | set(dfa.accepts),
+                    key=lambda s: s.id)
+    sid = {s: i for i, s in enumerate(states)}
+    k = len(sym)
+    nxt = array('i', [-1]) * (len(states) * k)
+    for (s, a), t in dfa.trans.items():
+        nxt[sid[s] * k + sym[a]] = sid[t]
+    acc = bytes(s in dfa.accepts for s in states)
+    return nxt, k, sym, acc, sid[dfa.start]
+
+
+def _table_accepts(table, text: str) -> bool:
+    nxt, k, sym, acc, q = table
+    for ch in text:
+        c = sym.get(ch)
+        if c is None:
+            return False
+        q = nxt[q * k + c]
+        if q < 0:
+            return False
+    return acc[q] == 1
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Executa a CLI com argv (None = sys.argv[1:])."""
     ap = argparse.ArgumentParser(description='Automata CLI (regex → NFA/DFA/min)')
     ap.add_argument('--regex', required=True, help='Expressão regular (usa | . * + ? e parênteses)')
     ap.add_argument('--test', help='Cadeia a testar (sem espaço)')
@@ -28,35 +113,70 @@ def main():
     ap.add_argument('--export-nfa-dot')
     ap.add_argument('--export-dfa-dot')
     ap.add_argument('--steps', action='store_true', help='Imprime passos (Thompson, subset e minimização)')
-    args = ap.parse_args()
-
-    nfa, alpha, log = lib.regex_to_nfa_with_log(args.regex)
-    dfa = lib.nfa_to_dfa(nfa, alpha)
-    mdfa = lib.dfa_minimize(dfa, alpha)
-    if args.steps:
-        print('Passos (Thompson):')
-        for l in log: print('-', l)
-        print('Passos (subset):')
-        for s in lib.nfa_to_dfa_steps(nfa, alpha): print('-', s)
-        print('Passos (minimização):')
-        steps, parts = lib.dfa_minimize_steps(mdfa, alpha)
-        for l in steps: print('-', l)
+    ap.add_argument('--no-cache', action='store_true', help=f'Não usa o cache de DFAs em {CACHE_DIR}')
+    args = ap.parse_args(argv)
+
+    needs_nfa = bool(args.export_nfa_svg or args.export_nfa_dot)
+    needs_dfa = bool(args.test is not None or args.export_dfa_svg or args.export_dfa_dot or args.steps)
+    if not (needs_nfa or needs_dfa):
+        ap.print_usage(sys.stderr)
+        print('Nada a fazer: use --test, --steps ou --export-*.', file=sys.stderr)
+        return
+
+    nfa = mdfa = None
+    # --steps precisa do log de construção: sempre reconstrói
+    use_cache = needs_dfa and not (args.no_cache or args.steps)
+    cached = _cache_load(args.regex) if use_cache else None
+    if cached is not None:
+        mdfa, alpha = cached
+    elif needs_dfa:
+        nfa, alpha, log = lib.regex_to_nfa_with_log(args.regex)
+        if args.steps:
+            # As variantes com passos já devolvem o autômato: cada etapa roda uma vez só
+            dfa, subset_steps = lib.nfa_to_dfa_with_steps(nfa, alpha)
+            mdfa, min_steps, _ = lib.dfa_minimize_with_steps(dfa, alpha)
+            print('Passos (Thompson):')
+            for l in log: print('-', l)
+            print('Passos (subset):')
+            for s in subset_steps: print('-', s)
+            print('Passos (minimização):')
+            for l in min_steps: print('-', l)
+        else:
+            dfa = lib.nfa_to_dfa(nfa, alpha)
+            mdfa = lib.dfa_minimize(dfa, alpha)
+        del dfa
+        if not needs_nfa:
+            nfa = None  # só o DFA mínimo segue vivo
+        if use_cache:
+            _cache_store(args.regex, mdfa, alpha)
+    if needs_nfa and nfa is None:
+        # exports só de NFA não passam por subset/minimização
+        nfa, alpha, _ = lib.regex_to_nfa_with_log(args.regex)
     if args.test is not None:
-        ok = lib.dfa_accepts(mdfa, list(args.test))
+        ok = _table_accepts(_dense_table(mdfa, alpha), args.test)
         print('Teste:', 'ACEITA' if ok else 'REJEITA')
+    # Estados/arestas materializados uma vez por autômato, compartilhados pelos exports
+    if needs_nfa:
+        g_nfa = lib.materialize(nfa)
+    if args.export_dfa_svg or args.export_dfa_dot:
+        g_dfa = lib.materialize(mdfa)
     if args.export_nfa_svg:
-        lib.automaton_to_svg_nfa(nfa, alpha, args.export_nfa_svg)
+        lib.automaton_to_svg_nfa(nfa, alpha, args.export_nfa_svg, graph=g_nfa)
         print('NFA SVG salvo em:', args.export_nfa_svg)
     if args.export_dfa_svg:
-        lib.automaton_to_svg_dfa(mdfa, alpha, args.export_dfa_svg)
+        lib.automaton_to_svg_dfa(mdfa, alpha, args.export_dfa_svg, graph=g_dfa)
         print('DFA SVG salvo em:', args.export_dfa_svg)
     if args.export_nfa_dot:
-        lib.export_dot_nfa(nfa, args.export_nfa_dot)
+        lib.export_dot_nfa(nfa, args.export_nfa_dot, graph=g_nfa)
         print('NFA DOT salvo em:', args.export_nfa_dot)
     if args.export_dfa_dot:
-        lib.export_dot_dfa(mdfa, args.export_dfa_dot)
+        lib.export_dot_dfa(mdfa, args.export_dfa_dot, graph=g_dfa)
         print('DFA DOT salvo em:', args.export_dfa_dot)
 
 
+def main():
+    run()
+
+
 if __name__ == '__main__':
     main()
@@ -3,21 +3,44 @@
 CFG + Liveness Demo: constrói blocos básicos e CFG a partir de TAC com LABEL/CJMP,
 calcula USE/DEF por bloco e IN/OUT (vivacidade) e imprime resultados.
 """
-import os, importlib.util
+import os, sys, importlib.util
+from types import ModuleType
+from typing import Dict, List
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Módulos já carregados (por caminho): evita reexecutar os templates
+_MOD_CACHE: Dict[str, ModuleType] = {}
+
 
 def _load(relpath: str, modname: str):
     path = os.path.join(BASE_DIR, relpath)
+    mod = _MOD_CACHE.get(path)
+    if mod is None:
+        mod = sys.modules.get(modname)
+        if mod is not None and getattr(mod, '__file__', None) != path:
+            mod = None  # mesmo nome, outro arquivo
+    if mod is not None:
+        _MOD_CACHE[path] = mod
+        return mod
     spec = importlib.util.spec_from_file_location(modname, path)
     if not spec or not spec.loader:
         raise ImportError(f"Não foi possível carregar {relpath}")
     mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)  # type: ignore
+    sys.modules[modname] = mod
+    try:
+        spec.loader.exec_module(mod)  # type: ignore
+    except BaseException:
+        sys.modules.pop(modname, None)
+        raise
+    _MOD_CACHE[path] = mod
     return mod
 
 
+def _write_section(lines: List[str]) -> None:
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
 def main():
     # Exemplo com fluxo e bifurcação condicional (CJMP)
     code = [
@@ -41,25 +64,33 @@ def main():
     blocks_by_label = {b.label: b.instrs for b in blocks}
     cfg = cfgb.build_cfg(blocks)
 
-    IN, OUT, USE, DEF = live.liveness(blocks_by_label, cfg)
+    # CFG reverso calculado uma vez; a worklist reenfileira predecessores por ele
+    pred: Dict[str, List[str]] = {b: [] for b in blocks_by_label}
+    for u, ss in cfg.items():
+        for v in ss:
+            if v in pred:
+                pred[v].append(u)
+
+    # máscaras int (bit i = names[i]) sobre ids densos; nomes só voltam na impressão
+    IN, OUT, USE, DEF, names = live.liveness_bits(blocks_by_label, cfg, pred)
+    to_names = live.bits_to_names
 
-    print('--- Blocos ---')
+    # Uma escrita por seção
+    lines = ['--- Blocos ---']
     for b in blocks:
-        print(f"{b.label}: {len(b.instrs)} instr")
-        for op, args in b.instrs:
-            print(' ', op, *args)
+        lines.append(f"{b.label}: {len(b.instrs)} instr")
+        lines.extend(' '.join((' ', op, *args)) for op, args in b.instrs)
+    _write_section(lines)
 
-    print('\n--- CFG ---')
-    for k, v in cfg.items():
-        print(' ', k, '->', sorted(v))
+    _write_section(['\n--- CFG ---'] + [f"  {k} -> {sorted(v)}" for k, v in cfg.items()])
 
-    print('\n--- USE/DEF ---')
-    for b in blocks_by_label:
-        print(' ', b, 'USE=', sorted(USE[b]), 'DEF=', sorted(DEF[b]))
+    _write_section(['\n--- USE/DEF ---'] + [
+        f"  {b} USE= {to_names(USE[b], names)} DEF= {to_names(DEF[b], names)}"
+        for b in blocks_by_label])
 
-    print('\n--- IN/OUT ---')
-    for b in blocks_by_label:
-        print(' ', b, 'IN=', sorted(IN[b]), 'OUT=', sorted(OUT[b]))
+    _write_section(['\n--- IN/OUT ---'] + [
+        f"  {b} IN= {to_names(IN[b], names)} OUT= {to_names(OUT[b], names)}"
+        for b in blocks_by_label])
 
 
 if __name__ == '__main__':
@@ -8,7 +8,7 @@ import sys
 try:
     import tkinter as tk
     from tkinter import ttk, filedialog, messagebox
-except Exception as e:
+except Exception:
     sys.stderr.write(
         (
             "Erro: Tkinter (tk) não está disponível neste Python.\n"
@@ -21,35 +21,617 @@ except Exception as e:
         )
     )
     sys.exit(1)
+import contextlib
 import importlib.util
-from typing import Optional, List, Tuple
+import io
+import re
+import threading
+import zipfile
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List
 from typing import Any, Dict as _Dict
-# Cache simples para evitar múltiplas instâncias do mesmo módulo (tipos incompatíveis)
+# Cache simples para evitar múltiplas instâncias do mesmo módulo (tipos incompatíveis).
+# Chave = modname (cada lab tem um nome fixo); sys.modules também é consultado.
 _MODULE_CACHE: _Dict[str, Any] = {}
 
-# Base dir e helper para carregar módulos por caminho
+# Base dir (já absoluto) e helper para carregar módulos por caminho
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Os trabalhos das abas rodam no pool: a carga (sys.modules antes do exec) é serializada
+_MODULE_LOCK = threading.RLock()
+
 def _load_module(relpath: str, modname: str):
-    path = os.path.join(BASE_DIR, relpath)
-    key = os.path.abspath(path)
-    if key in _MODULE_CACHE:
-        return _MODULE_CACHE[key]
-    spec = importlib.util.spec_from_file_location(modname, path)
-    if not spec or not spec.loader:
-        raise ImportError(f"Não foi possível carregar {relpath}")
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)  # type: ignore
-    _MODULE_CACHE[key] = mod
-    return mod
+    mod = _MODULE_CACHE.get(modname)
+    if mod is not None:
+        return mod
+    with _MODULE_LOCK:
+        mod = _MODULE_CACHE.get(modname) or sys.modules.get(modname)
+        if mod is not None:
+            _MODULE_CACHE[modname] = mod
+            return mod
+        path = os.path.join(BASE_DIR, relpath)
+        spec = importlib.util.spec_from_file_location(modname, path) if os.path.isfile(path) else None
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Não foi possível carregar {relpath}")
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[modname] = mod
+        try:
+            spec.loader.exec_module(mod)  # type: ignore
+        except BaseException:
+            sys.modules.pop(modname, None)
+            raise
+        _MODULE_CACHE[modname] = mod
+        return mod
+
+# Labs usados pelos botões das abas, com os mesmos nomes das chamadas a _load_module
+_LAB_MODULES = (
+    ('labs/06_semantica/ast_template.py', 'lab06_ast'),
+    ('labs/07_ast_ir/tac_template.py', 'lab07_tac'),
+    ('labs/08_codegen/codegen_template.py', 'lab08_codegen'),
+    ('labs/08_codegen/regalloc_linear.py', 'lab08_regalloc'),
+    ('labs/08_codegen/peephole.py', 'lab08_peephole'),
+    ('labs/09_opt/optimizer_template.py', 'lab09_opt'),
+    ('labs/10_backend/asm_sim_template.py', 'lab10_sim'),
+    ('labs/11_automatos/automata_lib.py', 'auto_lib'),
+    ('labs/12_grafos/cfg_builder_template.py', 'lab12_cfg'),
+    ('labs/12_grafos/liveness_template.py', 'lab12_live'),
+)
+
+try:  # opcional: (de)serialização JSON mais rápida
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_loads(data: bytes):
+    # orjson se disponível; senão json da stdlib (também aceita bytes)
+    if _orjson is not None:
+        return _orjson.loads(data)
+    import json
+    return json.loads(data)
+
+
+try:  # opcional: "Testar Cadeia" no motor DFA do Hyperscan
+    import hyperscan as _hyperscan
+except ImportError:
+    _hyperscan = None
+
+# Operadores da regex do Lab 11 que valem o mesmo no Hyperscan; '.' é só concatenação
+_HS_OPS = frozenset('|*+?()')
+
+
+@lru_cache(maxsize=8)
+def _hs_database(regex: str):
+    """Database Hyperscan (casamento da cadeia inteira) da regex do Lab 11."""
+    body = ''.join(c if c in _HS_OPS else re.escape(c) for c in regex if c != '.')
+    db = _hyperscan.Database()
+    db.compile(expressions=[f'^(?:{body})$'.encode('utf-8')], ids=[0], elements=1,
+               flags=[_hyperscan.HS_FLAG_SINGLEMATCH | _hyperscan.HS_FLAG_ALLOWEMPTY | _hyperscan.HS_FLAG_UTF8])
+    return db
+
+
+def _hs_accepts(regex: str, s: str):
+    """True/False pelo Hyperscan; None se indisponível ou a regex não compilar lá."""
+    if _hyperscan is None or not s:
+        return None
+    try:
+        db = _hs_database(regex)
+    except Exception:
+        return None
+    hits: List[int] = []
+    db.scan(s.encode('utf-8'), match_event_handler=lambda *a: hits.append(1))
+    return bool(hits)
+
+
+# Configurações persistidas em gui_settings.json:
+# (chave, aba dona, variável Tk, conversão, padrão)
+_SETTINGS = (
+    ('grammar_path', 'parser_tab', 'grammar_path', str, ''),
+    ('parser_method', 'parser_tab', 'method', str, 'both'),
+    ('parser_auto_lex', 'parser_tab', 'var_auto', bool, False),
+    ('parser_trace', 'parser_tab', 'var_trace', bool, True),
+    ('parser_tables', 'parser_tab', 'var_tables', bool, True),
+    ('parser_items', 'parser_tab', 'var_items', bool, False),
+    ('sem_arith_bool', 'sema_tab', 'var_arith_bool', bool, False),
+    ('sem_eq_same', 'sema_tab', 'var_eq_same', bool, True),
+    ('regex_last', 'automata_tab', 're_input_var', str, ''),
+    ('regex_test_last', 'automata_tab', 're_test_var', str, ''),
+    ('auto_view', 'automata_tab', 'auto_view', str, 'dfa'),
+    ('codegen_regalloc', 'codegen_tab', 'var_regalloc', bool, False),
+    ('codegen_k', 'codegen_tab', 'reg_k', int, 3),
+    ('codegen_peephole', 'codegen_tab', 'var_peephole', bool, False),
+)
+
+
+@lru_cache(maxsize=256)
+def _isfile_cached(path: str) -> bool:
+    """os.path.isfile memorizado para os caminhos fixos de exemplos.
+
+    Limpo ao reescanear os exemplos e pelo menu Exemplos → Atualizar exemplos.
+    """
+    return os.path.isfile(path)
+
+
+REGEX_BANK = os.path.join(BASE_DIR, 'labs', '11_automatos', 'regex_bank.txt')
+
+# Índice dos menus de exemplos: no cache do usuário (como o do automata_cli), fora do repo
+EXAMPLES_INDEX = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                              'gui_app', 'examples_index.json')
+
+
+# linha do regex_bank: "regex ; aceitas ; rejeitadas" (campos extras ignorados);
+# linhas vazias e comentários (#) não casam
+_BANK_LINE = re.compile(r'^[ \t]*([^#\s;][^;\n]*)(?:;([^;\n]*))?(?:;([^;\n]*))?', re.M)
+
+# mini-linguagem "var = expr" da aba Semântica
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+|==|\+|\*|\(|\)")
+# nomes de arquivo exportados e destaques dos passos do subconjunto no canvas de autômatos
+_SLUG_STRIP_RE = re.compile(r"[^a-z0-9_\-]+")
+_HI_EDGE_RE = re.compile(r"Transição: q(\d+) --(.)--> q(\d+)")
+_HI_STATE_RE = re.compile(r"Novo estado q(\d+)")
+
+
+@lru_cache(maxsize=8)
+def _is_stmt_grammar(path: str) -> bool:
+    """Árvores de gramáticas if_else/stmt viram comandos; as demais, expressões."""
+    p = path.lower()
+    return 'if_else' in p or 'stmt' in p
+
+
+# cores dos blocos da partição na animação da minimização
+_PART_COLORS = ('#ef4444', '#22c55e', '#3b82f6', '#f59e0b', '#8b5cf6', '#06b6d4', '#84cc16', '#e879f9')
+
+
+def _dfa_states(dfa) -> set:
+    """Estados do DFA (início, origens e destinos das transições) numa única passada."""
+    states = {dfa.start}
+    add = states.add
+    for (q, _), t in dfa.trans.items():
+        add(q)
+        add(t)
+    return states
+
+
+def _nfa_states(nfa) -> set:
+    """Estados do NFA (início, finais, origens e destinos das transições) numa única passada."""
+    states = {nfa.start}
+    states.update(nfa.accepts)
+    for (q, _), targets in nfa.trans.items():
+        states.add(q)
+        states.update(targets)
+    return states
+
+
+@lru_cache(maxsize=8)
+def _parse_cfg_text(text: str) -> tuple:
+    """Texto da aba Grafos -> ((OP, args), ...); CFG, liveness e intervalos reusam o parse."""
+    intern = sys.intern
+    return tuple([(intern(p[0].upper()), tuple(map(intern, p[1:])))
+                  for p in map(str.split, text.splitlines()) if p])
+
+
+@lru_cache(maxsize=64)
+def _parse_highlight(highlight: str):
+    """Texto de um passo do subconjunto -> (aresta (src, dst, símbolo) ou None, estados novos)."""
+    edge_hi = None
+    m = _HI_EDGE_RE.search(highlight)
+    if m:
+        edge_hi = (int(m.group(1)), int(m.group(3)), m.group(2))
+    m2 = _HI_STATE_RE.search(highlight)
+    node_hi = frozenset((int(m2.group(1)),)) if m2 else frozenset()
+    return edge_hi, node_hi
+
+
+def _slug(s: str) -> str:
+    """Título -> trecho de nome de arquivo (minúsculas, '_' no lugar de espaços)."""
+    return _SLUG_STRIP_RE.sub("", s.strip().lower().replace(' ', '_'))[:40] or 'ast'
+
+
+@lru_cache(maxsize=1)
+def _regex_bank_rows(path: str, mtime_ns: int) -> tuple:
+    """Linhas do regex_bank como (regex, aceitas, rejeitadas, primeira aceita); um único
+    read() por versão do arquivo."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = f.read()
+    rows = []
+    for regex, acc, rej in _BANK_LINE.findall(data):
+        acc = (acc or '').strip()
+        rows.append((regex.strip(), acc, (rej or '').strip(), acc.split(',')[0].strip() if acc else ''))
+    return tuple(rows)
+
+
+def _regex_bank() -> tuple:
+    try:
+        mtime = os.stat(REGEX_BANK).st_mtime_ns
+    except OSError:
+        return ()
+    return _regex_bank_rows(REGEX_BANK, mtime)
+
+
+def _tree_layout(root):
+    """Layout em listas paralelas indexadas pela pré-ordem: (rótulos, pai, x, profundidade)."""
+    labels: List[str] = []
+    parent: List[int] = []
+    xs: List[float] = []
+    ys: List[int] = []
+    leaves = 0
+    stack = [(root, 0, -1)]
+    while stack:
+        node, depth, p = stack.pop()
+        i = len(labels)
+        labels.append(node.symbol)
+        parent.append(p)
+        ys.append(depth)
+        kids = node.children
+        if kids:
+            xs.append(0.0)
+            stack.extend((ch, depth + 1, i) for ch in reversed(kids))
+        else:
+            xs.append(float(leaves))
+            leaves += 1
+    # pré-ordem invertida: filhos antes do pai; x do pai = média dos filhos
+    n = len(labels)
+    sums = [0.0] * n
+    counts = [0] * n
+    for i in range(n - 1, -1, -1):
+        if counts[i]:
+            xs[i] = sums[i] / counts[i]
+        p = parent[i]
+        if p >= 0:
+            sums[p] += xs[i]
+            counts[p] += 1
+    return tuple(labels), tuple(parent), tuple(xs), tuple(ys)
+
+
+@lru_cache(maxsize=32)
+def _load_grammar(path: str, mtime_ns: int, size: int):
+    """(Grammar, FirstFollow, {parser/bloco de texto: objeto}) de um arquivo de gramática.
+
+    (mtime_ns, size) invalidam a entrada quando o arquivo é editado; o dict guarda os
+    parsers e textos derivados dessa versão.
+    """
+    pt = _pt()
+    g = pt.Grammar.from_file(path)
+    return g, pt.FirstFollow(g), {}
+
+
+@lru_cache(maxsize=64)
+def _auto_lex(inp: str, g) -> tuple:
+    # g vem de _load_grammar: objeto novo a cada versão do arquivo, então a chave já invalida
+    return tuple(_pt().auto_lex(inp, g))
+
+
+class _ExprParser:
+    """Descida recursiva de uma expressão da aba Semântica: '==' < '+' < '*' < primário."""
+    __slots__ = ('tok', 'pos', 'ast')
+
+    def __init__(self, tokens: List[str], ast):
+        self.tok = tokens
+        self.pos = 0
+        self.ast = ast  # módulo do lab06 (Var, Num, BinOp)
+
+    def peek(self):
+        tok = self.tok
+        pos = self.pos
+        return tok[pos] if pos < len(tok) else None
+
+    def eat(self, tok=None):
+        t = self.peek()
+        if tok is None or t == tok:
+            self.pos += 1
+            return t
+        raise ValueError(f"Esperado {tok}, obtido {t}")
+
+    def parse_primary(self):
+        t = self.peek()
+        if t is None:
+            raise ValueError("Expressão incompleta")
+        if t.isdigit():
+            self.pos += 1
+            return self.ast.Num(int(t))
+        # tokens vêm de _TOKEN_RE: basta olhar o 1º caractere (sem regex)
+        c = t[0]
+        if c == '_' or c.isalpha():
+            self.pos += 1
+            return self.ast.Var(t)
+        if t == '(':
+            self.eat('(')
+            e = self.parse_expr()
+            self.eat(')')
+            return e
+        raise ValueError(f"Token inesperado: {t}")
+
+    def parse_term(self):
+        e = self.parse_primary()
+        while self.peek() == '*':
+            self.pos += 1
+            e = self.ast.BinOp('*', e, self.parse_primary())
+        return e
+
+    def parse_add(self):
+        e = self.parse_term()
+        while self.peek() == '+':
+            self.pos += 1
+            e = self.ast.BinOp('+', e, self.parse_term())
+        return e
+
+    def parse_expr(self):
+        e = self.parse_add()
+        if self.peek() == '==':
+            self.pos += 1
+            e = self.ast.BinOp('==', e, self.parse_add())
+        return e
+
+
+# Nó de visualização da AST: tupla (symbol, children) com a mesma interface de leitura
+# da árvore de parse; folhas compartilham a tupla vazia como lista de filhos.
+_AstView = namedtuple('_AstView', ('symbol', 'children'))
+
+
+@lru_cache(maxsize=4)
+def _ast_view_dispatch(lab06) -> dict:
+    """type(nó da AST do lab06) -> nó -> (view, [(filho, lista de filhos da view)]).
+
+    Montada uma vez por módulo: um lookup por nó em vez da cadeia de isinstance
+    (as classes do lab06 não têm subclasses concretas).
+    """
+    V = _AstView
+
+    def program(n):
+        v = V('Program', [])
+        return v, [(s, v.children) for s in n.body]
+
+    def seq(n):
+        v = V('Seq', [])
+        return v, [(s, v.children) for s in n.items]
+
+    def assign(n):
+        v = V(f'Assign {n.name}', [])
+        return v, [(n.expr, v.children)]
+
+    def if_then_else(n):
+        cond, then = V('cond', []), V('then', [])
+        v = V('If', [cond, then])
+        kids = [(n.cond, cond.children), (n.then_branch, then.children)]
+        if n.else_branch is not None:
+            els = V('else', [])
+            v.children.append(els)
+            kids.append((n.else_branch, els.children))
+        return v, kids
+
+    def binop(n):
+        v = V(n.op, [])
+        return v, [(n.left, v.children), (n.right, v.children)]
+
+    return {
+        lab06.Program: program,
+        lab06.Seq: seq,
+        lab06.Assign: assign,
+        lab06.IfThenElse: if_then_else,
+        lab06.BinOp: binop,
+        lab06.Var: lambda n: (V(f'Var({n.name})', ()), ()),
+        lab06.Num: lambda n: (V(f'Num({n.value})', ()), ()),
+    }
+
+
+# Painéis de saída só recebem texto do programa: sem pilha de undo/separadores.
+# Listagens de TAC/assembly (linhas curtas) usam também wrap='none'.
+_LOG_TEXT = {'undo': False, 'autoseparators': False, 'maxundo': 0}
+
+
+def _set_text(w, text: str) -> None:
+    """Substitui todo o conteúdo de um tk.Text num só comando (Text.replace)."""
+    w.replace('1.0', 'end', text)
+
+
+# Cores do texto da barra de status por nível
+_STATUS_COLORS = {'info': '#111', 'warn': '#b45309'}
+
+# Linhas mantidas nos painéis que só recebem anexos (passos, testes, erros)
+_LOG_MAX_LINES = 2000
+
+
+def _append_text(w, text: str, max_lines: int = _LOG_MAX_LINES) -> None:
+    """Anexa `text` ao fim de `w` e descarta as linhas mais antigas além de max_lines."""
+    w.insert('end', text)
+    n = int(w.index('end-1c').split('.')[0])
+    if n > max_lines:
+        w.delete('1.0', f'{n - max_lines + 1}.0')
+
+
+def _listing(prog) -> str:
+    """Instruções (op, args) de TAC/assembly como texto, uma por linha."""
+    return ''.join([f"{op} {' '.join(args)}\n" for op, args in prog])
 
-try:
-    lexer_template = _load_module('labs/02_lexica/lexer_template.py', 'lab02_lexer')
-except Exception:
-    lexer_template = None
 
-# Importa parsers e GUI de árvores
-from parsing_tester import Grammar, FirstFollow, LL1Parser, SLR1Parser, ParseTreeNode, show_trees_gui, export_tree_svg, auto_lex
+def _intern_tac(prog) -> list:
+    """(op, args) com strings internadas, na entrada do pipeline: nomes iguais viram o
+    mesmo objeto e as comparações/lookups das passadas seguintes saem por identidade."""
+    intern = sys.intern
+    return [(intern(op), tuple(map(intern, args))) for op, args in prog]
+
+
+def _pipe_from_json(pipe: dict) -> dict:
+    """Artefatos do pipeline lidos de JSON (cena zip ou legada): listas [op, [args]] viram
+    tuplas (op, args) já internadas (como _intern_tac), numa passada só por programa."""
+    for key in ('tac', 'asm'):
+        try:
+            pipe[key] = _intern_tac(pipe.get(key) or ())
+        except Exception:
+            pipe[key] = []
+    return pipe
+
+
+def _gen_assign(gen, name: str, expr) -> None:
+    """gen.gen_assign do template; se a expressão for funda demais para a recursão,
+    desfaz o que foi emitido e gera o mesmo TAC pela variante iterativa (tac_fast)."""
+    n, tmp = len(gen.code), gen.tmp
+    try:
+        gen.gen_assign(name, expr)
+    except RecursionError:
+        del gen.code[n:]
+        gen.tmp = tmp
+        tac_fast = _load_module('labs/07_ast_ir/tac_fast.py', 'lab07_tac_fast')
+        tac_fast.gen_assign(gen, name, expr)
+
+
+# ===== Trabalho pesado das abas (sem Tk) =====
+# Recebem as entradas já lidas dos widgets e devolvem o texto do painel, para
+# poderem rodar no pool (botões) ou direto na thread principal (aulas, cenas).
+
+def _codegen_work(tac, k, peephole: bool = False):
+    """(regmap, asm_prog ou None, listagem, texto); k=None = sem alocação de registradores."""
+    parts: List[str] = []
+    mp = None
+    asm_prog = None
+    asm_text = ''
+    try:
+        if not tac:
+            raise ValueError("TAC não disponível. Gere na aba IR/TAC.")
+        if k is not None:
+            regalloc = _load_module('labs/08_codegen/regalloc_linear.py', 'lab08_regalloc')
+            mp = regalloc.allocate_registers(tac, k=k)
+            parts.append(f"; regalloc k={k}: {mp}\n")
+            tac = regalloc.apply_mapping_to_tac(tac, mp)
+        lab08 = _load_module('labs/08_codegen/codegen_template.py', 'lab08_codegen')
+        asm_prog = [(a.op, a.args) for a in lab08.codegen_from_tac(tac)]
+        if peephole:
+            n = len(asm_prog)
+            asm_prog = _load_module('labs/08_codegen/peephole.py', 'lab08_peephole').run(asm_prog)
+            parts.append(f"; peephole: {n} -> {len(asm_prog)} instruções\n")
+        asm_text = _listing(asm_prog)
+        parts.append(asm_text)
+    except Exception as e:
+        parts.append(f"Erro: {e}\n")
+    return mp, asm_prog, asm_text, ''.join(parts)
+
+
+def _sim_work(asm_prog, regmap, asm_text: str) -> str:
+    parts: List[str] = []
+    try:
+        if not asm_prog:
+            raise ValueError('Gere assembly na aba Codegen.')
+        if regmap:
+            parts.append(f"; mapping: {regmap}\n")
+        parts.append("; assembly:\n")
+        parts.append(asm_text)
+        lab10 = _load_module('labs/10_backend/asm_sim_template.py', 'lab10_sim')
+        m = lab10.Machine()
+        m.run(asm_prog)
+        parts.append(f"\nregs: {m.regs}\n")
+        parts.append(f"mem: {m.mem}\n")
+    except Exception as e:
+        parts.append(f"Erro: {e}\n")
+    return ''.join(parts)
+
+
+def _automata_work(regex: str):
+    """(built, parts): built = (regex, nfa, dfa mínimo, alfabeto, passos do subset,
+    passos e partições da minimização), ou None se falhou; parts = linhas do painel."""
+    parts: List[str] = []
+    out = parts.append
+    built = None
+    try:
+        lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
+        if not regex:
+            raise ValueError('Informe uma regex.')
+        nfa, alpha, log = lib.regex_to_nfa_with_log(regex)
+        dfa = lib.nfa_to_dfa(nfa, alpha)
+        mdfa = lib.dfa_minimize(dfa, alpha)
+        # passos
+        subset_steps = lib.nfa_to_dfa_steps(nfa, alpha)
+        min_steps, min_parts = lib.dfa_minimize_steps(mdfa, alpha)
+        built = (regex, nfa, mdfa, alpha, subset_steps, min_steps, min_parts)
+        out(f"Regex: {regex}\n")
+        out(f"Alfabeto: {sorted(list(alpha))}\n")
+        out(f"DFA estados: {len(_dfa_states(dfa))}\n")
+        out(f"DFA (min) estados: {len(_dfa_states(mdfa))}\n")
+        out("\nPassos (Thompson):\n")
+        parts.extend(f"- {ln}\n" for ln in log)
+        out("\nSubset (primeiro passo):\n")
+        if subset_steps:
+            out(subset_steps[0] + "\n")
+        out("\nMinimização (primeiro passo):\n")
+        if min_steps:
+            out(min_steps[0] + "\n")
+    except Exception as e:
+        out(f"Erro: {e}\n")
+    return built, parts
+
+
+def _cfg_work(text: str) -> str:
+    parts: List[str] = []
+    try:
+        code = list(_parse_cfg_text(text))
+        lab12 = _load_module('labs/12_grafos/cfg_builder_template.py', 'lab12_cfg')
+        blocks = lab12.split_basic_blocks(code)
+        cfg = lab12.build_cfg(blocks)
+        parts.extend(f"Bloco {b.label}: {len(b.instrs)} instrs\n" for b in blocks)
+        parts.append('\nCFG:\n')
+        parts.extend(f"  {k} -> {sorted(list(v))}\n" for k, v in cfg.items())
+    except Exception as e:
+        parts.append(f"Erro: {e}\n")
+    return ''.join(parts)
+
+
+def _liveness_work(text: str) -> str:
+    parts: List[str] = []
+    try:
+        code = list(_parse_cfg_text(text))
+        lab12 = _load_module('labs/12_grafos/cfg_builder_template.py', 'lab12_cfg')
+        live = _load_module('labs/12_grafos/liveness_template.py', 'lab12_live')
+        blocks = lab12.split_basic_blocks(code)
+        cfg = lab12.build_cfg(blocks)
+        blocks_by_label = {b.label: b.instrs for b in blocks}
+        # bitsets no ponto fixo; nomes (já em ordem) só na hora de escrever o painel
+        IN, OUT, USE, DEF, names = live.liveness_bits(blocks_by_label, cfg)
+        to_names = live.bits_to_names
+        parts.append('CFG:\n')
+        parts.extend(f"  {k} -> {sorted(list(v))}\n" for k, v in cfg.items())
+        parts.append('\nUSE/DEF:\n')
+        parts.extend(f"  {b}: USE={to_names(USE[b], names)} DEF={to_names(DEF[b], names)}\n" for b in blocks_by_label)
+        parts.append('\nIN/OUT:\n')
+        parts.extend(f"  {b}: IN={to_names(IN[b], names)} OUT={to_names(OUT[b], names)}\n" for b in blocks_by_label)
+    except Exception as e:
+        parts.append(f"Erro: {e}\n")
+    return ''.join(parts)
+
+
+# Aulas dos menus (número, título); 13 e 14 ficam após um separador
+LESSONS = [
+    (1, 'Introdução'), (2, 'Léxica'), (3, 'Gramáticas'), (4, 'LL(1)'),
+    (5, 'SLR/LR'), (6, 'Semântica'), (7, 'IR/TAC'), (8, 'Codegen'),
+    (9, 'Otimização'), (10, 'Back-end'), (11, 'Autômatos'), (12, 'Grafos'),
+    (13, 'Projeto (integração)'), (14, 'Projeto (integração)'),
+]
+
+# parsing_tester e o lexer do Lab 02 só são carregados no primeiro uso:
+# a janela abre sem pagar a importação dos parsers.
+_PT = None
+_LEXER: Any = None  # None = ainda não tentou; False = indisponível
+
+
+def _pt():
+    """Módulo parsing_tester (importado sob demanda)."""
+    global _PT
+    if _PT is None:
+        import parsing_tester as _PT_mod
+        _PT = _PT_mod
+    return _PT
+
+
+def _lexer():
+    """Lexer do Lab 02, ou None se não puder ser carregado."""
+    global _LEXER
+    if _LEXER is None:
+        try:
+            _LEXER = _load_module('labs/02_lexica/lexer_template.py', 'lab02_lexer')
+        except Exception:
+            _LEXER = False
+    return _LEXER or None
 
 
 class App(tk.Tk):
@@ -59,58 +641,87 @@ class App(tk.Tk):
         self.geometry("1000x700")
         self._settings_path = os.path.join(BASE_DIR, 'gui_settings.json')
         self._settings = {}
+        self._examples_index = None
+        self._examples_menus = {}
+        # estado do pipeline: fica fora dos builders porque as abas são criadas sob demanda
+        self.ast_prog = None
+        self.tac_list = None
+        self.asm_prog = None
+        self._asm_listing = None  # (asm_prog, _listing(asm_prog)) da última listagem
+        self.last_regalloc_map = None
+        self.opt_tac = None
+        self._lab06 = None
+        self._lab07 = None
+        self._ast_view_cache = None
+        self._settings_dirty = False
+        # E/S pesada (exportações) fora da thread do Tk; threads criadas sob demanda
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        # Codegen no pool ainda não voltou: Sim/Otimização usariam asm_prog/tac_list velhos
+        self._codegen_pending = False
         self._load_settings()
         self._build_ui()
+        self._build_lesson_table()
         self.parsers = {}
-        # restore selections if available
-        if self._settings.get('grammar_path'):
-            self.grammar_path.set(self._settings.get('grammar_path',''))
-        if self._settings.get('parser_method'):
-            self.method.set(self._settings.get('parser_method','both'))
-        self.var_auto.set(bool(self._settings.get('parser_auto_lex', False)))
-        self.var_trace.set(bool(self._settings.get('parser_trace', True)))
-        self.var_tables.set(bool(self._settings.get('parser_tables', True)))
-        self.var_items.set(bool(self._settings.get('parser_items', False)))
-        self.var_arith_bool.set(bool(self._settings.get('sem_arith_bool', False)))
-        self.var_eq_same.set(bool(self._settings.get('sem_eq_same', True)))
-        if self._settings.get('regex_last'):
-            self.re_input.delete(0,'end'); self.re_input.insert(0, self._settings.get('regex_last',''))
-        if self._settings.get('regex_test_last'):
-            self.re_test.delete(0,'end'); self.re_test.insert(0, self._settings.get('regex_test_last',''))
-        if hasattr(self, 'auto_view') and self._settings.get('auto_view'):
-            self.auto_view.set(self._settings.get('auto_view','dfa'))
-        # Codegen/regalloc (se existir)
-        if hasattr(self, 'var_regalloc') and 'codegen_regalloc' in self._settings:
-            try:
-                self.var_regalloc.set(bool(self._settings.get('codegen_regalloc', False)))
-            except Exception:
-                pass
-        if hasattr(self, 'reg_k') and 'codegen_k' in self._settings:
-            try:
-                self.reg_k.set(int(self._settings.get('codegen_k', 3)))
-            except Exception:
-                pass
+        # restore selections if available: janela oculta durante a restauração,
+        # um único repaint no final; as abas criadas depois restauram as suas em _build_tab
+        self.withdraw()
+        try:
+            self._restore_settings('parser_tab')
+        finally:
+            self.update_idletasks()
+            self.deiconify()
         # save on close
         self.protocol("WM_DELETE_WINDOW", self._on_close)
-        # atalhos de teclado
-        self.bind('<Control-e>', lambda e: self.run_parser())
-        self.bind('<Control-g>', lambda e: self._browse_grammar())
-        self.bind('<Control-s>', lambda e: self.export_svg())
-        self.bind('<Control-j>', lambda e: self.export_json())
-        self.bind('<Control-c>', lambda e: self.compare_trees())
-        self.bind('<Control-b>', lambda e: self.build_automata())
-        self.bind('<Control-t>', lambda e: self.test_automata())
-        self.bind('<Control-i>', lambda e: self.import_tree_from_parser())
-        self.bind('<Control-y>', lambda e: self.run_semantics())
-        # atalhos de aula (1..0 = 1..10)
-        for key, num in [('1',1),('2',2),('3',3),('4',4),('5',5),('6',6),('7',7),('8',8),('9',9),('0',10)]:
-            self.bind(f'<Control-Key-{key}>', lambda e, n=num: self._select_lesson(n))
-            # auto-execução: Ctrl+Alt+num
-            self.bind(f'<Control-Alt-Key-{key}>', lambda e, n=num: self._select_lesson(n, True))
+        # atalhos de teclado: Ctrl+letra (ações) e Ctrl+num (aulas 1..0 = 1..10) num
+        # único bind genérico; auto-execução das aulas: Ctrl+Alt+num.
+        self._shortcuts = {
+            'e': self.run_parser,
+            'g': self._browse_grammar,
+            's': self.export_svg,
+            'j': self.export_json,
+            'c': self.compare_trees,
+            'b': self.build_automata,
+            't': self.test_automata,
+            'i': self.import_tree_from_parser,
+            'y': self.run_semantics,
+        }
+        self._lesson_keys = {'1':1,'2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,'9':9,'0':10}
+        self.bind('<Control-Key>', self._kb_control)
+        self.bind('<Control-Alt-Key>', self._kb_lesson_auto)
+        # labs pré-carregados com a janela ociosa: o primeiro clique já acha o módulo no cache
+        self.after(500, self._preload_labs, 0)
+
+    def _preload_labs(self, i: int) -> None:
+        # um módulo por callback, para não travar a janela de uma vez
+        if i >= len(_LAB_MODULES):
+            return
+        try:
+            _load_module(*_LAB_MODULES[i])
+        except Exception:
+            pass  # o erro reaparece (com mensagem) quando a ação for usada
+        self.after_idle(self._preload_labs, i + 1)
+
+    def _kb_control(self, e):
+        n = self._lesson_keys.get(e.keysym)
+        if n:
+            self._select_lesson(n)
+            return
+        action = self._shortcuts.get(e.keysym)
+        if action:
+            action()
+
+    def _kb_lesson_auto(self, e):
+        n = self._lesson_keys.get(e.keysym)
+        if n:
+            self._select_lesson(n, True)
 
     def _build_ui(self):
         # menu
         self._build_menu()
+        # barra de status: confirmações e avisos sem diálogo modal (empacotada antes
+        # do notebook para não ser cortada quando a janela encolhe)
+        self.status = ttk.Label(self, anchor='w', padding=(8, 2))
+        self.status.pack(side='bottom', fill='x')
         nb = ttk.Notebook(self)
         self.nb = nb
         nb.pack(fill="both", expand=True)
@@ -118,22 +729,110 @@ class App(tk.Tk):
         self.parser_tab = self._build_parser_tab(nb)
         nb.add(self.lexer_tab, text="Lexer")
         nb.add(self.parser_tab, text="Parser")
-        self.sema_tab = self._build_semantics_tab(nb)
-        nb.add(self.sema_tab, text="Semântica")
-        self.ir_tab = self._build_ir_tab(nb)
-        nb.add(self.ir_tab, text="IR/TAC")
-        self.codegen_tab = self._build_codegen_tab(nb)
-        nb.add(self.codegen_tab, text="Codegen")
-        self.opt_tab = self._build_opt_tab(nb)
-        nb.add(self.opt_tab, text="Otimização")
-        self.sim_tab = self._build_sim_tab(nb)
-        nb.add(self.sim_tab, text="Simulador")
-        self.automata_tab = self._build_automata_tab(nb)
-        nb.add(self.automata_tab, text="Autômatos")
-        self.cfg_tab = self._build_cfg_tab(nb)
-        nb.add(self.cfg_tab, text="CFG/Grafos")
-        self.project_tab = self._build_project_tab(nb)
-        nb.add(self.project_tab, text="Projeto")
+        # Demais abas: só um Frame vazio até a primeira seleção; ações vindas de
+        # fora da aba (aulas, atalhos, cenas, botões "Enviar") chamam _build_tab antes
+        self._tab_pending = {}
+        self._tab_stubs = {}
+        for attr, build, text in (
+            ('sema_tab', self._build_semantics_tab, "Semântica"),
+            ('ir_tab', self._build_ir_tab, "IR/TAC"),
+            ('codegen_tab', self._build_codegen_tab, "Codegen"),
+            ('opt_tab', self._build_opt_tab, "Otimização"),
+            ('sim_tab', self._build_sim_tab, "Simulador"),
+            ('automata_tab', self._build_automata_tab, "Autômatos"),
+            ('cfg_tab', self._build_cfg_tab, "CFG/Grafos"),
+            ('project_tab', self._build_project_tab, "Projeto"),
+        ):
+            stub = ttk.Frame(nb)
+            nb.add(stub, text=text)
+            self._tab_pending[attr] = (build, text, stub)
+            self._tab_stubs[str(stub)] = attr
+        nb.bind('<<NotebookTabChanged>>', self._ensure_tab)
+        # Campos salvos/restaurados nas cenas: (seção.chave, tipo, atributo, padrão);
+        # o atributo é resolvido no uso para não forçar a criação das abas
+        self._scene_fields = [
+            ('parser.grammar_path', 'var', 'grammar_path', ''),
+            ('parser.input', 'var', 'input_str', ''),
+            ('parser.method', 'var', 'method', 'both'),
+            ('parser.auto_lex', 'bool', 'var_auto', False),
+            ('parser.trace', 'bool', 'var_trace', True),
+            ('parser.tables', 'bool', 'var_tables', True),
+            ('parser.items', 'bool', 'var_items', False),
+            ('parser.output', 'text', 'out_text', ''),
+            ('sema.text', 'text', 'sema_input', ''),
+            ('sema.arith_bool', 'bool', 'var_arith_bool', False),
+            ('sema.eq_same', 'bool', 'var_eq_same', True),
+            ('sema.output', 'text', 'sema_output', ''),
+            ('codegen.regalloc', 'bool', 'var_regalloc', False),
+            ('codegen.k', 'int', 'reg_k', 3),
+            ('codegen.peephole', 'bool', 'var_peephole', False),
+            ('codegen.output', 'text', 'codegen_output', ''),
+            ('auto.regex', 'entry', 're_input', ''),
+            ('auto.test', 'entry', 're_test', ''),
+            ('auto.view', 'var', 'auto_view', 'dfa'),
+            ('auto.output', 'text', 'auto_output', ''),
+            ('cfg.code', 'text', 'cfg_input', ''),
+            ('cfg.output', 'text', 'cfg_output', ''),
+            ('ir.output', 'text', 'ir_output', ''),
+            ('opt.output', 'text', 'opt_output', ''),
+            ('sim.output', 'text', 'sim_output', ''),
+        ]
+
+    def _ensure_tab(self, event=None):
+        attr = self._tab_stubs.get(self.nb.select())
+        if attr:
+            self._build_tab(attr)
+
+    def _build_tab(self, attr: str) -> None:
+        """Cria a aba adiada `attr` e troca o Frame provisório pela aba real."""
+        entry = self._tab_pending.pop(attr, None)
+        if entry is None:
+            return
+        build, text, stub = entry
+        nb = self.nb
+        real = build(nb)
+        setattr(self, attr, real)
+        selected = nb.select() == str(stub)
+        nb.insert(nb.index(stub), real, text=text)
+        if selected:
+            nb.select(real)
+        nb.forget(stub)
+        self._tab_stubs.pop(str(stub), None)
+        stub.destroy()
+        self._restore_settings(attr)
+
+    def _build_pending_tabs(self) -> None:
+        for attr in list(self._tab_pending):
+            self._build_tab(attr)
+
+    @staticmethod
+    def _scene_read(kind: str, w):
+        if kind == 'text':
+            return w.get('1.0', 'end')
+        if kind == 'bool':
+            return bool(w.get())
+        if kind == 'int':
+            return int(w.get())
+        return w.get()  # var / entry
+
+    @staticmethod
+    def _scene_write(kind: str, w, value) -> None:
+        if kind == 'text':
+            _set_text(w, value)
+        elif kind == 'entry':
+            w.delete(0, 'end'); w.insert(0, value)
+        elif kind == 'bool':
+            w.set(bool(value))
+        elif kind == 'int':
+            try:
+                w.set(int(value))
+            except Exception:
+                pass
+        else:
+            try:
+                w.set(value)
+            except Exception:
+                pass
 
     # ===== Lexer =====
     def _build_lexer_tab(self, parent):
@@ -152,7 +851,7 @@ class App(tk.Tk):
         ttk.Button(btns, text="Exemplo 1", command=self.fill_lexer_example).pack(side="right")
         ttk.Button(btns, text="Exemplo 2", command=self.fill_lexer_example2).pack(side="right", padx=6)
 
-        self.lex_output = tk.Text(frame, height=20)
+        self.lex_output = tk.Text(frame, height=20, **_LOG_TEXT)
         self.lex_output.pack(fill="both", expand=True, padx=8, pady=6)
         self.lex_output.insert('end', "Carregue Lab 02 ou use o template padrão.\n")
         return frame
@@ -161,52 +860,34 @@ class App(tk.Tk):
         m = tk.Menu(self)
         # Exemplos
         exm = tk.Menu(m, tearoff=0)
+        # Submenus preenchidos na primeira abertura (postcommand)
         self._examples_gram = tk.Menu(exm, tearoff=0)
-        self._populate_grammar_examples(self._examples_gram)
+        self._examples_gram.configure(postcommand=partial(self._post_examples, self._examples_gram,
+                                                          self._populate_grammar_examples))
         exm.add_cascade(label='Gramáticas', menu=self._examples_gram)
         # Submenu separado para exemplos simples
         self._examples_simple = tk.Menu(exm, tearoff=0)
-        self._populate_simple_examples(self._examples_simple)
+        self._examples_simple.configure(postcommand=partial(self._post_examples, self._examples_simple,
+                                                            self._populate_simple_examples))
         exm.add_cascade(label='Exemplos Simples', menu=self._examples_simple)
         self._examples_regex = tk.Menu(exm, tearoff=0)
-        self._populate_regex_examples(self._examples_regex)
+        self._examples_regex.configure(postcommand=partial(self._post_examples, self._examples_regex,
+                                                           self._populate_regex_examples))
         exm.add_cascade(label='Regex (bank)', menu=self._examples_regex)
+        exm.add_separator()
+        exm.add_command(label='Atualizar exemplos', command=self._refresh_examples)
         m.add_cascade(label='Exemplos', menu=exm)
-        # Aulas (prefills)
+        # Aulas (prefills) e Aulas (auto)
         lessons = tk.Menu(m, tearoff=0)
-        lessons.add_command(label='Aula 1 — Introdução', command=lambda: self._select_lesson(1))
-        lessons.add_command(label='Aula 2 — Léxica', command=lambda: self._select_lesson(2))
-        lessons.add_command(label='Aula 3 — Gramáticas', command=lambda: self._select_lesson(3))
-        lessons.add_command(label='Aula 4 — LL(1)', command=lambda: self._select_lesson(4))
-        lessons.add_command(label='Aula 5 — SLR/LR', command=lambda: self._select_lesson(5))
-        lessons.add_command(label='Aula 6 — Semântica', command=lambda: self._select_lesson(6))
-        lessons.add_command(label='Aula 7 — IR/TAC', command=lambda: self._select_lesson(7))
-        lessons.add_command(label='Aula 8 — Codegen', command=lambda: self._select_lesson(8))
-        lessons.add_command(label='Aula 9 — Otimização', command=lambda: self._select_lesson(9))
-        lessons.add_command(label='Aula 10 — Back-end', command=lambda: self._select_lesson(10))
-        lessons.add_command(label='Aula 11 — Autômatos', command=lambda: self._select_lesson(11))
-        lessons.add_command(label='Aula 12 — Grafos', command=lambda: self._select_lesson(12))
-        lessons.add_separator()
-        lessons.add_command(label='Aula 13 — Projeto (integração)', command=lambda: self._select_lesson(13))
-        lessons.add_command(label='Aula 14 — Projeto (integração)', command=lambda: self._select_lesson(14))
-        m.add_cascade(label='Aulas', menu=lessons)
-        # Aulas (auto)
         lessons_auto = tk.Menu(m, tearoff=0)
-        lessons_auto.add_command(label='Aula 1 — (auto)', command=lambda: self._select_lesson(1, True))
-        lessons_auto.add_command(label='Aula 2 — (auto)', command=lambda: self._select_lesson(2, True))
-        lessons_auto.add_command(label='Aula 3 — (auto)', command=lambda: self._select_lesson(3, True))
-        lessons_auto.add_command(label='Aula 4 — (auto)', command=lambda: self._select_lesson(4, True))
-        lessons_auto.add_command(label='Aula 5 — (auto)', command=lambda: self._select_lesson(5, True))
-        lessons_auto.add_command(label='Aula 6 — (auto)', command=lambda: self._select_lesson(6, True))
-        lessons_auto.add_command(label='Aula 7 — (auto)', command=lambda: self._select_lesson(7, True))
-        lessons_auto.add_command(label='Aula 8 — (auto)', command=lambda: self._select_lesson(8, True))
-        lessons_auto.add_command(label='Aula 9 — (auto)', command=lambda: self._select_lesson(9, True))
-        lessons_auto.add_command(label='Aula 10 — (auto)', command=lambda: self._select_lesson(10, True))
-        lessons_auto.add_command(label='Aula 11 — (auto)', command=lambda: self._select_lesson(11, True))
-        lessons_auto.add_command(label='Aula 12 — (auto)', command=lambda: self._select_lesson(12, True))
-        lessons_auto.add_separator()
-        lessons_auto.add_command(label='Aula 13 — Projeto (auto)', command=lambda: self._select_lesson(13, True))
-        lessons_auto.add_command(label='Aula 14 — Projeto (auto)', command=lambda: self._select_lesson(14, True))
+        for n, title in LESSONS:
+            if n == 13:
+                lessons.add_separator()
+                lessons_auto.add_separator()
+            lessons.add_command(label=f'Aula {n} — {title}', command=partial(self._select_lesson, n))
+            auto_label = 'Projeto (auto)' if n >= 13 else '(auto)'
+            lessons_auto.add_command(label=f'Aula {n} — {auto_label}', command=partial(self._select_lesson, n, True))
+        m.add_cascade(label='Aulas', menu=lessons)
         m.add_cascade(label='Aulas (auto)', menu=lessons_auto)
         # Cenas (salvar/carregar)
         scenes = tk.Menu(m, tearoff=0)
@@ -243,234 +924,137 @@ class App(tk.Tk):
         m.add_cascade(label='Ajuda', menu=helpm)
         self.config(menu=m)
 
+    def _build_lesson_table(self):
+        # aula -> (preparo, aba, execução automática)
+        self._lessons = {
+            1: (self.fill_parser_example, 'parser_tab', self.run_parser),           # Introdução: parser expr
+            2: (self.fill_lexer_example, 'lexer_tab', self.run_lexer),              # Léxica
+            3: (self._prep_lesson3, 'parser_tab', self.run_parser),                 # Gramáticas: expr com tabelas
+            4: (self._prep_lesson4, 'parser_tab', self.run_parser),                 # LL(1): expr com LL e tabelas
+            5: (self._prep_lesson5, 'parser_tab', self.run_parser),                 # SLR/LR: dangling else
+            6: (self.fill_sema_example, 'sema_tab', self.run_semantics),            # Semântica
+            7: (self.fill_ir_example, 'ir_tab', self.run_tac),                      # IR/TAC
+            8: (self._prep_lesson8, 'codegen_tab', self.run_codegen),               # Codegen + regalloc spill
+            9: (self.fill_opt_example, 'opt_tab', self._run_lesson9),               # Otimização
+            10: (self.fill_sim_example2, 'sim_tab', self.run_sim),                  # Back-end
+            11: (self.fill_automata_example, 'automata_tab', self._run_lesson11),   # Autômatos
+            12: (self.fill_cfg_example2, 'cfg_tab', self._run_lesson12),            # Grafos/CFG
+            13: (None, 'project_tab', None),
+            14: (None, 'project_tab', None),
+        }
+        project_note = 'Veja CURSO.md e a aba Projeto para integrar Léxico→Sintaxe→Semântica→IR→Otim.→Codegen→Back-end.'
+        self._lesson_notes = {13: project_note, 14: project_note}
+
+    def _prep_lesson3(self):
+        self.fill_parser_example(); self.method.set('both'); self.var_tables.set(True)
+
+    def _prep_lesson4(self):
+        self.fill_parser_example(); self.method.set('ll1'); self.var_tables.set(True)
+
+    def _prep_lesson5(self):
+        self.fill_parser_example_dangling(); self.var_items.set(True); self.var_tables.set(True)
+
+    def _prep_lesson8(self):
+        self.fill_codegen_example_spill(); self.var_regalloc.set(True); self.reg_k.set(2)
+
+    def _run_lesson9(self):
+        self.run_fold(); self.run_dce()
+
+    def _run_lesson11(self):
+        self.build_automata(); self.test_automata()
+
+    def _run_lesson12(self):
+        self.run_cfg(); self.run_liveness(); self.run_intervals()
+
     def _select_lesson(self, n: int, auto: bool = False):
+        entry = self._lessons.get(n)
+        if entry is None:
+            return
+        prep, tab_name, run = entry
         try:
-            # Helper para selecionar a aba
-            def goto(tab):
-                try:
-                    self.nb.select(tab)
-                except Exception:
-                    pass
-            if n == 1:
-                # Introdução: parser expr
-                self.fill_parser_example(); goto(self.parser_tab)
-                if auto:
-                    self.run_parser()
-            elif n == 2:
-                # Léxica
-                self.fill_lexer_example(); goto(self.lexer_tab)
-                if auto:
-                    self.run_lexer()
-            elif n == 3:
-                # Gramáticas: expr com tabelas
-                self.fill_parser_example(); self.method.set('both'); self.var_tables.set(True); goto(self.parser_tab)
-                if auto:
-                    self.run_parser()
-            elif n == 4:
-                # LL(1): expr com LL e tabelas
-                self.fill_parser_example(); self.method.set('ll1'); self.var_tables.set(True); goto(self.parser_tab)
-                if auto:
-                    self.run_parser()
-            elif n == 5:
-                # SLR/LR: dangling else para ver conflitos
-                self.fill_parser_example_dangling(); self.var_items.set(True); self.var_tables.set(True); goto(self.parser_tab)
-                if auto:
-                    self.run_parser()
-            elif n == 6:
-                # Semântica
-                self.fill_sema_example(); goto(self.sema_tab)
-                if auto:
-                    self.run_semantics()
-            elif n == 7:
-                # IR/TAC
-                self.fill_ir_example(); goto(self.ir_tab)
-                if auto:
-                    self.run_tac()
-            elif n == 8:
-                # Codegen + regalloc spill
-                self.fill_codegen_example_spill(); self.var_regalloc.set(True); self.reg_k.set(2); goto(self.codegen_tab)
-                if auto:
-                    self.run_codegen()
-            elif n == 9:
-                # Otimização
-                self.fill_opt_example(); goto(self.opt_tab)
-                if auto:
-                    self.run_fold(); self.run_dce()
-            elif n == 10:
-                # Back-end
-                self.fill_sim_example2(); goto(self.sim_tab)
-                if auto:
-                    self.run_sim()
-            elif n == 11:
-                # Autômatos
-                self.fill_automata_example(); goto(self.automata_tab)
-                if auto:
-                    self.build_automata(); self.test_automata()
-            elif n == 12:
-                # Grafos/CFG
-                self.fill_cfg_example2(); goto(self.cfg_tab)
-                if auto:
-                    self.run_cfg(); self.run_liveness(); self.run_intervals()
-            elif n in (13, 14):
-                goto(self.project_tab)
+            self._build_tab(tab_name)
+            if prep is not None:
+                prep()
+            try:
+                self.nb.select(getattr(self, tab_name))
+            except Exception:
+                pass
+            note = self._lesson_notes.get(n)
+            if note:
                 try:
-                    messagebox.showinfo('Projeto', 'Veja CURSO.md e a aba Projeto para integrar Léxico→Sintaxe→Semântica→IR→Otim.→Codegen→Back-end.')
+                    messagebox.showinfo('Projeto', note)
                 except Exception:
                     pass
+            if auto and run is not None:
+                run()
         except Exception:
             pass
 
     def save_scene(self):
         try:
             import json
-            from tkinter import filedialog, messagebox
-            scene = {
-                'active_tab': self.nb.index(self.nb.select()) if hasattr(self,'nb') else 0,
-                # Parser
-                'parser': {
-                    'grammar_path': self.grammar_path.get() if hasattr(self,'grammar_path') else '',
-                    'input': self.input_str.get() if hasattr(self,'input_str') else '',
-                    'method': self.method.get() if hasattr(self,'method') else 'both',
-                    'auto_lex': bool(self.var_auto.get()) if hasattr(self,'var_auto') else False,
-                    'trace': bool(self.var_trace.get()) if hasattr(self,'var_trace') else True,
-                    'tables': bool(self.var_tables.get()) if hasattr(self,'var_tables') else True,
-                    'items': bool(self.var_items.get()) if hasattr(self,'var_items') else False,
-                    'output': self.out_text.get('1.0','end') if hasattr(self,'out_text') else '',
-                },
-                # Semantics
-                'sema': {
-                    'text': self.sema_input.get('1.0','end') if hasattr(self,'sema_input') else '',
-                    'arith_bool': bool(self.var_arith_bool.get()) if hasattr(self,'var_arith_bool') else False,
-                    'eq_same': bool(self.var_eq_same.get()) if hasattr(self,'var_eq_same') else True,
-                    'output': self.sema_output.get('1.0','end') if hasattr(self,'sema_output') else '',
-                },
-                # Codegen
-                'codegen': {
-                    'regalloc': bool(self.var_regalloc.get()) if hasattr(self,'var_regalloc') else False,
-                    'k': int(self.reg_k.get()) if hasattr(self,'reg_k') else 3,
-                    'output': self.codegen_output.get('1.0','end') if hasattr(self,'codegen_output') else '',
-                },
-                # Automata
-                'auto': {
-                    'regex': self.re_input.get() if hasattr(self,'re_input') else '',
-                    'test': self.re_test.get() if hasattr(self,'re_test') else '',
-                    'view': self.auto_view.get() if hasattr(self,'auto_view') else 'dfa',
-                    'output': self.auto_output.get('1.0','end') if hasattr(self,'auto_output') else '',
-                },
-                # CFG
-                'cfg': {
-                    'code': self.cfg_input.get('1.0','end') if hasattr(self,'cfg_input') else '',
-                    'output': self.cfg_output.get('1.0','end') if hasattr(self,'cfg_output') else '',
-                },
-                # IR/TAC, Otimização e Simulador
-                'ir': {
-                    'output': self.ir_output.get('1.0','end') if hasattr(self,'ir_output') else '',
-                },
-                'opt': {
-                    'output': self.opt_output.get('1.0','end') if hasattr(self,'opt_output') else '',
-                },
-                'sim': {
-                    'output': self.sim_output.get('1.0','end') if hasattr(self,'sim_output') else '',
-                },
-                # pipeline artifacts (tac/asm/mapping)
-                'pipeline': {
-                    'tac': [[op, list(args)] for (op, args) in (self.tac_list or [])] if hasattr(self,'tac_list') and self.tac_list else [],
-                    'asm': [[op, list(args)] for (op, args) in (self.asm_prog or [])] if hasattr(self,'asm_prog') and self.asm_prog else [],
-                    'regmap': dict(self.last_regalloc_map) if hasattr(self,'last_regalloc_map') and self.last_regalloc_map else {},
-                }
+            self._build_pending_tabs()  # _scene_fields cobre todas as abas
+            scene = {'active_tab': self.nb.index(self.nb.select())}
+            for key, kind, attr, _ in self._scene_fields:
+                sec, name = key.split('.', 1)
+                scene.setdefault(sec, {})[name] = self._scene_read(kind, getattr(self, attr))
+            # pipeline artifacts (tac/asm/mapping): tuplas viram listas JSON, refeitas no load
+            pipe = {
+                'tac': self.tac_list or [],
+                'asm': self.asm_prog or [],
+                'regmap': dict(self.last_regalloc_map) if self.last_regalloc_map else {},
             }
-            path = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON','*.json')])
+            path = filedialog.asksaveasfilename(defaultextension='.scene',
+                                                filetypes=[('Cena','*.scene'),('JSON (legado)','*.json')])
             if not path:
                 return
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(scene, f, ensure_ascii=False, indent=2)
-            try:
-                messagebox.showinfo('OK', 'Cena salva.')
-            except Exception:
-                pass
+            # zip com scene.json (estado da UI) + pipeline.json (artefatos do pipeline)
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+                z.writestr('scene.json', json.dumps(scene, ensure_ascii=False, separators=(',', ':')))
+                z.writestr('pipeline.json', json.dumps(pipe, ensure_ascii=False, separators=(',', ':')))
+            self._status('Cena salva.')
         except Exception as e:
             try:
                 messagebox.showerror('Erro', f'Falha ao salvar cena: {e}')
             except Exception:
                 pass
 
+    @staticmethod
+    def _read_scene(path: str):
+        """(estado da UI, artefatos do pipeline) de uma cena zip ou JSON legado."""
+        import json
+        with open(path, 'rb') as f:
+            zipped = f.read(2) == b'PK'
+        if zipped:
+            with zipfile.ZipFile(path) as z:
+                scene = json.loads(z.read('scene.json').decode('utf-8'))
+                try:
+                    pipe = json.loads(z.read('pipeline.json').decode('utf-8'))
+                except KeyError:
+                    pipe = {}
+            return scene, _pipe_from_json(pipe)
+        # formato antigo: um único JSON, pipeline dentro da cena
+        with open(path, 'r', encoding='utf-8') as f:
+            scene = json.load(f)
+        return scene, _pipe_from_json(scene.pop('pipeline', {}))
+
     def load_scene(self, auto: bool = False):
         try:
-            import json
-            from tkinter import filedialog, messagebox
-            path = filedialog.askopenfilename(filetypes=[('JSON','*.json'),('All','*.*')])
+            path = filedialog.askopenfilename(filetypes=[('Cena','*.scene'),('JSON','*.json'),('All','*.*')])
             if not path:
                 return
-            with open(path, 'r', encoding='utf-8') as f:
-                scene = json.load(f)
-            # Parser
+            scene, pipe = self._read_scene(path)
+            self._build_pending_tabs()
+            for key, kind, attr, default in self._scene_fields:
+                sec, name = key.split('.', 1)
+                self._scene_write(kind, getattr(self, attr), scene.get(sec, {}).get(name, default))
             p = scene.get('parser', {})
-            if hasattr(self,'grammar_path'): self.grammar_path.set(p.get('grammar_path',''))
-            if hasattr(self,'input_str'): self.input_str.set(p.get('input',''))
-            if hasattr(self,'method'): self.method.set(p.get('method','both'))
-            if hasattr(self,'var_auto'): self.var_auto.set(bool(p.get('auto_lex', False)))
-            if hasattr(self,'var_trace'): self.var_trace.set(bool(p.get('trace', True)))
-            if hasattr(self,'var_tables'): self.var_tables.set(bool(p.get('tables', True)))
-            if hasattr(self,'var_items'): self.var_items.set(bool(p.get('items', False)))
-            if hasattr(self,'out_text'):
-                self.out_text.delete('1.0','end'); self.out_text.insert('end', p.get('output',''))
-            # Semantics
             s = scene.get('sema', {})
-            if hasattr(self,'sema_input'):
-                self.sema_input.delete('1.0','end'); self.sema_input.insert('end', s.get('text',''))
-            if hasattr(self,'var_arith_bool'): self.var_arith_bool.set(bool(s.get('arith_bool', False)))
-            if hasattr(self,'var_eq_same'): self.var_eq_same.set(bool(s.get('eq_same', True)))
-            if hasattr(self,'sema_output'):
-                self.sema_output.delete('1.0','end'); self.sema_output.insert('end', s.get('output',''))
-            # Codegen
-            c = scene.get('codegen', {})
-            if hasattr(self,'var_regalloc'): self.var_regalloc.set(bool(c.get('regalloc', False)))
-            if hasattr(self,'reg_k'):
-                try:
-                    self.reg_k.set(int(c.get('k', 3)))
-                except Exception:
-                    pass
-            if hasattr(self,'codegen_output'):
-                self.codegen_output.delete('1.0','end'); self.codegen_output.insert('end', c.get('output',''))
-            # Automata
             a = scene.get('auto', {})
-            if hasattr(self,'re_input'):
-                self.re_input.delete(0,'end'); self.re_input.insert(0, a.get('regex',''))
-            if hasattr(self,'re_test'):
-                self.re_test.delete(0,'end'); self.re_test.insert(0, a.get('test',''))
-            if hasattr(self,'auto_view'):
-                try:
-                    self.auto_view.set(a.get('view','dfa'))
-                except Exception:
-                    pass
-            if hasattr(self,'auto_output'):
-                self.auto_output.delete('1.0','end'); self.auto_output.insert('end', a.get('output',''))
-            # CFG
             cfg = scene.get('cfg', {})
-            if hasattr(self,'cfg_input'):
-                self.cfg_input.delete('1.0','end'); self.cfg_input.insert('end', cfg.get('code',''))
-            if hasattr(self,'cfg_output'):
-                self.cfg_output.delete('1.0','end'); self.cfg_output.insert('end', cfg.get('output',''))
-            # IR/OPT/SIM outputs
-            irs = scene.get('ir', {})
-            if hasattr(self,'ir_output'):
-                self.ir_output.delete('1.0','end'); self.ir_output.insert('end', irs.get('output',''))
-            opts = scene.get('opt', {})
-            if hasattr(self,'opt_output'):
-                self.opt_output.delete('1.0','end'); self.opt_output.insert('end', opts.get('output',''))
-            sims = scene.get('sim', {})
-            if hasattr(self,'sim_output'):
-                self.sim_output.delete('1.0','end'); self.sim_output.insert('end', sims.get('output',''))
             # pipeline
-            pipe = scene.get('pipeline', {})
-            try:
-                self.tac_list = [(op, tuple(args)) for op, args in pipe.get('tac', [])]
-            except Exception:
-                self.tac_list = None
-            try:
-                self.asm_prog = [(op, tuple(args)) for op, args in pipe.get('asm', [])]
-            except Exception:
-                self.asm_prog = None
+            self.tac_list = pipe['tac'] or None
+            self.asm_prog = pipe['asm'] or None
             try:
                 self.last_regalloc_map = dict(pipe.get('regmap', {})) or None
             except Exception:
@@ -481,10 +1065,7 @@ class App(tk.Tk):
                 self.nb.select(idx)
             except Exception:
                 pass
-            try:
-                messagebox.showinfo('OK', 'Cena carregada.')
-            except Exception:
-                pass
+            self._status('Cena carregada.')
             # Auto-run pipeline com seleção de ações, se solicitado
             if auto:
                 actions = None
@@ -595,56 +1176,131 @@ class App(tk.Tk):
             return None
         return {k: bool(v.get()) for k, v in vars_.items()}
 
-    def _populate_grammar_examples(self, menu: tk.Menu):
+    def _example_entries(self, kind: str, watched: List[str], scan) -> List[List[str]]:
+        """Entradas de exemplos de `kind`, via índice em disco (EXAMPLES_INDEX).
+
+        O índice guarda o mtime dos caminhos observados (diretórios de exemplos ou
+        arquivos soltos): só reescaneia (scan()) quando algo foi criado/removido,
+        inclusive entre execuções. Caminhos ficam relativos a BASE_DIR, e um índice
+        gravado por outra cópia do projeto é ignorado.
+        """
+        import json
+        stamp = []
+        for p in watched:
+            try:
+                stamp.append(os.stat(p).st_mtime_ns)
+            except OSError:
+                stamp.append(0)
+        if self._examples_index is None:
+            try:
+                with open(EXAMPLES_INDEX, 'rb') as f:
+                    self._examples_index = _json_loads(f.read())
+            except Exception:
+                self._examples_index = {}
+            if not isinstance(self._examples_index, dict) or self._examples_index.get('base') != BASE_DIR:
+                self._examples_index = {'base': BASE_DIR}
+        ent = self._examples_index.get(kind)
+        if isinstance(ent, dict) and ent.get('dir_mtime') == stamp:
+            return ent.get('entries', [])
+        _isfile_cached.cache_clear()
+        entries = scan()
+        self._examples_index[kind] = {'dir_mtime': stamp, 'entries': entries}
+        tmp = EXAMPLES_INDEX + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(EXAMPLES_INDEX), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps(self._examples_index, ensure_ascii=False).encode('utf-8'))
+            os.replace(tmp, EXAMPLES_INDEX)
+        except Exception:
+            pass
+        return entries
+
+    @staticmethod
+    def _scan_grammar_examples() -> List[List[str]]:
         # Lista alguns arquivos .txt conhecidos e dos exercícios
         examples = []
-        def add(path, label=None, input_str=''):
-            if os.path.isfile(path):
-                examples.append((path, label or os.path.basename(path), input_str))
-        add(os.path.join(BASE_DIR, 'expr.txt'), 'expr.txt', 'id + id * id')
-        add(os.path.join(BASE_DIR, 'if_else.txt'), 'if_else.txt', 'if id then id=id else id=id')
-        exdir = os.path.join(BASE_DIR, 'exercicios')
-        if os.path.isdir(exdir):
-            mapping = {
-                'ex3_fatoracao_antes.txt': 'id ( id , id )',
-                'ex3_fatoracao_depois.txt': 'id ( id , id )',
-                'ex4_rec_esq_antes.txt': 'id + id * id',
-                'ex4_rec_esq_depois.txt': 'id + id * id',
-                'ex5_ambigua_antes.txt': 'id + id * id',
-                'ex5_ambigua_prec.txt': 'id + id * id',
-                'ex2_else_com.txt': 'if id then id=id else id=id',
-                'ex2_else_sem.txt': 'if id then id=id else id=id',
-                'ex2_assign_only_slr.txt': 'id = id',
-            }
-            for fname, inp in mapping.items():
-                add(os.path.join(exdir, fname), fname, inp)
-        # preencher menu
-        menu.delete(0, 'end')
-        for path, label, inp in examples:
-            menu.add_command(label=label, command=lambda p=path, i=inp: self._apply_grammar_example(p, i))
+        def add(relpath, label=None, input_str=''):
+            if _isfile_cached(os.path.join(BASE_DIR, relpath)):
+                examples.append([relpath, label or os.path.basename(relpath), input_str])
+        add('expr.txt', 'expr.txt', 'id + id * id')
+        add('if_else.txt', 'if_else.txt', 'if id then id=id else id=id')
+        mapping = {
+            'ex3_fatoracao_antes.txt': 'id ( id , id )',
+            'ex3_fatoracao_depois.txt': 'id ( id , id )',
+            'ex4_rec_esq_antes.txt': 'id + id * id',
+            'ex4_rec_esq_depois.txt': 'id + id * id',
+            'ex5_ambigua_antes.txt': 'id + id * id',
+            'ex5_ambigua_prec.txt': 'id + id * id',
+            'ex2_else_com.txt': 'if id then id=id else id=id',
+            'ex2_else_sem.txt': 'if id then id=id else id=id',
+            'ex2_assign_only_slr.txt': 'id = id',
+        }
+        for fname, inp in mapping.items():
+            add(os.path.join('exercicios', fname), fname, inp)
+        return examples
+
+    @staticmethod
+    def _scan_simple_examples() -> List[List[str]]:
+        # Exemplos simples do diretório exemplos_simples
+        mapping = [
+            ('01 — mínimo (S->id)', '01_min.txt', 'id'),
+            ('02 — parênteses', '02_paren.txt', '( id )'),
+            ('03 — soma/prod LL(1)', '03_sum_ll1.txt', 'id + id * id'),
+            ('04 — atribuição (SLR)', '04_assign_slr.txt', 'id = id'),
+        ]
+        items = []
+        for label, fname, inp in mapping:
+            relpath = os.path.join('exemplos_simples', fname)
+            if _isfile_cached(os.path.join(BASE_DIR, relpath)):
+                items.append([relpath, label, inp])
+        return items
+
+    def _populate_grammar_examples(self, menu: tk.Menu):
+        try:
+            # a raiz do projeto muda a toda hora (settings): observa só os dois arquivos dela
+            watched = [os.path.join(BASE_DIR, 'expr.txt'), os.path.join(BASE_DIR, 'if_else.txt'),
+                       os.path.join(BASE_DIR, 'exercicios')]
+            examples = self._example_entries('grammar', watched, self._scan_grammar_examples)
+            self._fill_examples_menu(menu, examples, self._grammar_example_item)
+        except Exception:
+            pass
 
     def _populate_simple_examples(self, menu: tk.Menu):
         # Submenu com os exemplos simples do diretório exemplos_simples
         try:
-            items = []
-            def add(label: str, path: str, inp: str):
-                if os.path.isfile(path):
-                    items.append((label, path, inp))
-            sdir = os.path.join(BASE_DIR, 'exemplos_simples')
-            mapping = [
-                ('01 — mínimo (S->id)', '01_min.txt', 'id'),
-                ('02 — parênteses', '02_paren.txt', '( id )'),
-                ('03 — soma/prod LL(1)', '03_sum_ll1.txt', 'id + id * id'),
-                ('04 — atribuição (SLR)', '04_assign_slr.txt', 'id = id'),
-            ]
-            for label, fname, inp in mapping:
-                add(label, os.path.join(sdir, fname), inp)
-            menu.delete(0, 'end')
-            for label, path, inp in items:
-                menu.add_command(label=label, command=lambda p=path, i=inp: self._apply_grammar_example(p, i))
+            items = self._example_entries('simple', [os.path.join(BASE_DIR, 'exemplos_simples')],
+                                          self._scan_simple_examples)
+            self._fill_examples_menu(menu, items, self._grammar_example_item)
         except Exception:
             pass
 
+    def _post_examples(self, menu: tk.Menu, populate) -> None:
+        # só na primeira abertura (ou após "Atualizar exemplos"): nem stat nos caminhos observados
+        if str(menu) not in self._examples_menus:
+            populate(menu)
+
+    def _fill_examples_menu(self, menu: tk.Menu, entries, item) -> None:
+        """Recria os itens do menu só se a lista de entradas mudou (mesma lista = mesmo menu)."""
+        key = str(menu)
+        if self._examples_menus.get(key) is entries:
+            return
+        menu.delete(0, 'end')
+        for entry in entries:
+            label, command = item(entry)
+            menu.add_command(label=label, command=command)
+        self._examples_menus[key] = entries
+
+    def _grammar_example_item(self, entry):
+        relpath, label, inp = entry
+        return label, partial(self._apply_grammar_example, os.path.join(BASE_DIR, relpath), inp)
+
+    def _refresh_examples(self):
+        # Força novo scan de tudo (arquivos editados sem mudar o mtime dos diretórios)
+        _isfile_cached.cache_clear()
+        _regex_bank_rows.cache_clear()
+        self._examples_index = {'base': BASE_DIR}
+        self._examples_menus.clear()
+
     def _apply_grammar_example(self, path: str, input_str: str):
         self.grammar_path.set(path)
         if input_str:
@@ -656,93 +1312,143 @@ class App(tk.Tk):
             self.var_auto.set(False)
 
     def _populate_regex_examples(self, menu: tk.Menu):
-        # Carrega examples do regex_bank e cria itens
+        # Itens do regex_bank: (regex, primeira cadeia aceita)
         try:
-            bank_path = os.path.join(BASE_DIR, 'labs', '11_automatos', 'regex_bank.txt')
-            items = []
-            if os.path.isfile(bank_path):
-                with open(bank_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        s = line.strip()
-                        if not s or s.startswith('#'):
-                            continue
-                        parts = [p.strip() for p in s.split(';')]
-                        regex = parts[0]
-                        acc = parts[1] if len(parts) > 1 else ''
-                        test = acc.split(',')[0].strip() if acc else ''
-                        items.append((regex, test))
-            menu.delete(0, 'end')
-            for regex, test in items:
-                menu.add_command(label=regex, command=lambda r=regex, t=test: self._apply_regex_example(r, t))
+            items = self._example_entries('regex', [REGEX_BANK], self._scan_regex_examples)
+            self._fill_examples_menu(menu, items, self._regex_example_item)
         except Exception:
             pass
 
+    @staticmethod
+    def _scan_regex_examples() -> List[List[str]]:
+        return [[regex, sample] for regex, _, _, sample in _regex_bank()]
+
+    def _regex_example_item(self, entry):
+        regex, test = entry
+        return regex, partial(self._apply_regex_example, regex, test)
+
     def _apply_regex_example(self, regex: str, test: str):
-        if hasattr(self, 're_input'):
-            self.re_input.delete(0, 'end'); self.re_input.insert(0, regex)
-        if hasattr(self, 're_test'):
-            self.re_test.delete(0, 'end');
-            if test:
-                self.re_test.insert(0, test)
+        self._build_tab('automata_tab')
+        self.re_input_var.set(regex)
+        self.re_test_var.set(test)
 
     def _load_settings(self):
+        # um read() em binário + loads (orjson se houver); arquivo ausente = padrões
         try:
-            import json
-            if os.path.isfile(self._settings_path):
-                with open(self._settings_path,'r',encoding='utf-8') as f:
-                    self._settings = json.load(f)
+            with open(self._settings_path, 'rb') as f:
+                self._settings = _json_loads(f.read())
         except Exception:
             self._settings = {}
 
+    def _restore_settings(self, tab: str) -> None:
+        """Aplica as configurações salvas da aba `tab` e passa a observar suas variáveis."""
+        s = self._settings
+        def mark(*_):
+            self._settings_dirty = True
+        for key, owner, attr, conv, _ in _SETTINGS:
+            if owner != tab:
+                continue
+            var = self.__dict__.get(attr)
+            if var is None:
+                continue
+            if s.get(key) not in (None, ''):
+                try:
+                    var.set(conv(s[key]))
+                except Exception:
+                    pass
+            var.trace_add('write', mark)
+
+    def _collect_settings(self) -> dict:
+        # abas ainda não criadas mantêm o valor salvo
+        out = {}
+        for key, _, attr, conv, default in _SETTINGS:
+            var = self.__dict__.get(attr)
+            if var is None:
+                out[key] = self._settings.get(key, default)
+            else:
+                try:
+                    out[key] = conv(var.get())
+                except Exception:
+                    out[key] = default
+        return out
+
     def _save_settings(self):
+        if not self._settings_dirty:
+            return
         try:
-            import json
-            s = {
-                'grammar_path': self.grammar_path.get(),
-                'parser_method': self.method.get(),
-                'parser_auto_lex': bool(self.var_auto.get()),
-                'parser_trace': bool(self.var_trace.get()),
-                'parser_tables': bool(self.var_tables.get()),
-                'parser_items': bool(self.var_items.get()),
-                'sem_arith_bool': bool(self.var_arith_bool.get()) if hasattr(self,'var_arith_bool') else False,
-                'sem_eq_same': bool(self.var_eq_same.get()) if hasattr(self,'var_eq_same') else True,
-                'regex_last': self.re_input.get() if hasattr(self,'re_input') else '',
-                'regex_test_last': self.re_test.get() if hasattr(self,'re_test') else '',
-                'auto_view': self.auto_view.get() if hasattr(self,'auto_view') else 'dfa',
-                'codegen_regalloc': bool(self.var_regalloc.get()) if hasattr(self,'var_regalloc') else False,
-                'codegen_k': int(self.reg_k.get()) if hasattr(self,'reg_k') else 3,
-            }
-            with open(self._settings_path,'w',encoding='utf-8') as f:
-                json.dump(s,f,ensure_ascii=False,indent=2)
+            s = self._collect_settings()
+            # variáveis mexidas mas de volta ao valor salvo: nada a gravar
+            if s == self._settings:
+                self._settings_dirty = False
+                return
+            if _orjson is not None:
+                data = _orjson.dumps(s, option=_orjson.OPT_INDENT_2)
+            else:
+                import json
+                data = json.dumps(s, ensure_ascii=False, indent=2).encode('utf-8')
+            # escrita atômica: arquivo temporário + os.replace
+            tmp = self._settings_path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._settings_path)
+            self._settings = s
+            self._settings_dirty = False
         except Exception:
             pass
 
     def _on_close(self):
         self._save_settings()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
         self.destroy()
 
+    def _when_done(self, futures, callback, interval: int = 50):
+        # Tk não é thread-safe: em vez de callbacks nas threads do pool, a thread
+        # principal consulta os futures via after() e chama callback(futures) no fim
+        if all(f.done() for f in futures):
+            callback(futures)
+        else:
+            self.after(interval, self._when_done, futures, callback, interval)
+
+    def _dispatch(self, work, done, button=None):
+        """done(work()); com button, work roda no pool e o botão fica desabilitado até o fim."""
+        self._status('')
+        if button is None:
+            done(work())
+            return
+        button.state(['disabled'])
+
+        def finish(futures):
+            button.state(['!disabled'])
+            done(futures[0].result())
+        self._when_done([self._io_pool.submit(work)], finish)
+
+    def _status(self, msg: str, level: str = 'info'):
+        # level: 'info' (confirmações), 'warn' (falta um passo anterior); as ações
+        # que rodam limpam a barra com _status(''), então o aviso não fica velho
+        self.status.configure(text=msg, foreground=_STATUS_COLORS[level])
+
     def run_lexer(self):
+        self._status('')
         text = self.lex_input.get('1.0', 'end').rstrip('\n')
-        self.lex_output.delete('1.0', 'end')
+        # saída montada numa lista e enviada ao Text num único comando
+        parts: List[str] = []
         try:
+            lexer_template = _lexer()
             if lexer_template and hasattr(lexer_template, 'lex'):
                 tokens = lexer_template.lex(text)
-                for t in tokens:
-                    self.lex_output.insert('end', f"{t.kind:<10} {t.lexeme!r}\n")
+                parts.extend(f"{t.kind:<10} {t.lexeme!r}\n" for t in tokens)
             else:
                 # fallback simples: separa por espaço
-                for i, tok in enumerate([t for t in text.split() if t]):
-                    self.lex_output.insert('end', f"TOK{ i:03d }: {tok}\n")
+                parts.extend(f"TOK{ i:03d }: {tok}\n" for i, tok in enumerate(text.split()))
         except Exception as e:
-            self.lex_output.insert('end', f"Erro: {e}\n")
+            parts.append(f"Erro: {e}\n")
+        _set_text(self.lex_output, ''.join(parts))
 
     def fill_lexer_example(self):
         try:
             example = "# Exemplo de entrada para o lexer\nif x then y = 3\nz = y + 4\n"
-            self.lex_input.delete('1.0','end')
-            self.lex_input.insert('end', example)
-            self.lex_output.delete('1.0','end')
-            self.lex_output.insert('end', 'Exemplo preenchido. Clique em "Rodar Lexer".\n')
+            _set_text(self.lex_input, example)
+            _set_text(self.lex_output, 'Exemplo preenchido. Clique em "Rodar Lexer".\n')
         except Exception as e:
             self.lex_output.insert('end', f"Erro ao preencher exemplo: {e}\n")
 
@@ -755,10 +1461,8 @@ if total == 10 then count = count + 1
  de comentário */
 msg = num
 """
-            self.lex_input.delete('1.0','end')
-            self.lex_input.insert('end', example)
-            self.lex_output.delete('1.0','end')
-            self.lex_output.insert('end', 'Exemplo 2 preenchido. Clique em "Rodar Lexer".\n')
+            _set_text(self.lex_input, example)
+            _set_text(self.lex_output, 'Exemplo 2 preenchido. Clique em "Rodar Lexer".\n')
         except Exception as e:
             self.lex_output.insert('end', f"Erro ao preencher exemplo 2: {e}\n")
 
@@ -804,6 +1508,7 @@ msg = num
         ttk.Checkbutton(opts, text="trace", variable=self.var_trace).pack(side="left", padx=(12,0))
         ttk.Checkbutton(opts, text="tabelas", variable=self.var_tables).pack(side="left")
         ttk.Checkbutton(opts, text="itens LR(0)", variable=self.var_items).pack(side="left")
+        ttk.Button(opts, text="Só parse", command=self._parse_only).pack(side="left", padx=(12,0))
 
         # Actions
         actions = ttk.Frame(frame)
@@ -822,7 +1527,7 @@ msg = num
         ttk.Label(frame, text="Dica: use os exemplos 'dangling else' e 'resolvido' para comparar conflitos no SLR (ACTION/GOTO). Marque 'tabelas' e 'itens LR(0)' para ver detalhes; use 'Comparar' para árvores/derivações.").pack(anchor='w', padx=8, pady=(4,0))
 
         # Output
-        self.out_text = tk.Text(frame)
+        self.out_text = tk.Text(frame, **_LOG_TEXT)
         self.out_text.pack(fill="both", expand=True, padx=8, pady=6)
 
         # Store last results
@@ -838,36 +1543,40 @@ msg = num
         if path:
             self.grammar_path.set(path)
 
+    def _parse_only(self):
+        # desliga trace, tabelas e itens: a saída fica só com gramática e resultados
+        self.var_trace.set(False)
+        self.var_tables.set(False)
+        self.var_items.set(False)
+
     def fill_parser_example(self):
         try:
             expr = os.path.join(BASE_DIR, 'expr.txt')
-            if os.path.isfile(expr):
+            if _isfile_cached(expr):
                 self.grammar_path.set(expr)
             self.input_str.set('id + id * id')
             self.var_auto.set(False)
             self.method.set('both')
-            self.out_text.delete('1.0','end')
-            self.out_text.insert('end', 'Exemplo preenchido. Clique em "Executar".\n')
+            _set_text(self.out_text, 'Exemplo preenchido. Clique em "Executar".\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao preencher exemplo: {e}')
 
     def fill_parser_example_ifelse(self):
         try:
             g = os.path.join(BASE_DIR, 'if_else.txt')
-            if os.path.isfile(g):
+            if _isfile_cached(g):
                 self.grammar_path.set(g)
             self.input_str.set('if id then id=id else id=id')
             self.var_auto.set(True)
             self.method.set('slr1')
-            self.out_text.delete('1.0','end')
-            self.out_text.insert('end', 'Exemplo if-else preenchido. Clique em "Executar".\n')
+            _set_text(self.out_text, 'Exemplo if-else preenchido. Clique em "Executar".\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao preencher exemplo if-else: {e}')
 
     def fill_parser_example_dangling(self):
         try:
             g = os.path.join(BASE_DIR, 'exercicios', 'ex2_else_sem.txt')
-            if os.path.isfile(g):
+            if _isfile_cached(g):
                 self.grammar_path.set(g)
             else:
                 # fallback: usa if_else.txt como aproximação
@@ -875,107 +1584,136 @@ msg = num
             self.input_str.set('if id then id=id else id=id')
             self.var_auto.set(True)
             self.method.set('slr1')
-            self.out_text.delete('1.0','end')
-            self.out_text.insert('end', 'Exemplo dangling else (sem %Right else) preenchido. Clique em "Executar" e observe conflitos.\n')
+            _set_text(self.out_text, 'Exemplo dangling else (sem %Right else) preenchido. Clique em "Executar" e observe conflitos.\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao preencher exemplo dangling else: {e}')
 
     def fill_parser_example_else_resolved(self):
         try:
             g = os.path.join(BASE_DIR, 'exercicios', 'ex2_else_com.txt')
-            if os.path.isfile(g):
+            if _isfile_cached(g):
                 self.grammar_path.set(g)
             else:
                 self.grammar_path.set(os.path.join(BASE_DIR, 'if_else.txt'))
             self.input_str.set('if id then id=id else id=id')
             self.var_auto.set(True)
             self.method.set('slr1')
-            self.out_text.delete('1.0','end')
-            self.out_text.insert('end', 'Exemplo resolvido com %Right else preenchido. Clique em "Executar" e compare com o caso sem %Right else.\n')
+            _set_text(self.out_text, 'Exemplo resolvido com %Right else preenchido. Clique em "Executar" e compare com o caso sem %Right else.\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao preencher exemplo resolvido: {e}')
 
     def run_parser(self):
-        self.out_text.delete('1.0', 'end')
+        self._status('')
         gpath = self.grammar_path.get().strip()
         inp = self.input_str.get().strip()
         if not os.path.isfile(gpath):
+            self.out_text.delete('1.0', 'end')
             messagebox.showerror("Erro", "Informe um arquivo de gramática válido.")
             return
+        # saída montada numa lista e enviada ao Text num único comando
+        parts: List[str] = []
+        out = parts.append
+        # opções lidas uma vez (cada Var.get() é uma chamada ao Tcl)
+        want_tables = self.var_tables.get()
+        want_trace = self.var_trace.get()
+        want_items = self.var_items.get()
         try:
-            g = Grammar.from_file(gpath)
-            ff = FirstFollow(g)
+            pt = _pt()
+            # gramática, FIRST/FOLLOW e tabelas só são refeitas quando o arquivo muda
+            st = os.stat(gpath)
+            g, ff, built = _load_grammar(gpath, st.st_mtime_ns, st.st_size)
+
+            def cached(name, make):
+                v = built.get(name)
+                if v is None:
+                    v = built[name] = make()
+                return v
+
+            def tables(name, p):
+                # print_tables escreve em stdout: captura num buffer e guarda o texto
+                show = bool(want_items)
+                def render():
+                    buf = io.StringIO()
+                    with contextlib.redirect_stdout(buf):
+                        p.print_tables(show_items=show)
+                    return buf.getvalue()
+                return cached(f'{name} tables items={show}', render)
+
             if self.var_auto.get():
-                tokens = auto_lex(inp, g)
+                tokens = list(_auto_lex(inp, g))
             else:
-                tokens = [t for t in inp.split() if t]
+                tokens = inp.split()
             # reset stored parsers/results
             self.parsers = {}
-            self.out_text.insert('end', "=== Gramática ===\n")
-            self.out_text.insert('end', str(g) + "\n\n")
-            self.out_text.insert('end', "=== FIRST ===\n")
-            for k in sorted(ff.first.keys()):
-                self.out_text.insert('end', f"FIRST({k}) = {{ {', '.join(sorted(ff.first[k]))} }}\n")
-            self.out_text.insert('end', "=== FOLLOW ===\n")
-            for k in sorted(ff.follow.keys()):
-                self.out_text.insert('end', f"FOLLOW({k}) = {{ {', '.join(sorted(ff.follow[k]))} }}\n")
-            self.out_text.insert('end', "\n")
+            out("=== Gramática ===\n")
+            out(str(g) + "\n\n")
+            # sem trace nem tabelas (modo "só parse"): FIRST/FOLLOW também ficam de fora
+            if want_tables or want_trace:
+                out(cached('first_follow', lambda: self._first_follow_text(ff)))
 
             self.result_ll1 = None
             self.result_slr = None
             method = self.method.get()
             if method in ("ll1", "both", "all"):
-                self.out_text.insert('end', "=== LL(1) ===\n")
-                ll1 = LL1Parser(g, ff)
-                if self.var_tables.get():
-                    # print only non-empty entries
-                    keys = sorted(g.terminals | {'$'})
-                    self.out_text.insert('end', "LL(1) Parse Table (non-empty entries):\n")
-                    for A in sorted(g.nonterminals):
-                        for a in keys:
-                            if a in ll1.table.get(A, {}):
-                                prod = ll1.table[A][a]
-                                rhs = 'ε' if prod == ['ε'] else (prod[0] if prod == ['ε'] else (' '.join(prod)))
-                                self.out_text.insert('end', f"  M[{A}, {a}] = {rhs}\n")
-                self.result_ll1 = ll1.parse(tokens, trace=self.var_trace.get())
+                out("=== LL(1) ===\n")
+                ll1 = cached('LL(1)', lambda: pt.LL1Parser(g, ff))
+                if want_tables:
+                    out(cached('LL(1) table', lambda: self._ll1_table_text(ll1, g)))
+                self.result_ll1 = ll1.parse(tokens, trace=want_trace)
                 self.parsers['LL(1)'] = ll1
-                self.out_text.insert('end', f"Resultado LL(1): {'ACEITA' if self.result_ll1.ok else 'REJEITA'}\n\n")
+                out(f"Resultado LL(1): {'ACEITA' if self.result_ll1.ok else 'REJEITA'}\n\n")
 
             if method in ("slr1", "both", "all"):
-                self.out_text.insert('end', "=== SLR(1) ===\n")
-                slr = SLR1Parser(g, ff)
-                if self.var_tables.get() or self.var_items.get():
-                    from io import StringIO
-                    buf = StringIO()
-                    # Reutiliza print_tables do SLR
-                    slr.print_tables(show_items=self.var_items.get())
-                self.result_slr = slr.parse(tokens, trace=self.var_trace.get())
+                out("=== SLR(1) ===\n")
+                slr = cached('SLR(1)', lambda: pt.SLR1Parser(g, ff))
+                if want_tables or want_items:
+                    out(tables('SLR(1)', slr))
+                self.result_slr = slr.parse(tokens, trace=want_trace)
                 self.parsers['SLR(1)'] = slr
-                self.out_text.insert('end', f"Resultado SLR(1): {'ACEITA' if self.result_slr.ok else 'REJEITA'}\n\n")
+                out(f"Resultado SLR(1): {'ACEITA' if self.result_slr.ok else 'REJEITA'}\n\n")
 
             if method in ("lalr1", "all"):
-                self.out_text.insert('end', "=== LALR(1) ===\n")
-                from parsing_tester import LR1Parser
-                lalr = LR1Parser(g, ff, mode='lalr1')
-                if self.var_tables.get() or self.var_items.get():
-                    lalr.print_tables(show_items=self.var_items.get())
-                self.result_lalr = lalr.parse(tokens, trace=self.var_trace.get())
+                out("=== LALR(1) ===\n")
+                lalr = cached('LALR(1)', lambda: pt.LR1Parser(g, ff, mode='lalr1'))
+                if want_tables or want_items:
+                    out(tables('LALR(1)', lalr))
+                self.result_lalr = lalr.parse(tokens, trace=want_trace)
                 self.parsers['LALR(1)'] = lalr
-                self.out_text.insert('end', f"Resultado LALR(1): {'ACEITA' if self.result_lalr.ok else 'REJEITA'}\n\n")
+                out(f"Resultado LALR(1): {'ACEITA' if self.result_lalr.ok else 'REJEITA'}\n\n")
 
             if method in ("lr1", "all"):
-                self.out_text.insert('end', "=== LR(1) ===\n")
-                from parsing_tester import LR1Parser
-                lr1 = LR1Parser(g, ff, mode='lr1')
-                if self.var_tables.get() or self.var_items.get():
-                    lr1.print_tables(show_items=self.var_items.get())
-                self.result_lr1 = lr1.parse(tokens, trace=self.var_trace.get())
+                out("=== LR(1) ===\n")
+                lr1 = cached('LR(1)', lambda: pt.LR1Parser(g, ff, mode='lr1'))
+                if want_tables or want_items:
+                    out(tables('LR(1)', lr1))
+                self.result_lr1 = lr1.parse(tokens, trace=want_trace)
                 self.parsers['LR(1)'] = lr1
-                self.out_text.insert('end', f"Resultado LR(1): {'ACEITA' if self.result_lr1.ok else 'REJEITA'}\n\n")
+                out(f"Resultado LR(1): {'ACEITA' if self.result_lr1.ok else 'REJEITA'}\n\n")
 
             self.last_grammar = g
         except Exception as e:
+            _set_text(self.out_text, ''.join(parts))
             messagebox.showerror("Erro", str(e))
+            return
+        _set_text(self.out_text, ''.join(parts))
+
+    @staticmethod
+    def _ll1_table_text(ll1, g) -> str:
+        # só as entradas não vazias: percorre as linhas da tabela, não N×T células
+        keys = g.terminals | {'$'}
+        lines = ["LL(1) Parse Table (non-empty entries):\n"]
+        for A, row in sorted(ll1.table.items()):
+            if A not in g.nonterminals:
+                continue
+            lines.extend(f"  M[{A}, {a}] = {'ε' if row[a] == ['ε'] else ' '.join(row[a])}\n"
+                         for a in sorted(row.keys() & keys))
+        return ''.join(lines)
+
+    @staticmethod
+    def _first_follow_text(ff) -> str:
+        first = [f"FIRST({k}) = {{ {', '.join(sorted(v))} }}" for k, v in sorted(ff.first.items())]
+        follow = [f"FOLLOW({k}) = {{ {', '.join(sorted(v))} }}" for k, v in sorted(ff.follow.items())]
+        return "=== FIRST ===\n" + "\n".join(first) + "\n=== FOLLOW ===\n" + "\n".join(follow) + "\n\n"
 
     def show_trees(self):
         trees = []
@@ -988,146 +1726,46 @@ msg = num
         if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None:
             trees.append(("LR(1)", self.result_lr1.tree, self.result_lr1.derivations, self.result_lr1.kind))
         if trees:
-            show_trees_gui(trees)
+            _pt().show_trees_gui(trees)
         else:
-            messagebox.showinfo("Info", "Nenhuma árvore aceita para exibir.")
-
-    def _draw_tree_on_canvas(self, canvas: tk.Canvas, root):
-        # Desenha uma árvore simples
-        def compute(n):
-            nodes = []
-            pos = {}
-            leaf_counter = [0]
-            max_depth = [0]
-            def dfs(x, depth):
-                max_depth[0] = max(max_depth[0], depth)
-                nodes.append(x)
-                if not x.children:
-                    i = leaf_counter[0]; leaf_counter[0]+=1
-                    pos[id(x)] = (float(i), depth)
-                    return float(i)
-                xs=[]
-                for c in x.children:
-                    xs.append(dfs(c, depth+1))
-                x0 = sum(xs)/len(xs) if xs else float(leaf_counter[0])
-                pos[id(x)] = (x0, depth)
-                return x0
-            dfs(n,0)
-            return pos, leaf_counter[0], max_depth[0], nodes
-        pos, leafs, depth, nodes = compute(root)
-        HSPACE=90; VSPACE=80; MARGIN=20
-        def center(x):
-            u,v = pos[id(x)]; return (u*HSPACE+MARGIN, v*VSPACE+MARGIN)
-        canvas.delete('all')
-        for n in nodes:
-            cx,cy = center(n)
-            for ch in n.children:
-                x2,y2 = center(ch)
-                canvas.create_line(cx, cy+12, x2, y2-12, fill='#555')
-        for n in nodes:
-            cx,cy = center(n)
-            label = n.symbol
-            w=max(36, 8*len(label)+12); h=26
-            canvas.create_rectangle(cx-w/2, cy-h/2, cx+w/2, cy+h/2, fill='#e8f0fe', outline='#3b82f6')
-            canvas.create_text(cx, cy, text=label)
-        bbox = canvas.bbox('all')
-        if bbox:
-            canvas.configure(scrollregion=bbox)
-
-    def compare_trees(self):
-        trees=[]
-        if self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None:
-            trees.append(('LL(1)', self.result_ll1.tree))
-        if self.result_slr and self.result_slr.ok and self.result_slr.tree is not None:
-            trees.append(('SLR(1)', self.result_slr.tree))
-        if self.result_lalr and self.result_lalr.ok and self.result_lalr.tree is not None:
-            trees.append(('LALR(1)', self.result_lalr.tree))
-        if self.result_lr1 and self.result_lr1.ok and self.result_lr1.tree is not None:
-            trees.append(('LR(1)', self.result_lr1.tree))
-        if not trees:
-            messagebox.showinfo('Info','Nenhuma árvore aceita para comparar.')
-            return
-        win = tk.Toplevel(self)
-        win.title('Comparar Árvores')
-        top = ttk.Frame(win)
-        top.pack(fill='x', padx=8, pady=6)
-        # resumo de métricas
-        summary = []
-        for name, parser in self.parsers.items():
-            try:
-                states = getattr(parser, 'states', None)
-                nstates = len(states) if states is not None else '-'
-                nconf = len(getattr(parser, 'conflicts', []))
-                # entradas de ação ou tabela
-                action_entries = None
-                if hasattr(parser, 'ACTION') and isinstance(getattr(parser, 'ACTION'), dict):
-                    action_entries = len(getattr(parser, 'ACTION'))
-                elif hasattr(parser, 'table') and isinstance(getattr(parser, 'table'), dict):
-                    action_entries = sum(len(v) for v in getattr(parser, 'table').values())
-                ae = f", ações={action_entries}" if action_entries is not None else ''
-                summary.append(f"{name}: estados={nstates}, conflitos={nconf}{ae}")
-            except Exception:
-                pass
-        ttk.Label(top, text=' | '.join(summary)).pack(anchor='w')
-        grid = ttk.Frame(win)
-        grid.pack(fill='both', expand=True)
-        cols = min(2, len(trees))
-        for i,(title, root) in enumerate(trees):
-            frame = ttk.Frame(grid, borderwidth=1, relief='sunken')
-            frame.grid(row=i//cols, column=i%cols, sticky='nsew', padx=6, pady=6)
-            ttk.Label(frame, text=title).pack(anchor='w')
-            canvas = tk.Canvas(frame, background='white', width=480, height=360)
-            hbar = ttk.Scrollbar(frame, orient='horizontal', command=canvas.xview)
-            vbar = ttk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-            canvas.configure(xscrollcommand=hbar.set, yscrollcommand=vbar.set)
-            canvas.pack(side='left', fill='both', expand=True)
-            vbar.pack(side='right', fill='y')
-            hbar.pack(side='bottom', fill='x')
-            self._draw_tree_on_canvas(canvas, root)
+            self._status("Nenhuma árvore aceita para exibir.", 'warn')
 
     def _draw_tree_on_canvas(self, canvas: tk.Canvas, root):
-        # Desenha uma árvore simples, inspirado no export SVG
-        def compute(n):
-            nodes = []
-            pos = {}
-            leaf_counter = [0]
-            max_depth = [0]
-            def dfs(x, depth):
-                max_depth[0] = max(max_depth[0], depth)
-                nodes.append(x)
-                if not x.children:
-                    i = leaf_counter[0]; leaf_counter[0]+=1
-                    pos[id(x)] = (float(i), depth)
-                    return float(i)
-                xs=[]
-                for c in x.children:
-                    xs.append(dfs(c, depth+1))
-                x0 = sum(xs)/len(xs) if xs else float(leaf_counter[0])
-                pos[id(x)] = (x0, depth)
-                return x0
-            dfs(n,0)
-            return pos, leaf_counter[0], max_depth[0], nodes
-        pos, leafs, depth, nodes = compute(root)
+        # Desenha uma árvore simples, inspirado no export SVG.
+        labels, parent, xs, ys = _tree_layout(root)
+        n = len(labels)
         HSPACE=90; VSPACE=80; MARGIN=20
-        def center(x):
-            u,v = pos[id(x)]; return (u*HSPACE+MARGIN, v*VSPACE+MARGIN)
+        cx = [x * HSPACE + MARGIN for x in xs]
+        cy = [y * VSPACE + MARGIN for y in ys]
         canvas.delete('all')
-        # edges
-        for n in nodes:
-            cx,cy = center(n)
-            for ch in n.children:
-                x2,y2 = center(ch)
-                canvas.create_line(cx, cy+12, x2, y2-12, fill='#555')
+        # edges: uma única polilinha percorrendo a árvore (passeio de Euler) em vez de
+        # um create_line por aresta. Os trechos verticais dentro de cada nó e os de
+        # volta (sobre arestas já traçadas) ficam escondidos sob os retângulos.
+        if n > 1:
+            pts = [cx[0], cy[0]+12]
+            cur = 0
+            for i in range(1, n):
+                p = parent[i]
+                while cur != p:  # sobe até o pai do próximo nó da pré-ordem
+                    up = parent[cur]
+                    pts += (cx[cur], cy[cur]-12, cx[up], cy[up]+12)
+                    cur = up
+                pts += (cx[i], cy[i]-12, cx[i], cy[i]+12)
+                cur = i
+            canvas.create_line(*pts, fill='#555')
         # nodes
-        for n in nodes:
-            cx,cy = center(n)
-            label = n.symbol
+        rect = canvas.create_rectangle
+        text = canvas.create_text
+        x0 = x1 = cx[0] if n else 0.0
+        for i, label in enumerate(labels):
+            x, y = cx[i], cy[i]
             w=max(36, 8*len(label)+12); h=26
-            canvas.create_rectangle(cx-w/2, cy-h/2, cx+w/2, cy+h/2, fill='#e8f0fe', outline='#3b82f6')
-            canvas.create_text(cx, cy, text=label)
-        bbox = canvas.bbox('all')
-        if bbox:
-            canvas.configure(scrollregion=bbox)
+            rect(x-w/2, y-h/2, x+w/2, y+h/2, fill='#e8f0fe', outline='#3b82f6')
+            text(x, y, text=label)
+            x0 = min(x0, x-w/2); x1 = max(x1, x+w/2)
+        # scrollregion pela geometria já conhecida, sem consultar bbox ao Tk
+        if n:
+            canvas.configure(scrollregion=(x0-2, min(cy)-h/2-2, x1+2, max(cy)+h/2+2))
 
     def compare_trees(self):
         trees=[]
@@ -1140,7 +1778,7 @@ msg = num
         if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None:
             trees.append(('LR(1)', self.result_lr1.tree))
         if not trees:
-            messagebox.showinfo('Info','Nenhuma árvore aceita para comparar.')
+            self._status('Nenhuma árvore aceita para comparar.', 'warn')
             return
         win = tk.Toplevel(self)
         win.title('Comparar Árvores')
@@ -1158,57 +1796,66 @@ msg = num
             canvas.pack(side='left', fill='both', expand=True)
             vbar.pack(side='right', fill='y')
             hbar.pack(side='bottom', fill='x')
-            self._draw_tree_on_canvas(canvas, root)
+            # desenho adiado: a janela aparece primeiro, cada árvore entra quando o Tk fica ocioso
+            win.after_idle(partial(self._draw_tree_on_canvas, canvas, root))
 
     def export_svg(self):
         if not (self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree) and not (self.result_slr and self.result_slr.ok and self.result_slr.tree):
-            messagebox.showinfo("Info", "Execute e obtenha uma árvore aceita antes de exportar.")
+            self._status("Execute e obtenha uma árvore aceita antes de exportar.", 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension=".svg", filetypes=[("SVG", ".svg")])
         if not path:
             return
         try:
-            if self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None and self.method.get() in ("ll1", "both", "all"):
-                base = path[:-4] if path.lower().endswith('.svg') else path
+            export_tree_svg = _pt().export_tree_svg
+            method = self.method.get()
+            base = path[:-4] if path.lower().endswith('.svg') else path
+            if self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None and method in ("ll1", "both", "all"):
                 export_tree_svg(self.result_ll1.tree, base + "_ll1.svg")
-            if self.result_slr and self.result_slr.ok and self.result_slr.tree is not None and self.method.get() in ("slr1", "both", "all"):
-                base = path[:-4] if path.lower().endswith('.svg') else path
+            if self.result_slr and self.result_slr.ok and self.result_slr.tree is not None and method in ("slr1", "both", "all"):
                 export_tree_svg(self.result_slr.tree, base + "_slr1.svg")
-            if getattr(self, 'result_lalr', None) and self.result_lalr.ok and self.result_lalr.tree is not None and self.method.get() in ("lalr1", "all"):
-                base = path[:-4] if path.lower().endswith('.svg') else path
+            if getattr(self, 'result_lalr', None) and self.result_lalr.ok and self.result_lalr.tree is not None and method in ("lalr1", "all"):
                 export_tree_svg(self.result_lalr.tree, base + "_lalr1.svg")
-            if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None and self.method.get() in ("lr1", "all"):
-                base = path[:-4] if path.lower().endswith('.svg') else path
+            if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None and method in ("lr1", "all"):
                 export_tree_svg(self.result_lr1.tree, base + "_lr1.svg")
-            messagebox.showinfo("OK", "SVG(s) exportado(s).")
+            self._status("SVG(s) exportado(s).")
         except Exception as e:
             messagebox.showerror("Erro", str(e))
 
     def export_json(self):
         # Exporta árvore(s) aceitas em JSON
         if not (self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree) and not (self.result_slr and self.result_slr.ok and self.result_slr.tree):
-            messagebox.showinfo("Info", "Execute e obtenha uma árvore aceita antes de exportar.")
+            self._status("Execute e obtenha uma árvore aceita antes de exportar.", 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", ".json")])
         if not path:
             return
         try:
             base = path[:-5] if path.lower().endswith('.json') else path
-            if self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None and self.method.get() in ("ll1", "both", "all"):
-                from parsing_tester import export_tree_json
-                export_tree_json(self.result_ll1.tree, base + "_ll1.json", self.result_ll1.derivations, self.result_ll1.kind)
-            if self.result_slr and self.result_slr.ok and self.result_slr.tree is not None and self.method.get() in ("slr1", "both", "all"):
-                from parsing_tester import export_tree_json
-                export_tree_json(self.result_slr.tree, base + "_slr1.json", self.result_slr.derivations, self.result_slr.kind)
-            if getattr(self, 'result_lalr', None) and self.result_lalr.ok and self.result_lalr.tree is not None and self.method.get() in ("lalr1", "all"):
-                from parsing_tester import export_tree_json
-                export_tree_json(self.result_lalr.tree, base + "_lalr1.json", self.result_lalr.derivations, self.result_lalr.kind)
-            if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None and self.method.get() in ("lr1", "all"):
-                from parsing_tester import export_tree_json
-                export_tree_json(self.result_lr1.tree, base + "_lr1.json", self.result_lr1.derivations, self.result_lr1.kind)
-            messagebox.showinfo("OK", "JSON exportado(s).")
+            export_tree_json = _pt().export_tree_json
+            # lê o estado do Tk aqui; só a serialização/escrita vai para o pool
+            method = self.method.get()
+            jobs = []
+            if self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None and method in ("ll1", "both", "all"):
+                jobs.append((self.result_ll1, "_ll1.json"))
+            if self.result_slr and self.result_slr.ok and self.result_slr.tree is not None and method in ("slr1", "both", "all"):
+                jobs.append((self.result_slr, "_slr1.json"))
+            if getattr(self, 'result_lalr', None) and self.result_lalr.ok and self.result_lalr.tree is not None and method in ("lalr1", "all"):
+                jobs.append((self.result_lalr, "_lalr1.json"))
+            if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None and method in ("lr1", "all"):
+                jobs.append((self.result_lr1, "_lr1.json"))
+            futures = [self._io_pool.submit(export_tree_json, r.tree, base + suffix, r.derivations, r.kind)
+                       for r, suffix in jobs]
         except Exception as e:
             messagebox.showerror("Erro", str(e))
+            return
+        def done(futures):
+            errors = [str(f.exception()) for f in futures if f.exception() is not None]
+            if errors:
+                messagebox.showerror("Erro", "\n".join(errors))
+            else:
+                self._status("JSON exportado(s).")
+        self._when_done(futures, done)
 
     # ===== Semântica =====
     def _build_semantics_tab(self, parent):
@@ -1237,17 +1884,28 @@ msg = num
         ttk.Checkbutton(opts, text="Permitir aritmética em bool", variable=self.var_arith_bool).pack(side='left')
         ttk.Checkbutton(opts, text="'==' exige mesmo tipo", variable=self.var_eq_same).pack(side='left', padx=12)
         ttk.Label(frame, text="Dica: importe árvore do Parser para gerar AST automaticamente; ajuste regras de tipo nos checkboxes e analise os erros listados abaixo.").pack(anchor='w', padx=8, pady=(2,0))
-        self.sema_output = tk.Text(frame, height=20)
+        self.sema_output = tk.Text(frame, height=20, **_LOG_TEXT)
         self.sema_output.pack(fill='both', expand=True, padx=8, pady=6)
-        self.ast_prog = None
         return frame
 
+    # módulos dos labs 06/07 usados em toda a cadeia AST -> TAC: resolvidos uma vez por instância
+    @property
+    def lab06(self):
+        if self._lab06 is None:
+            self._lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
+        return self._lab06
+
+    @property
+    def lab07(self):
+        if self._lab07 is None:
+            self._lab07 = _load_module('labs/07_ast_ir/tac_template.py', 'lab07_tac')
+        return self._lab07
+
     def _parse_simple_program(self, text: str):
         # Constrói AST simples a partir de linhas "var = expr"
-        lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-        Program, Assign, Var, Num, BinOp = lab06.Program, lab06.Assign, lab06.Var, lab06.Num, lab06.BinOp
+        lab06 = self.lab06
+        Program, Assign = lab06.Program, lab06.Assign
         stmts = []
-        import re
         for line in text.splitlines():
             s = line.strip()
             if not s or s.startswith('#'):
@@ -1256,76 +1914,37 @@ msg = num
                 raise ValueError(f"Linha inválida (esperado '='): {s}")
             name, expr = s.split('=', 1)
             name = name.strip()
-            tokens = re.findall(r"[A-Za-z_][A-Za-z0-9_]*|\d+|==|\+|\*|\(|\)", expr)
-            pos = 0
-            def peek():
-                return tokens[pos] if pos < len(tokens) else None
-            def eat(tok=None):
-                nonlocal pos
-                if tok is None or peek() == tok:
-                    t = peek(); pos += 1; return t
-                raise ValueError(f"Esperado {tok}, obtido {peek()}")
-            def parse_primary():
-                t = peek()
-                if t is None:
-                    raise ValueError("Expressão incompleta")
-                if t.isdigit():
-                    eat(); return Num(int(t))
-                if re.match(r"[A-Za-z_]", t):
-                    eat(); return Var(t)
-                if t == '(':
-                    eat('(')
-                    e = parse_expr()
-                    eat(')')
-                    return e
-                raise ValueError(f"Token inesperado: {t}")
-            def parse_term():
-                e = parse_primary()
-                while peek() == '*':
-                    eat('*')
-                    e = BinOp('*', e, parse_primary())
-                return e
-            def parse_add():
-                e = parse_term()
-                while peek() == '+':
-                    eat('+')
-                    e = BinOp('+', e, parse_term())
-                return e
-            def parse_expr():
-                e = parse_add()
-                if peek() == '==':
-                    eat('==')
-                    e = BinOp('==', e, parse_add())
-                return e
-            ast_e = parse_expr()
-            if pos != len(tokens):
-                raise ValueError(f"Sobrou input em: {' '.join(tokens[pos:])}")
+            tokens = _TOKEN_RE.findall(expr)
+            p = _ExprParser(tokens, lab06)
+            ast_e = p.parse_expr()
+            if p.pos != len(tokens):
+                raise ValueError(f"Sobrou input em: {' '.join(tokens[p.pos:])}")
             stmts.append(Assign(name, ast_e))
         return Program(stmts)
 
     def run_semantics(self):
-        self.sema_output.delete('1.0','end')
+        self._build_tab('sema_tab')  # também via atalho Ctrl+Y
+        self._status('')
+        parts: List[str] = []
         try:
-            lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
+            lab06 = self.lab06
             prog = self._parse_simple_program(self.sema_input.get('1.0','end'))
             tc = lab06.TypeChecker(allow_arith_on_bool=self.var_arith_bool.get(), eq_requires_same_type=self.var_eq_same.get())
             errs = tc.check(prog)
             self.ast_prog = prog
             if errs:
-                for e in errs:
-                    self.sema_output.insert('end', f"Erro: {e}\n")
+                parts.extend(f"Erro: {e}\n" for e in errs)
             else:
-                self.sema_output.insert('end', "Sem erros de tipo.\n")
+                parts.append("Sem erros de tipo.\n")
         except Exception as e:
-            self.sema_output.insert('end', f"Erro: {e}\n")
+            parts.append(f"Erro: {e}\n")
+        _set_text(self.sema_output, ''.join(parts))
 
     def fill_sema_example(self):
         try:
             example = "x = 1\ny = x + 2\nz = y * 3\nw = y == 3\n"
-            self.sema_input.delete('1.0','end')
-            self.sema_input.insert('end', example)
-            self.sema_output.delete('1.0','end')
-            self.sema_output.insert('end', 'Exemplo preenchido. Clique em "Analisar Tipos".\n')
+            _set_text(self.sema_input, example)
+            _set_text(self.sema_output, 'Exemplo preenchido. Clique em "Analisar Tipos".\n')
         except Exception as e:
             self.sema_output.insert('end', f"Erro ao preencher exemplo: {e}\n")
 
@@ -1333,24 +1952,23 @@ msg = num
         try:
             # Deve gerar erro de tipo (bool em aritmética)
             example = "x = 1\ny = x == 2\nz = y + 3\n"
-            self.sema_input.delete('1.0','end')
-            self.sema_input.insert('end', example)
-            self.sema_output.delete('1.0','end')
-            self.sema_output.insert('end', 'Exemplo com erro preenchido. Clique em "Analisar Tipos".\n')
+            _set_text(self.sema_input, example)
+            _set_text(self.sema_output, 'Exemplo com erro preenchido. Clique em "Analisar Tipos".\n')
         except Exception as e:
             self.sema_output.insert('end', f"Erro ao preencher exemplo: {e}\n")
 
     def push_ast_to_ir(self):
+        self._build_tab('ir_tab')
         if not self.ast_prog:
-            messagebox.showinfo("Info", "Analise um programa primeiro.")
+            self._status("Analise um programa primeiro.", 'warn')
             return
         try:
-            self.ir_input.delete('1.0','end')
-            self.ir_input.insert('end', "AST disponível na memória. Clique 'Gerar TAC'.")
+            _set_text(self.ir_input, "AST disponível na memória. Clique 'Gerar TAC'.")
         except Exception:
             pass
 
     def import_tree_from_parser(self):
+        self._build_tab('sema_tab')  # também via atalho Ctrl+I
         # Usa a última árvore aceita (ordem: LR(1) > LALR(1) > SLR(1) > LL(1)) e converte para AST
         tree = None
         if getattr(self, 'result_lr1', None) and self.result_lr1.ok and self.result_lr1.tree is not None:
@@ -1362,21 +1980,12 @@ msg = num
         elif self.result_ll1 and self.result_ll1.ok and self.result_ll1.tree is not None:
             tree = self.result_ll1.tree
         if tree is None:
-            messagebox.showinfo('Info','Nenhuma árvore aceita disponível. Rode o Parser primeiro.')
+            self._status('Nenhuma árvore aceita disponível. Rode o Parser primeiro.', 'warn')
             return
         try:
-            lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-            # heurística simples: se gramática tem 'E'/'T'/'F', trate como expressão; se tiver 'Stmt', trate como if/else/assign
-            gpath = self.grammar_path.get().lower()
-            if 'if_else' in gpath or 'stmt' in gpath:
-                prog = lab06.Program([ self._stmt_from_if_tree(tree) ])
-            else:
-                expr_ast = self._expr_from_tree(tree)
-                prog = lab06.Program([lab06.Assign('x', expr_ast)])
-            self.ast_prog = prog
+            self.ast_prog = self._program_from_tree(tree)
             # Atualiza painel
-            self.sema_input.delete('1.0','end')
-            self.sema_input.insert('end', '<AST importada do Parser>\n')
+            _set_text(self.sema_input, '<AST importada do Parser>\n')
             self.sema_output.insert('end', 'Árvore importada como AST.\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao converter árvore para AST: {e}')
@@ -1387,106 +1996,125 @@ msg = num
         if not path:
             return
         try:
-            import json
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(path, 'rb') as f:
+                data = _json_loads(f.read())
             tree_dict = data.get('tree') or data
-            def build_node(d):
-                from parsing_tester import ParseTreeNode
-                n = ParseTreeNode(d['symbol'], [])
-                for ch in d.get('children', []):
-                    n.children.append(build_node(ch))
-                return n
-            root = build_node(tree_dict)
-            # usa heurística conforme caminho da gramática
-            lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-            gpath = self.grammar_path.get().lower()
-            if 'if_else' in gpath or 'stmt' in gpath:
-                prog = lab06.Program([ self._stmt_from_if_tree(root) ])
-            else:
-                expr_ast = self._expr_from_tree(root)
-                prog = lab06.Program([lab06.Assign('x', expr_ast)])
-            self.ast_prog = prog
-            self.sema_input.delete('1.0','end')
-            self.sema_input.insert('end', '<AST importada de JSON>\n')
+            # reconstrução iterativa (pilha explícita): árvores LR(1) profundas
+            # não esbarram no limite de recursão
+            ParseTreeNode = _pt().ParseTreeNode
+            root = ParseTreeNode(tree_dict['symbol'], [])
+            stack = [(tree_dict, root)]
+            while stack:
+                d, n = stack.pop()
+                for ch in d.get('children', ()):
+                    c = ParseTreeNode(ch['symbol'], [])
+                    n.children.append(c)
+                    stack.append((ch, c))
+            self.ast_prog = self._program_from_tree(root)
+            _set_text(self.sema_input, '<AST importada de JSON>\n')
             self.sema_output.insert('end', 'Árvore JSON importada e convertida em AST.\n')
         except Exception as e:
             messagebox.showerror('Erro', f'Falha ao importar árvore JSON: {e}')
 
+    def _program_from_tree(self, tree):
+        # heurística pelo caminho da gramática: if_else/stmt -> comandos; senão expressão (E/T/F)
+        lab06 = self.lab06
+        if _is_stmt_grammar(self.grammar_path.get()):
+            return lab06.Program([self._stmt_from_if_tree(tree)])
+        return lab06.Program([lab06.Assign('x', self._expr_from_tree(tree))])
+
     def _expr_from_tree(self, node):
         # Converte a gramática expr.txt em AST (Var/Num/BinOp) — aceita id/num, +, * e parênteses
-        lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
+        lab06 = self.lab06
+        # memo por id(nó): subárvores compartilhadas (árvores importadas) convertidas uma vez;
+        # vale só durante esta chamada, então os ids não são reaproveitados
+        memo = {}
         def parse_E(n):
             # E -> T E'
-            t = parse_T(n.children[0])
-            return parse_Ep(n.children[1], t)
+            r = memo.get(id(n))
+            if r is None:
+                r = memo[id(n)] = parse_Ep(n.children[1], parse_T(n.children[0]))
+            return r
         def parse_Ep(n, left):
             # E' -> + T E' | ε
-            if not n.children or (len(n.children)==1 and n.children[0].symbol in ('ε',)):
-                return left
-            # '+' T E'
-            t = parse_T(n.children[1])
-            new_left = lab06.BinOp('+', left, t)
-            return parse_Ep(n.children[2], new_left)
+            # iterativo: cada '+' T E' dobra à esquerda e desce para o próximo E'
+            while n.children and not (len(n.children)==1 and n.children[0].symbol == 'ε'):
+                left = lab06.BinOp('+', left, parse_T(n.children[1]))
+                n = n.children[2]
+            return left
         def parse_T(n):
             # T -> F T'
-            f = parse_F(n.children[0])
-            return parse_Tp(n.children[1], f)
+            r = memo.get(id(n))
+            if r is None:
+                r = memo[id(n)] = parse_Tp(n.children[1], parse_F(n.children[0]))
+            return r
         def parse_Tp(n, left):
             # T' -> * F T' | ε
-            if not n.children or (len(n.children)==1 and n.children[0].symbol in ('ε',)):
-                return left
-            f = parse_F(n.children[1])
-            new_left = lab06.BinOp('*', left, f)
-            return parse_Tp(n.children[2], new_left)
+            while n.children and not (len(n.children)==1 and n.children[0].symbol == 'ε'):
+                left = lab06.BinOp('*', left, parse_F(n.children[1]))
+                n = n.children[2]
+            return left
         def parse_F(n):
+            r = memo.get(id(n))
+            if r is not None:
+                return r
             if len(n.children)==1 and n.children[0].symbol == 'id':
-                return lab06.Var('id')
-            if len(n.children)==3 and n.children[0].symbol == '(':
-                return parse_E(n.children[1])
+                r = lab06.Var('id')
+            elif len(n.children)==3 and n.children[0].symbol == '(':
+                r = parse_E(n.children[1])
             # opcional: num
-            if len(n.children)==1 and n.children[0].symbol == 'num':
-                return lab06.Num(0)
-            raise ValueError('Forma de F desconhecida')
+            elif len(n.children)==1 and n.children[0].symbol == 'num':
+                r = lab06.Num(0)
+            else:
+                raise ValueError('Forma de F desconhecida')
+            memo[id(n)] = r
+            return r
         return parse_E(node)
 
     def _stmt_from_if_tree(self, node):
         # Converte a árvore de if_else.txt numa AST simples (Assign, IfThenElse, Seq)
-        lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
+        lab06 = self.lab06
         # Espera S -> StmtList; StmtList -> Stmt ; StmtList | Stmt; Stmt -> id = E | if E then Stmt | if E then Stmt else Stmt
         def parse_S(n):
             return parse_StmtList(n.children[0])
         def parse_StmtList(n):
             if len(n.children) == 1:
                 return parse_Stmt(n.children[0])
-            # Stmt ; StmtList
-            first = parse_Stmt(n.children[0])
-            rest = parse_StmtList(n.children[2])
-            # flatten
+            # Stmt ; StmtList — percorre a cadeia em laço, achatando Seqs
             items = []
-            if isinstance(first, lab06.Seq): items.extend(first.items)
-            else: items.append(first)
-            if isinstance(rest, lab06.Seq): items.extend(rest.items)
-            else: items.append(rest)
-            return lab06.Seq(items)
+            while True:
+                st = parse_Stmt(n.children[0])
+                if isinstance(st, lab06.Seq): items.extend(st.items)
+                else: items.append(st)
+                if len(n.children) == 1:
+                    return lab06.Seq(items)
+                n = n.children[2]
         def parse_Stmt(n):
-            # alternatives
-            if len(n.children) >= 3 and n.children[1].symbol == '=':
-                # id = E
-                name = 'id'
-                expr = self._expr_from_tree(n.children[2])
-                return lab06.Assign(name, expr)
-            if n.children and n.children[0].symbol == 'if':
-                # if E then Stmt [else Stmt]
-                cond = self._expr_from_tree(n.children[1])
-                thenb = parse_Stmt(n.children[3])
-                if len(n.children) > 4 and n.children[4].symbol == 'else':
-                    elseb = parse_Stmt(n.children[5])
+            # cadeias "else if ..." seguidas em laço: cada If entra no else do anterior
+            root = hole = None
+            while True:
+                nxt = None
+                # alternatives
+                if len(n.children) >= 3 and n.children[1].symbol == '=':
+                    # id = E
+                    st = lab06.Assign('id', self._expr_from_tree(n.children[2]))
+                elif n.children and n.children[0].symbol == 'if':
+                    # if E then Stmt [else Stmt]
+                    cond = self._expr_from_tree(n.children[1])
+                    thenb = parse_Stmt(n.children[3])
+                    st = lab06.IfThenElse(cond, thenb, None)
+                    if len(n.children) > 4 and n.children[4].symbol == 'else':
+                        nxt = n.children[5]
+                else:
+                    # fallback
+                    st = lab06.Seq([])
+                if hole is None:
+                    root = st
                 else:
-                    elseb = None
-                return lab06.IfThenElse(cond, thenb, elseb)
-            # fallback
-            return lab06.Seq([])
+                    hole.else_branch = st
+                if nxt is None:
+                    return root
+                hole, n = st, nxt
         return parse_S(node)
 
     # ===== IR/TAC =====
@@ -1503,37 +2131,47 @@ msg = num
         ttk.Button(btns, text="Exemplo 1", command=self.fill_ir_example).pack(side='right', padx=6)
         ttk.Button(btns, text="Exemplo 2", command=self.fill_ir_example2).pack(side='right')
         ttk.Label(frame, text="Dica: cada expressão vira temporários tN e instruções (load/loadI, add, mul, cmpeq, store). Use o botão abaixo para inspecionar o TAC gerado.").pack(anchor='w', padx=8, pady=(2,0))
-        self.ir_output = tk.Text(frame, height=22)
+        self.ir_output = tk.Text(frame, height=22, wrap='none', **_LOG_TEXT)
         self.ir_output.pack(fill='both', expand=True, padx=8, pady=6)
-        self.tac_list = None
         return frame
 
     def run_tac(self):
-        self.ir_output.delete('1.0','end')
+        self._status('')
+        # saída montada numa lista e enviada ao Text num único comando
+        parts: List[str] = []
         try:
             if not self.ast_prog:
                 raise ValueError("AST não disponível. Use a aba Semântica.")
-            lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-            lab07 = _load_module('labs/07_ast_ir/tac_template.py', 'lab07_tac')
+            lab06 = self.lab06
+            lab07 = self.lab07
             gen = lab07.TacGen()
             # Program.body é lista de Assign
             for st in self.ast_prog.body:
                 if isinstance(st, lab06.Assign):
-                    gen.gen_assign(st.name, st.expr)
+                    _gen_assign(gen, st.name, st.expr)
                 else:
                     raise ValueError("Apenas Assign suportado neste demo.")
-            self.tac_list = [(i.op, i.args) for i in gen.code]
-            for op, args in self.tac_list:
-                self.ir_output.insert('end', f"{op} {' '.join(args)}\n")
+            # uma passada em gen.code: tupla (op, args) do pipeline e linha de saída juntas
+            # operandos internados: t1, t2, ... são lidos de novo por regalloc/codegen/opt
+            intern = sys.intern
+            tac = []
+            for i in gen.code:
+                op, args = intern(i.op), tuple(map(intern, i.args))
+                tac.append((op, args))
+                parts.append(f"{op} {' '.join(args)}\n")
+            self.tac_list = tac
         except Exception as e:
-            self.ir_output.insert('end', f"Erro: {e}\n")
+            parts.append(f"Erro: {e}\n")
+        _set_text(self.ir_output, ''.join(parts))
 
     def ir_demo_three_cases(self):
+        self._status('')
         # Gera três casos de AST -> typecheck -> TAC e imprime aqui
-        self.ir_output.delete('1.0','end')
+        parts: List[str] = []
+        ast_views = []
         try:
-            lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-            lab07 = _load_module('labs/07_ast_ir/tac_template.py', 'lab07_tac')
+            lab06 = self.lab06
+            lab07 = self.lab07
             Program, Assign, Var, Num, BinOp = lab06.Program, lab06.Assign, lab06.Var, lab06.Num, lab06.BinOp
             cases = [
                 ("Exemplo 1: atribuicoes e expressoes", Program([
@@ -1549,60 +2187,63 @@ msg = num
                     Assign("x", BinOp("==", Var("x"), Num(2))),
                 ])),
             ]
-            ast_views = []
             for title, prog in cases:
-                self.ir_output.insert('end', f"\n=== {title} ===\n")
+                parts.append(f"\n=== {title} ===\n")
                 # Typecheck
                 tc = lab06.TypeChecker()
                 errs = tc.check(prog)
                 if errs:
-                    self.ir_output.insert('end', "-- Erros de tipo --\n")
-                    for e in errs:
-                        self.ir_output.insert('end', f"  - {e}\n")
+                    parts.append("-- Erros de tipo --\n")
+                    parts.extend(f"  - {e}\n" for e in errs)
                 else:
-                    self.ir_output.insert('end', "-- Tipagem OK --\n")
+                    parts.append("-- Tipagem OK --\n")
                 # TAC
                 gen = lab07.TacGen()
                 for st in prog.body:
                     if isinstance(st, lab06.Assign):
                         gen.gen_assign(st.name, st.expr)
-                self.ir_output.insert('end', "-- TAC --\n")
-                for instr in gen.code:
-                    self.ir_output.insert('end', f"{instr.op} {' '.join(instr.args)}\n")
+                parts.append("-- TAC --\n")
+                parts.extend(f"{instr.op} {' '.join(instr.args)}\n" for instr in gen.code)
                 # AST view para visualização
                 ast_views.append((title, self._ast_to_view(prog)))
             # Não altera self.tac_list (este é um demo múltiplo)
-            # Exibir árvores AST lado a lado
-            self._show_ast_views(ast_views)
         except Exception as e:
-            self.ir_output.insert('end', f"Erro no demo: {e}\n")
+            parts.append(f"Erro no demo: {e}\n")
+            ast_views = []
+        _set_text(self.ir_output, ''.join(parts))
+        # Exibir árvores AST lado a lado
+        if ast_views:
+            try:
+                self._show_ast_views(ast_views)
+            except Exception as e:
+                self.ir_output.insert('end', f"Erro no demo: {e}\n")
 
     def _ast_to_view(self, node):
         # Converte AST (Lab 06) em um nó simples com 'symbol' e 'children'
-        lab06 = _load_module('labs/06_semantica/ast_template.py', 'lab06_ast')
-        class V:
-            __slots__ = ('symbol','children')
-            def __init__(self, symbol, children=None):
-                self.symbol = symbol
-                self.children = children or []
-        if isinstance(node, lab06.Program):
-            return V('Program', [self._ast_to_view(s) for s in node.body])
-        if isinstance(node, lab06.Seq):
-            return V('Seq', [self._ast_to_view(s) for s in node.items])
-        if isinstance(node, lab06.Assign):
-            return V(f'Assign {node.name}', [self._ast_to_view(node.expr)])
-        if isinstance(node, lab06.IfThenElse):
-            ch = [V('cond', [self._ast_to_view(node.cond)]), V('then', [self._ast_to_view(node.then_branch)])]
-            if node.else_branch is not None:
-                ch.append(V('else', [self._ast_to_view(node.else_branch)]))
-            return V('If', ch)
-        if isinstance(node, lab06.BinOp):
-            return V(node.op, [self._ast_to_view(node.left), self._ast_to_view(node.right)])
-        if isinstance(node, lab06.Var):
-            return V(f'Var({node.name})')
-        if isinstance(node, lab06.Num):
-            return V(f'Num({node.value})')
-        return V(str(node))
+        # (pilha explícita: ASTs profundas não estouram o limite de recursão)
+        cached = self._ast_view_cache
+        if cached is not None and cached[0] is node:
+            return cached[1]
+        dispatch = _ast_view_dispatch(self.lab06)
+        V = _AstView
+        top = []
+        stack = [(node, top)]
+        # sem memo por id(): subárvores compartilhadas na AST viram views distintas, pois
+        # o layout (parsing_tester) guarda as posições por id do nó da view
+        while stack:
+            n, out = stack.pop()
+            h = dispatch.get(type(n))
+            if h is not None:
+                v, kids = h(n)
+            else:
+                v = V(str(n), ()); kids = ()
+            out.append(v)
+            # empilha ao contrário para que os filhos saiam na ordem original
+            stack.extend(reversed(kids))
+        # última conversão: show/export da AST atual reusam a mesma view
+        # (guarda a própria AST, então a identidade não pode ser reciclada)
+        self._ast_view_cache = (node, top[0])
+        return top[0]
 
     def _show_ast_views(self, titled_roots):
         # Abre janela para mostrar árvores AST lado a lado (até 2 por linha)
@@ -1614,20 +2255,15 @@ msg = num
         tbar = ttk.Frame(win)
         tbar.pack(fill='x', padx=6, pady=4)
         ttk.Label(tbar, text='Exportar todas:').pack(side='left')
-        def _slug(s: str) -> str:
-            import re
-            s = s.strip().lower().replace(' ', '_')
-            return re.sub(r"[^a-z0-9_\-]+", "", s)[:40] or 'ast'
         def export_all_svg():
             try:
-                from tkinter import filedialog
                 base = filedialog.asksaveasfilename(title='Salvar todas (SVG, usa como prefixo)', defaultextension='.svg', filetypes=[["SVG",".svg"]])
                 if not base:
                     return
                 # remove extension to use as prefix
                 if base.lower().endswith('.svg'):
                     base = base[:-4]
-                pt = _load_module('parsing_tester.py', 'pt_export')
+                pt = _pt()
                 for idx, (title, root) in enumerate(titled_roots, start=1):
                     out = f"{base}_{idx}_{_slug(title)}.svg"
                     pt.export_tree_svg(root, out)
@@ -1638,13 +2274,12 @@ msg = num
                     pass
         def export_all_json():
             try:
-                from tkinter import filedialog
                 base = filedialog.asksaveasfilename(title='Salvar todas (JSON, usa como prefixo)', defaultextension='.json', filetypes=[["JSON",".json"]])
                 if not base:
                     return
                 if base.lower().endswith('.json'):
                     base = base[:-5]
-                pt = _load_module('parsing_tester.py', 'pt_export')
+                pt = _pt()
                 for idx, (title, root) in enumerate(titled_roots, start=1):
                     out = f"{base}_{idx}_{_slug(title)}.json"
                     pt.export_tree_json(root, out, derivations=None, kind='AST')
@@ -1669,11 +2304,10 @@ msg = num
             btns.pack(side='right')
             def export_svg(root=root, t=title):
                 try:
-                    from tkinter import filedialog
                     path = filedialog.asksaveasfilename(title=f"Exportar AST '{t}' (SVG)", defaultextension='.svg', filetypes=[["SVG",".svg"]])
                     if not path:
                         return
-                    pt = _load_module('parsing_tester.py', 'pt_export')
+                    pt = _pt()
                     pt.export_tree_svg(root, path)
                 except Exception as e:
                     try:
@@ -1682,11 +2316,10 @@ msg = num
                         pass
             def export_json(root=root, t=title):
                 try:
-                    from tkinter import filedialog
                     path = filedialog.asksaveasfilename(title=f"Exportar AST '{t}' (JSON)", defaultextension='.json', filetypes=[["JSON",".json"]])
                     if not path:
                         return
-                    pt = _load_module('parsing_tester.py', 'pt_export')
+                    pt = _pt()
                     # kind='AST' (sem derivations)
                     pt.export_tree_json(root, path, derivations=None, kind='AST')
                 except Exception as e:
@@ -1726,11 +2359,10 @@ msg = num
                 prog = self._parse_simple_program(self.sema_input.get('1.0','end'))
                 self.ast_prog = prog
             root = self._ast_to_view(self.ast_prog)
-            from tkinter import filedialog
             path = filedialog.asksaveasfilename(title="Exportar AST atual (SVG)", defaultextension='.svg', filetypes=[["SVG",".svg"]])
             if not path:
                 return
-            pt = _load_module('parsing_tester.py', 'pt_export')
+            pt = _pt()
             pt.export_tree_svg(root, path)
         except Exception as e:
             try:
@@ -1745,11 +2377,10 @@ msg = num
                 prog = self._parse_simple_program(self.sema_input.get('1.0','end'))
                 self.ast_prog = prog
             root = self._ast_to_view(self.ast_prog)
-            from tkinter import filedialog
             path = filedialog.asksaveasfilename(title="Exportar AST atual (JSON)", defaultextension='.json', filetypes=[["JSON",".json"]])
             if not path:
                 return
-            pt = _load_module('parsing_tester.py', 'pt_export')
+            pt = _pt()
             pt.export_tree_json(root, path, derivations=None, kind='AST')
         except Exception as e:
             try:
@@ -1758,37 +2389,36 @@ msg = num
                 pass
 
     def fill_ir_example(self):
+        self._build_tab('sema_tab')
         try:
             # Preenche a aba Semântica com exemplo e prepara AST
             self.fill_sema_example()
             prog = self._parse_simple_program(self.sema_input.get('1.0','end'))
             self.ast_prog = prog
-            self.ir_input.delete('1.0','end')
-            self.ir_input.insert('end', 'AST exemplo pronta. Clique em "Gerar TAC".\n')
+            _set_text(self.ir_input, 'AST exemplo pronta. Clique em "Gerar TAC".\n')
             self.ir_output.delete('1.0','end')
         except Exception as e:
             self.ir_output.insert('end', f"Erro ao preparar exemplo: {e}\n")
 
     def fill_ir_example2(self):
+        self._build_tab('sema_tab')
         try:
             # Exemplo com expressão aninhada
-            self.sema_input.delete('1.0','end')
-            self.sema_input.insert('end', 'x = (1 + 2) * (3 + 4)\n')
+            _set_text(self.sema_input, 'x = (1 + 2) * (3 + 4)\n')
             prog = self._parse_simple_program(self.sema_input.get('1.0','end'))
             self.ast_prog = prog
-            self.ir_input.delete('1.0','end')
-            self.ir_input.insert('end', 'AST exemplo 2 pronta. Clique em "Gerar TAC".\n')
+            _set_text(self.ir_input, 'AST exemplo 2 pronta. Clique em "Gerar TAC".\n')
             self.ir_output.delete('1.0','end')
         except Exception as e:
             self.ir_output.insert('end', f"Erro ao preparar exemplo 2: {e}\n")
 
     def push_tac_to_codegen(self):
+        self._build_tab('codegen_tab')
         if not self.tac_list:
-            messagebox.showinfo("Info", "Gere TAC primeiro.")
+            self._status("Gere TAC primeiro.", 'warn')
             return
         try:
-            self.codegen_output.delete('1.0','end')
-            self.codegen_output.insert('end', "TAC disponível. Clique 'Gerar Assembly'.")
+            _set_text(self.codegen_output, "TAC disponível. Clique 'Gerar Assembly'.")
         except Exception:
             pass
 
@@ -1807,42 +2437,42 @@ msg = num
         self.reg_k = tk.IntVar(value=3)
         spin = tk.Spinbox(opts, from_=1, to=32, width=4, textvariable=self.reg_k)
         spin.pack(side='left')
-        ttk.Button(btns, text="Gerar Assembly", command=self.run_codegen).pack(side='left')
+        self.var_peephole = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Peephole", variable=self.var_peephole).pack(side='left', padx=(12,0))
+        self.codegen_btn = ttk.Button(btns, text="Gerar Assembly", command=partial(self.run_codegen, background=True))
+        self.codegen_btn.pack(side='left')
         ttk.Button(btns, text="Enviar ao Simulador", command=self.push_asm_to_sim).pack(side='left', padx=6)
         ttk.Button(btns, text="Exemplo simples", command=self.fill_codegen_example).pack(side='right')
         ttk.Button(btns, text="Exemplo spill", command=self.fill_codegen_example_spill).pack(side='right', padx=6)
         ttk.Label(frame, text="Dica: habilite alocação com K pequeno (ex.: 2) para observar spill; o mapping aparece no topo. Envie o assembly gerado ao Simulador.").pack(anchor='w', padx=8, pady=(2,0))
-        self.codegen_output = tk.Text(frame)
+        self.codegen_output = tk.Text(frame, wrap='none', **_LOG_TEXT)
         self.codegen_output.pack(fill='both', expand=True, padx=8, pady=6)
-        self.asm_prog = None
-        self.last_regalloc_map = None
         return frame
 
-    def run_codegen(self):
-        self.codegen_output.delete('1.0','end')
-        try:
-            if not self.tac_list:
-                raise ValueError("TAC não disponível. Gere na aba IR/TAC.")
-            tac_to_use = list(self.tac_list)
-            self.last_regalloc_map = None
-            if hasattr(self, 'var_regalloc') and bool(self.var_regalloc.get()):
-                regalloc = _load_module('labs/08_codegen/regalloc_linear.py', 'lab08_regalloc')
-                try:
-                    k = int(self.reg_k.get()) if hasattr(self, 'reg_k') else 3
-                except Exception:
-                    k = 3
-                k = max(1, min(32, k))
-                mp = regalloc.allocate_registers(tac_to_use, k=k)
-                self.last_regalloc_map = mp
-                self.codegen_output.insert('end', f"; regalloc k={k}: {mp}\n")
-                tac_to_use = regalloc.apply_mapping_to_tac(tac_to_use, mp)
-            lab08 = _load_module('labs/08_codegen/codegen_template.py', 'lab08_codegen')
-            asm = lab08.codegen_from_tac(tac_to_use)
-            self.asm_prog = [(a.op, a.args) for a in asm]
-            for op, args in self.asm_prog:
-                self.codegen_output.insert('end', f"{op} {' '.join(args)}\n")
-        except Exception as e:
-            self.codegen_output.insert('end', f"Erro: {e}\n")
+    def run_codegen(self, background: bool = False):
+        k = None
+        if bool(self.var_regalloc.get()):
+            try:
+                k = int(self.reg_k.get())
+            except Exception:
+                k = 3
+            k = max(1, min(32, k))
+        work = partial(_codegen_work, list(self.tac_list or ()), k, bool(self.var_peephole.get()))
+        self._codegen_pending = background
+        self._dispatch(work, self._codegen_done, self.codegen_btn if background else None)
+
+    def _codegen_busy(self) -> bool:
+        if self._codegen_pending:
+            self._status("Aguarde o Codegen terminar.", 'warn')
+        return self._codegen_pending
+
+    def _codegen_done(self, result):
+        self._codegen_pending = False
+        self.last_regalloc_map, asm_prog, asm_text, text = result
+        if asm_prog is not None:
+            self.asm_prog = asm_prog
+            self._asm_listing = (asm_prog, asm_text)
+        _set_text(self.codegen_output, text)
 
     def fill_codegen_example(self):
         try:
@@ -1853,10 +2483,9 @@ msg = num
                 ('mul', ('t1','t2','t3')),
                 ('store', ('t3','x')),
             ]
-            self.codegen_output.delete('1.0','end')
-            self.codegen_output.insert('end', 'TAC exemplo preparado. Clique em "Gerar Assembly".\n')
+            _set_text(self.codegen_output, 'TAC exemplo preparado. Clique em "Gerar Assembly".\n')
         except Exception as e:
-            self.codegen_output.insert('end', f"Erro ao preparar exemplo: {e}\n")
+            _append_text(self.codegen_output, f"Erro ao preparar exemplo: {e}\n")
 
     def fill_codegen_example_spill(self):
         try:
@@ -1871,18 +2500,26 @@ msg = num
                 ('mul', ('t6','t1','t7')),
                 ('store', ('t7','x')),
             ]
-            self.codegen_output.delete('1.0','end')
-            self.codegen_output.insert('end', 'TAC com muitos temporários preparado. Habilite regalloc e use K=2, depois "Gerar Assembly".\n')
+            _set_text(self.codegen_output, 'TAC com muitos temporários preparado. Habilite regalloc e use K=2, depois "Gerar Assembly".\n')
         except Exception as e:
-            self.codegen_output.insert('end', f"Erro ao preparar exemplo spill: {e}\n")
+            _append_text(self.codegen_output, f"Erro ao preparar exemplo spill: {e}\n")
+
+    def _asm_text(self) -> str:
+        """_listing(self.asm_prog), reaproveitada enquanto asm_prog for a mesma lista."""
+        cached = self._asm_listing
+        if cached is None or cached[0] is not self.asm_prog:
+            cached = self._asm_listing = (self.asm_prog, _listing(self.asm_prog or ()))
+        return cached[1]
 
     def push_asm_to_sim(self):
+        self._build_tab('sim_tab')
+        if self._codegen_busy():
+            return
         if not self.asm_prog:
-            messagebox.showinfo("Info", "Gere assembly primeiro.")
+            self._status("Gere assembly primeiro.", 'warn')
             return
         try:
-            self.sim_output.delete('1.0','end')
-            self.sim_output.insert('end', "Assembly pronto. Clique 'Executar'.")
+            _set_text(self.sim_output, "Assembly pronto. Clique 'Executar'.")
         except Exception:
             pass
 
@@ -1894,40 +2531,53 @@ msg = num
         btns.pack(fill='x', padx=8, pady=6)
         ttk.Button(btns, text="Constant Folding", command=self.run_fold).pack(side='left')
         ttk.Button(btns, text="Dead Code Elim", command=self.run_dce).pack(side='left', padx=6)
+        ttk.Button(btns, text="Fold+DCE (ponto fixo)", command=self.run_fold_dce).pack(side='left')
         ttk.Button(btns, text="Aplicar como atual", command=self.apply_opt).pack(side='left', padx=6)
         ttk.Button(btns, text="Exemplo 1", command=self.fill_opt_example).pack(side='right')
         ttk.Button(btns, text="Exemplo 2", command=self.fill_opt_example2).pack(side='right', padx=6)
         ttk.Label(frame, text="Dica: rode Folding e depois DCE; use 'Aplicar como atual' para enviar o TAC otimizado ao Codegen/Simulador.").pack(anchor='w', padx=8, pady=(2,0))
-        self.opt_output = tk.Text(frame)
+        self.opt_output = tk.Text(frame, wrap='none', **_LOG_TEXT)
         self.opt_output.pack(fill='both', expand=True, padx=8, pady=6)
-        self.opt_tac = None
         return frame
 
     def run_fold(self):
-        self.opt_output.delete('1.0','end')
+        if self._codegen_busy():
+            return
+        self._status('')
         if not self.tac_list:
-            self.opt_output.insert('end', 'Gere TAC primeiro.\n')
+            _set_text(self.opt_output, 'Gere TAC primeiro.\n')
             return
         lab09 = _load_module('labs/09_opt/optimizer_template.py', 'lab09_opt')
         self.opt_tac = lab09.const_folding(self.tac_list)
-        for op, args in self.opt_tac:
-            self.opt_output.insert('end', f"{op} {' '.join(args)}\n")
+        _set_text(self.opt_output, _listing(self.opt_tac))
+
+    def run_fold_dce(self):
+        if self._codegen_busy():
+            return
+        self._status('')
+        if not self.tac_list:
+            _set_text(self.opt_output, 'Gere TAC primeiro.\n')
+            return
+        lab09 = _load_module('labs/09_opt/optimizer_template.py', 'lab09_opt')
+        self.opt_tac = lab09.fold_and_dce(self.tac_list, live_vars=['x'])
+        _set_text(self.opt_output, '-- folding + DCE (ponto fixo) --\n' + _listing(self.opt_tac))
 
     def run_dce(self):
+        self._status('')
         if not self.opt_tac:
-            self.opt_output.insert('end', 'Execute folding primeiro.\n')
+            _append_text(self.opt_output, 'Execute folding primeiro.\n')
             return
         lab09 = _load_module('labs/09_opt/optimizer_template.py', 'lab09_opt')
         dce = lab09.dead_code_elim(self.opt_tac, live_vars=['x'])
         self.opt_tac = dce
-        self.opt_output.insert('end', '\n-- após DCE --\n')
-        for op, args in dce:
-            self.opt_output.insert('end', f"{op} {' '.join(args)}\n")
+        _append_text(self.opt_output, '\n-- após DCE --\n' + _listing(dce))
 
     def apply_opt(self):
+        if self._codegen_busy():
+            return
         if self.opt_tac:
             self.tac_list = list(self.opt_tac)
-            messagebox.showinfo('OK', 'TAC otimizado aplicado.')
+            self._status('TAC otimizado aplicado.')
 
     def fill_opt_example(self):
         try:
@@ -1940,13 +2590,10 @@ msg = num
                 ('store', ('t4','x')),
             ]
             self.opt_tac = list(self.tac_list)
-            self.opt_output.delete('1.0','end')
-            self.opt_output.insert('end', 'TAC exemplo preparado:\n')
-            for op, args in self.opt_tac:
-                self.opt_output.insert('end', f"{op} {' '.join(args)}\n")
-            self.opt_output.insert('end', '\nClique em Constant Folding e depois em Dead Code Elim.\n')
+            _set_text(self.opt_output, 'TAC exemplo preparado:\n' + _listing(self.opt_tac)
+                      + '\nClique em Constant Folding e depois em Dead Code Elim.\n')
         except Exception as e:
-            self.opt_output.insert('end', f"Erro ao preparar exemplo: {e}\n")
+            _append_text(self.opt_output, f"Erro ao preparar exemplo: {e}\n")
 
     def fill_opt_example2(self):
         try:
@@ -1960,13 +2607,10 @@ msg = num
                 ('store', ('t4','x')),
             ]
             self.opt_tac = list(self.tac_list)
-            self.opt_output.delete('1.0','end')
-            self.opt_output.insert('end', 'TAC exemplo 2 preparado:\n')
-            for op, args in self.opt_tac:
-                self.opt_output.insert('end', f"{op} {' '.join(args)}\n")
-            self.opt_output.insert('end', '\nCom live_vars=[\'x\'], DCE deve remover store em y e seus produtores.\n')
+            _set_text(self.opt_output, 'TAC exemplo 2 preparado:\n' + _listing(self.opt_tac)
+                      + '\nCom live_vars=[\'x\'], DCE deve remover store em y e seus produtores.\n')
         except Exception as e:
-            self.opt_output.insert('end', f"Erro ao preparar exemplo 2: {e}\n")
+            _append_text(self.opt_output, f"Erro ao preparar exemplo 2: {e}\n")
 
     # ===== Simulador =====
     def _build_sim_tab(self, parent):
@@ -1974,31 +2618,20 @@ msg = num
         ttk.Label(frame, text="Simulador de assembly (toy)").pack(anchor='w', padx=8, pady=4)
         btns = ttk.Frame(frame)
         btns.pack(fill='x', padx=8, pady=6)
-        ttk.Button(btns, text="Executar", command=self.run_sim).pack(side='left')
+        self.sim_btn = ttk.Button(btns, text="Executar", command=partial(self.run_sim, background=True))
+        self.sim_btn.pack(side='left')
         ttk.Button(btns, text="Exemplo 1", command=self.fill_sim_example).pack(side='right')
         ttk.Button(btns, text="Exemplo 2", command=self.fill_sim_example2).pack(side='right', padx=6)
         ttk.Label(frame, text="Dica: ao executar, verifique mapping (se houver), a listagem do assembly e os estados finais de registradores e memória.").pack(anchor='w', padx=8, pady=(2,0))
-        self.sim_output = tk.Text(frame)
+        self.sim_output = tk.Text(frame, wrap='none', **_LOG_TEXT)
         self.sim_output.pack(fill='both', expand=True, padx=8, pady=6)
         return frame
 
-    def run_sim(self):
-        self.sim_output.delete('1.0','end')
-        try:
-            if not self.asm_prog:
-                raise ValueError('Gere assembly na aba Codegen.')
-            if getattr(self, 'last_regalloc_map', None):
-                self.sim_output.insert('end', f"; mapping: {self.last_regalloc_map}\n")
-            self.sim_output.insert('end', "; assembly:\n")
-            for op, args in self.asm_prog:
-                self.sim_output.insert('end', f"{op} {' '.join(args)}\n")
-            lab10 = _load_module('labs/10_backend/asm_sim_template.py', 'lab10_sim')
-            m = lab10.Machine()
-            m.run(self.asm_prog)
-            self.sim_output.insert('end', f"\nregs: {m.regs}\n")
-            self.sim_output.insert('end', f"mem: {m.mem}\n")
-        except Exception as e:
-            self.sim_output.insert('end', f"Erro: {e}\n")
+    def run_sim(self, background: bool = False):
+        if self._codegen_busy():
+            return
+        work = partial(_sim_work, list(self.asm_prog or ()), getattr(self, 'last_regalloc_map', None), self._asm_text())
+        self._dispatch(work, partial(_set_text, self.sim_output), self.sim_btn if background else None)
 
     def fill_sim_example(self):
         try:
@@ -2009,12 +2642,9 @@ msg = num
                 ('MOV', ('t3','x')),
             ]
             self.last_regalloc_map = None
-            self.sim_output.delete('1.0','end')
-            self.sim_output.insert('end', 'Assembly exemplo preparado. Clique em "Executar".\n')
-            for op, args in self.asm_prog:
-                self.sim_output.insert('end', f"{op} {' '.join(args)}\n")
+            _set_text(self.sim_output, 'Assembly exemplo preparado. Clique em "Executar".\n' + self._asm_text())
         except Exception as e:
-            self.sim_output.insert('end', f"Erro ao preparar exemplo: {e}\n")
+            _append_text(self.sim_output, f"Erro ao preparar exemplo: {e}\n")
 
     def fill_sim_example2(self):
         try:
@@ -2026,27 +2656,27 @@ msg = num
                 ('MOV', ('t3','flag')),
             ]
             self.last_regalloc_map = None
-            self.sim_output.delete('1.0','end')
-            self.sim_output.insert('end', 'Assembly exemplo 2 preparado. Clique em "Executar".\n')
-            for op, args in self.asm_prog:
-                self.sim_output.insert('end', f"{op} {' '.join(args)}\n")
+            _set_text(self.sim_output, 'Assembly exemplo 2 preparado. Clique em "Executar".\n' + self._asm_text())
         except Exception as e:
-            self.sim_output.insert('end', f"Erro ao preparar exemplo 2: {e}\n")
+            _append_text(self.sim_output, f"Erro ao preparar exemplo 2: {e}\n")
 
     # ===== Autômatos =====
     def _build_automata_tab(self, parent):
         frame = ttk.Frame(parent)
         ttk.Label(frame, text="Regex (usa |, *, +, ?, parênteses e concatenação implícita)").pack(anchor='w', padx=8, pady=4)
-        self.re_input = ttk.Entry(frame)
+        self.re_input_var = tk.StringVar()
+        self.re_input = ttk.Entry(frame, textvariable=self.re_input_var)
         self.re_input.pack(fill='x', padx=8)
         inrow = ttk.Frame(frame)
         inrow.pack(fill='x', padx=8, pady=4)
         ttk.Label(inrow, text="Cadeia de teste (símbolos sem espaço)").pack(side='left')
-        self.re_test = ttk.Entry(inrow)
+        self.re_test_var = tk.StringVar()
+        self.re_test = ttk.Entry(inrow, textvariable=self.re_test_var)
         self.re_test.pack(side='left', fill='x', expand=True, padx=6)
         btns = ttk.Frame(frame)
         btns.pack(fill='x', padx=8, pady=6)
-        ttk.Button(btns, text='Construir NFA/DFA/Min', command=self.build_automata).pack(side='left')
+        self.auto_build_btn = ttk.Button(btns, text='Construir NFA/DFA/Min', command=partial(self.build_automata, background=True))
+        self.auto_build_btn.pack(side='left')
         ttk.Button(btns, text='Testar Cadeia', command=self.test_automata).pack(side='left', padx=6)
         ttk.Button(btns, text='Exportar NFA (SVG)', command=self.export_nfa_svg).pack(side='left')
         ttk.Button(btns, text='Exportar DFA (SVG)', command=self.export_dfa_svg).pack(side='left', padx=6)
@@ -2080,68 +2710,61 @@ msg = num
         ttk.Radiobutton(viewbar, text='Ver NFA', value='nfa', variable=self.auto_view, command=lambda: self._draw_dfa_canvas()).pack(side='left', padx=6)
         self.auto_canvas = tk.Canvas(viz, background='white', height=280)
         self.auto_canvas.pack(fill='x', padx=8, pady=6)
-        self.auto_output = tk.Text(viz, height=12)
+        self.auto_output = tk.Text(viz, height=12, **_LOG_TEXT)
         self.auto_output.pack(fill='both', expand=True, padx=8, pady=6)
         self._auto_nfa = None
         self._auto_dfa = None
+        self._auto_layouts = {}  # 'nfa'/'dfa' -> (autômato, layout) de _automaton_layout
+        self._auto_drawn = None  # (visão, autômato) cujos itens estão no canvas
+        self._auto_colors = None  # (cor das arestas por origem, contorno por nó, aresta destacada) no canvas
+        self._auto_pending = None  # (highlight, partitions) do último passo ainda não desenhado
         self._auto_alpha = None
+        self._auto_regex = None
         self._subset_steps = []
         self._subset_idx = 0
         self._min_steps = []
         self._min_idx = 0
         return frame
 
-    def build_automata(self):
-        self.auto_output.delete('1.0','end')
-        try:
-            lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
-            regex = self.re_input.get().strip()
-            if not regex:
-                raise ValueError('Informe uma regex.')
-            nfa, alpha, log = lib.regex_to_nfa_with_log(regex)
-            dfa = lib.nfa_to_dfa(nfa, alpha)
-            mdfa = lib.dfa_minimize(dfa, alpha)
-            self._auto_nfa = nfa
-            self._auto_dfa = mdfa
-            self._auto_alpha = alpha
-            # passos
-            self._subset_steps = lib.nfa_to_dfa_steps(nfa, alpha)
+    def build_automata(self, background: bool = False):
+        self._build_tab('automata_tab')  # também via atalho Ctrl+B
+        work = partial(_automata_work, self.re_input.get().strip())
+        self._dispatch(work, self._automata_done, self.auto_build_btn if background else None)
+
+    def _automata_done(self, result):
+        built, parts = result
+        if built is not None:
+            (self._auto_regex, self._auto_nfa, self._auto_dfa, self._auto_alpha,
+             self._subset_steps, self._min_steps, self._min_parts) = built
             self._subset_idx = 0
-            self._min_steps, self._min_parts = lib.dfa_minimize_steps(mdfa, alpha)
             self._min_idx = 0
-            self.auto_output.insert('end', f"Regex: {regex}\n")
-            self.auto_output.insert('end', f"Alfabeto: {sorted(list(alpha))}\n")
-            self.auto_output.insert('end', f"DFA estados: {len({dfa.start} | set([s for s,_ in dfa.trans.keys()]) | set(dfa.trans.values()))}\n")
-            self.auto_output.insert('end', f"DFA (min) estados: {len({mdfa.start} | set([s for s,_ in mdfa.trans.keys()]) | set(mdfa.trans.values()))}\n")
-            self.auto_output.insert('end', "\nPassos (Thompson):\n")
-            for ln in log:
-                self.auto_output.insert('end', f"- {ln}\n")
-            self.auto_output.insert('end', "\nSubset (primeiro passo):\n")
-            if self._subset_steps:
-                self.auto_output.insert('end', self._subset_steps[0] + "\n")
-            self.auto_output.insert('end', "\nMinimização (primeiro passo):\n")
-            if self._min_steps:
-                self.auto_output.insert('end', self._min_steps[0] + "\n")
-            parts0 = self._min_parts[0] if getattr(self, '_min_parts', None) else None
-            self._draw_dfa_canvas(partitions=parts0)
-        except Exception as e:
-            self.auto_output.insert('end', f"Erro: {e}\n")
+            self._auto_pending = None  # passos do autômato anterior não são mais desenhados
+            try:
+                self._draw_dfa_canvas(partitions=self._min_parts[0] if self._min_parts else None)
+            except Exception as e:
+                parts.append(f"Erro: {e}\n")
+        _set_text(self.auto_output, ''.join(parts))
 
     def test_automata(self):
+        self._build_tab('automata_tab')  # também via atalho Ctrl+T
+        self._status('')
         if not self._auto_dfa:
-            self.auto_output.insert('end', 'Construa o automato primeiro.\n')
+            _append_text(self.auto_output, 'Construa o automato primeiro.\n')
             return
         try:
-            lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
-            s = list(self.re_test.get().strip())
-            ok = lib.dfa_accepts(self._auto_dfa, s)
-            self.auto_output.insert('end', f"Teste: {'ACEITA' if ok else 'REJEITA'}\n")
+            s = self.re_test.get().strip()
+            # o DFA didático continua sendo a referência quando o Hyperscan não está disponível
+            ok = _hs_accepts(self._auto_regex, s)
+            if ok is None:
+                lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
+                ok = lib.dfa_accepts(self._auto_dfa, s)
+            _append_text(self.auto_output, f"Teste: {'ACEITA' if ok else 'REJEITA'}\n")
         except Exception as e:
-            self.auto_output.insert('end', f"Erro: {e}\n")
+            _append_text(self.auto_output, f"Erro: {e}\n")
 
     def export_dfa_svg(self):
         if not self._auto_dfa:
-            messagebox.showinfo('Info','Construa o automato primeiro.')
+            self._status('Construa o automato primeiro.', 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension='.svg', filetypes=[('SVG','.svg')])
         if not path:
@@ -2149,13 +2772,13 @@ msg = num
         try:
             lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
             lib.automaton_to_svg_dfa(self._auto_dfa, self._auto_alpha or set(), path)
-            messagebox.showinfo('OK', 'SVG exportado.')
+            self._status('SVG exportado.')
         except Exception as e:
             messagebox.showerror('Erro', str(e))
 
     def export_nfa_dot(self):
         if not self._auto_nfa:
-            messagebox.showinfo('Info','Construa o automato primeiro.')
+            self._status('Construa o automato primeiro.', 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension='.dot', filetypes=[('DOT','.dot')])
         if not path:
@@ -2163,13 +2786,13 @@ msg = num
         try:
             lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
             lib.export_dot_nfa(self._auto_nfa, path)
-            messagebox.showinfo('OK', 'DOT exportado.')
+            self._status('DOT exportado.')
         except Exception as e:
             messagebox.showerror('Erro', str(e))
 
     def export_dfa_dot(self):
         if not self._auto_dfa:
-            messagebox.showinfo('Info','Construa o automato primeiro.')
+            self._status('Construa o automato primeiro.', 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension='.dot', filetypes=[('DOT','.dot')])
         if not path:
@@ -2177,16 +2800,15 @@ msg = num
         try:
             lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
             lib.export_dot_dfa(self._auto_dfa, path)
-            messagebox.showinfo('OK', 'DOT exportado.')
+            self._status('DOT exportado.')
         except Exception as e:
             messagebox.showerror('Erro', str(e))
 
     def _show_subset_step(self):
         if not self._subset_steps:
             return
-        self.auto_output.insert('end', f"\n[Subset passo {self._subset_idx+1}/{len(self._subset_steps)}]\n")
-        self.auto_output.insert('end', self._subset_steps[self._subset_idx] + "\n")
-        self._draw_dfa_canvas(highlight=self._subset_steps[self._subset_idx])
+        _append_text(self.auto_output, f"\n[Subset passo {self._subset_idx+1}/{len(self._subset_steps)}]\n{self._subset_steps[self._subset_idx]}\n")
+        self._queue_dfa_canvas(self._subset_steps[self._subset_idx])
 
     def auto_subset_prev(self):
         if self._subset_idx > 0:
@@ -2201,12 +2823,24 @@ msg = num
     def _show_min_step(self):
         if not self._min_steps:
             return
-        self.auto_output.insert('end', f"\n[Min passo {self._min_idx+1}/{len(self._min_steps)}]\n")
-        self.auto_output.insert('end', self._min_steps[self._min_idx] + "\n")
+        _append_text(self.auto_output, f"\n[Min passo {self._min_idx+1}/{len(self._min_steps)}]\n{self._min_steps[self._min_idx]}\n")
         parts = None
         if getattr(self, '_min_parts', None) and self._min_idx < len(self._min_parts):
             parts = self._min_parts[self._min_idx]
-        self._draw_dfa_canvas(highlight=self._min_steps[self._min_idx], partitions=parts)
+        self._queue_dfa_canvas(self._min_steps[self._min_idx], parts)
+
+    def _queue_dfa_canvas(self, highlight: str, partitions=None):
+        # Prev/Next em rajada (tecla segurada): o texto de cada passo é anexado, mas o
+        # canvas é redesenhado uma vez só, no after_idle, com o último passo pedido
+        pending = self._auto_pending
+        self._auto_pending = (highlight, partitions)
+        if pending is None:
+            self.after_idle(self._flush_dfa_canvas)
+
+    def _flush_dfa_canvas(self):
+        pending, self._auto_pending = self._auto_pending, None
+        if pending is not None:
+            self._draw_dfa_canvas(*pending)
 
     def auto_min_prev(self):
         if self._min_idx > 0:
@@ -2218,82 +2852,123 @@ msg = num
             self._min_idx += 1
             self._show_min_step()
 
+    def _automaton_layout(self, kind: str, a):
+        """(estados, idx, xs, ys, arestas) de um NFA/DFA, guardado até o autômato mudar.
+
+        Só destaques e partições variam entre os passos Prev/Next; a topologia é fixa
+        entre dois build_automata, então a grade é calculada uma vez por autômato.
+        """
+        cached = self._auto_layouts.get(kind)
+        if cached is not None and cached[0] is a:
+            return cached[1]
+        if kind == 'nfa':
+            states = list(_nfa_states(a))
+            pairs = [(s, sym or 'ε', t) for (s, sym), T in a.trans.items() for t in T]
+        else:
+            states = list(_dfa_states(a))
+            pairs = [(s, sym, t) for (s, sym), t in a.trans.items()]
+        idx = {s:i for i,s in enumerate(states)}
+        cols = max(1, int(len(states)**0.5))
+        HSPACE = 140; VSPACE = 120
+        # coordenadas da grade em dois vetores compactos de int, indexados por estado
+        n = len(states)
+        xs = array('i', [40 + (i % cols)*HSPACE for i in range(n)])
+        ys = array('i', [40 + (i // cols)*VSPACE for i in range(n)])
+        # arestas já com índices e coordenadas: (i_src, i_dst, rótulo, x1, y1, x2, y2)
+        edges = []
+        for s, sym, t in pairs:
+            i, j = idx[s], idx[t]
+            edges.append((i, j, sym, xs[i], ys[i], xs[j], ys[j]))
+        layout = (states, idx, xs, ys, edges)
+        self._auto_layouts[kind] = (a, layout)
+        return layout
+
     def _draw_dfa_canvas(self, highlight: str = '', partitions=None):
-        # Desenha DFA (ou NFA se selecionado) com destaques básicos
+        # Desenha DFA (ou NFA se selecionado) com destaques básicos. Os itens só são
+        # recriados quando o autômato/visão muda; nos passos Prev/Next as cores são
+        # trocadas por tags (um itemconfigure por cor, não um item novo por aresta).
+        canvas = self.auto_canvas
         if not (self._auto_dfa or self._auto_nfa):
-            self.auto_canvas.delete('all')
+            canvas.delete('all')
+            self._auto_drawn = None
             return
-        view = getattr(self, 'auto_view', None).get() if hasattr(self, 'auto_view') else 'dfa'
+        R = 18
+        view = self.auto_view.get()
         if view == 'nfa' and self._auto_nfa:
             nfa = self._auto_nfa
-            states = list({nfa.start} | set(nfa.accepts) | {s for (s,_), _ in nfa.trans.items()} | {t for _, S in nfa.trans.items() for t in S})
-            idx = {s:i for i,s in enumerate(states)}
-            cols = max(1, int(len(states)**0.5))
-            HSPACE = 140; VSPACE = 120; R = 18
-            def pos(i):
-                r = i // cols; c = i % cols
-                return (40 + c*HSPACE, 40 + r*VSPACE)
-            self.auto_canvas.delete('all')
-            for (s, sym), T in nfa.trans.items():
-                for t in T:
-                    x1,y1 = pos(idx[s]); x2,y2 = pos(idx[t])
-                    self.auto_canvas.create_line(x1, y1, x2, y2, fill='#555', arrow='last')
-                    self.auto_canvas.create_text((x1+x2)/2, (y1+y2)/2 - 6, text=(sym or 'ε'), fill='#111')
-            for s in states:
-                x,y = pos(idx[s])
+            drawn = self._auto_drawn
+            if drawn is not None and drawn[0] == 'nfa' and drawn[1] is nfa:
+                return  # NFA não tem destaques por passo
+            states, idx, xs, ys, edges = self._automaton_layout('nfa', nfa)
+            canvas.delete('all')
+            for _, _, sym, x1, y1, x2, y2 in edges:
+                canvas.create_line(x1, y1, x2, y2, fill='#555', arrow='last')
+                canvas.create_text((x1+x2)/2, (y1+y2)/2 - 6, text=sym, fill='#111')
+            for i, s in enumerate(states):
+                x, y = xs[i], ys[i]
                 outline = '#16a34a' if s in nfa.accepts else '#111'
-                self.auto_canvas.create_oval(x-R, y-R, x+R, y+R, outline=outline, width=3, fill='#fff')
+                canvas.create_oval(x-R, y-R, x+R, y+R, outline=outline, width=3, fill='#fff')
                 if s == nfa.start:
-                    self.auto_canvas.create_line(x-30, y, x-R, y, arrow='last')
-                self.auto_canvas.create_text(x, y, text=f"q{idx[s]}")
+                    canvas.create_line(x-30, y, x-R, y, arrow='last')
+                canvas.create_text(x, y, text=f"q{i}")
+            self._auto_drawn = ('nfa', nfa)
             return
         dfa = self._auto_dfa
-        states = list({dfa.start} | {s for s,_ in dfa.trans.keys()} | set(dfa.trans.values()))
-        idx = {s:i for i,s in enumerate(states)}
-        n = len(states)
-        cols = max(1, int(n**0.5))
-        HSPACE = 140; VSPACE = 120; R = 18
-        def pos(i):
-            r = i // cols; c = i % cols
-            return (40 + c*HSPACE, 40 + r*VSPACE)
-        self.auto_canvas.delete('all')
-        # parse highlight
-        edge_hi = None
-        node_hi = set()
-        import re
-        m = re.search(r"Transição: q(\d+) --(.)--> q(\d+)", highlight)
-        if m:
-            edge_hi = (int(m.group(1)), int(m.group(3)), m.group(2))
-        m2 = re.search(r"Novo estado q(\d+)", highlight)
-        if m2:
-            node_hi.add(int(m2.group(1)))
+        states, idx, xs, ys, edges = self._automaton_layout('dfa', dfa)
+        drawn = self._auto_drawn
+        if drawn is None or drawn[0] != 'dfa' or drawn[1] is not dfa:
+            canvas.delete('all')
+            # tags: s<i> = arestas que saem de qi, e<i>_<j> = arestas qi -> qj, n<i> = círculo de qi
+            for si, ti, a, x1, y1, x2, y2 in edges:
+                canvas.create_line(x1, y1, x2, y2, fill='#555', arrow='last', tags=(f's{si}', f'e{si}_{ti}'))
+                canvas.create_text((x1+x2)/2, (y1+y2)/2 - 6, text=a, fill='#111')
+            for i, s in enumerate(states):
+                x, y = xs[i], ys[i]
+                canvas.create_oval(x-R, y-R, x+R, y+R, outline='#111', width=3, fill='#fff', tags=(f'n{i}',))
+                if s == dfa.start:
+                    canvas.create_line(x-30, y, x-R, y, arrow='last')
+                canvas.create_text(x, y, text=f"q{i}")
+            self._auto_drawn = ('dfa', dfa)
+            self._auto_colors = (['#555'] * len(states), ['#111'] * len(states), None)
+        edge_hi, node_hi = _parse_highlight(highlight)
         # build partition color map
-        color_palette = ['#ef4444','#22c55e','#3b82f6','#f59e0b','#8b5cf6','#06b6d4','#84cc16','#e879f9']
         part_color = {}
         if partitions:
             for pi, block in enumerate(partitions):
-                col = color_palette[pi % len(color_palette)]
+                col = _PART_COLORS[pi % len(_PART_COLORS)]
                 for sid in block:
                     part_color[sid] = col
-        for (s,a),t in dfa.trans.items():
-            x1,y1 = pos(idx[s]); x2,y2 = pos(idx[t])
-            mx,my = (x1+x2)/2, (y1+y2)/2
-            base_edge = part_color.get(idx[s], '#555')
-            color = '#d97706' if edge_hi and edge_hi[0]==idx[s] and edge_hi[1]==idx[t] else base_edge
-            self.auto_canvas.create_line(x1, y1, x2, y2, fill=color, arrow='last')
-            self.auto_canvas.create_text(mx, (y1+y2)/2 - 6, text=a, fill='#111')
-        for s in states:
-            x,y = pos(idx[s])
-            base = part_color.get(idx[s], '#111')
-            outline = '#d946ef' if idx[s] in node_hi else (base if base != '#111' else ('#16a34a' if s in dfa.accepts else '#111'))
-            self.auto_canvas.create_oval(x-R, y-R, x+R, y+R, outline=outline, width=3, fill='#fff')
-            if s == dfa.start:
-                self.auto_canvas.create_line(x-30, y, x-R, y, arrow='last')
-            self.auto_canvas.create_text(x, y, text=f"q{idx[s]}")
+        # só os itens cuja cor mudou desde o passo anterior, agrupados por cor:
+        # uma expressão de tags ('s0||s3') por cor nova
+        old_edge, old_node, old_hi = self._auto_colors
+        edge_cols = []
+        node_cols = []
+        edge_buckets = {}
+        node_buckets = {}
+        for i, s in enumerate(states):
+            col = part_color.get(i, '#555')
+            edge_cols.append(col)
+            if col != old_edge[i]:
+                edge_buckets.setdefault(col, []).append(f's{i}')
+            base = part_color.get(i, '#111')
+            outline = '#d946ef' if i in node_hi else (base if base != '#111' else ('#16a34a' if s in dfa.accepts else '#111'))
+            node_cols.append(outline)
+            if outline != old_node[i]:
+                node_buckets.setdefault(outline, []).append(f'n{i}')
+        for col, tags in edge_buckets.items():
+            canvas.itemconfigure('||'.join(tags), fill=col)
+        if old_hi and old_hi != edge_hi and old_hi[0] < len(edge_cols):
+            # devolve à aresta destacada antes a cor da sua origem
+            canvas.itemconfigure(f'e{old_hi[0]}_{old_hi[1]}', fill=edge_cols[old_hi[0]])
+        if edge_hi:
+            canvas.itemconfigure(f'e{edge_hi[0]}_{edge_hi[1]}', fill='#d97706')
+        for col, tags in node_buckets.items():
+            canvas.itemconfigure('||'.join(tags), outline=col)
+        self._auto_colors = (edge_cols, node_cols, edge_hi)
 
     def export_nfa_svg(self):
         if not self._auto_nfa:
-            messagebox.showinfo('Info','Construa o automato primeiro.')
+            self._status('Construa o automato primeiro.', 'warn')
             return
         path = filedialog.asksaveasfilename(defaultextension='.svg', filetypes=[('SVG','.svg')])
         if not path:
@@ -2301,7 +2976,7 @@ msg = num
         try:
             lib = _load_module('labs/11_automatos/automata_lib.py', 'auto_lib')
             lib.automaton_to_svg_nfa(self._auto_nfa, self._auto_alpha or set(), path)
-            messagebox.showinfo('OK', 'SVG exportado.')
+            self._status('SVG exportado.')
         except Exception as e:
             messagebox.showerror('Erro', str(e))
 
@@ -2309,21 +2984,7 @@ msg = num
         # Lê labs/11_automatos/regex_bank.txt e popula o combobox
         self.regex_combo.set('')
         try:
-            bank_path = os.path.join(BASE_DIR, 'labs', '11_automatos', 'regex_bank.txt')
-            examples = []
-            if os.path.isfile(bank_path):
-                with open(bank_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        s = line.strip()
-                        if not s or s.startswith('#'):
-                            continue
-                        parts = [p.strip() for p in s.split(';')]
-                        if not parts:
-                            continue
-                        regex = parts[0]
-                        acc = parts[1] if len(parts) > 1 else ''
-                        rej = parts[2] if len(parts) > 2 else ''
-                        examples.append((regex, acc, rej))
+            examples = _regex_bank()
             self._regex_examples = examples
             self.regex_combo['values'] = [e[0] for e in examples]
             if examples:
@@ -2336,13 +2997,10 @@ msg = num
             idx = self.regex_combo.current()
             if idx < 0:
                 return
-            regex, acc, rej = self._regex_examples[idx]
+            regex, _, _, sample = self._regex_examples[idx]
             self.re_input.delete(0, 'end')
             self.re_input.insert(0, regex)
-            # preenche teste com primeiro aceito, se existir
-            sample = ''
-            if acc:
-                sample = acc.split(',')[0].strip()
+            # preenche teste com primeiro aceito (já separado na leitura do banco), se existir
             self.re_test.delete(0, 'end')
             if sample:
                 self.re_test.insert(0, sample)
@@ -2351,13 +3009,9 @@ msg = num
 
     def fill_automata_example(self):
         try:
-            if hasattr(self, 're_input'):
-                self.re_input.delete(0, 'end'); self.re_input.insert(0, '(a|b)*abb')
-            if hasattr(self, 're_test'):
-                self.re_test.delete(0, 'end'); self.re_test.insert(0, 'abb')
-            if hasattr(self, 'auto_output'):
-                self.auto_output.delete('1.0','end')
-                self.auto_output.insert('end', 'Exemplo preenchido. Clique em "Construir" e depois "Testar Cadeia".\n')
+            self.re_input_var.set('(a|b)*abb')
+            self.re_test_var.set('abb')
+            _set_text(self.auto_output, 'Exemplo preenchido. Clique em "Construir" e depois "Testar Cadeia".\n')
         except Exception as e:
             try:
                 messagebox.showerror('Erro', f'Falha ao preencher exemplo: {e}')
@@ -2366,13 +3020,9 @@ msg = num
 
     def fill_automata_example2(self):
         try:
-            if hasattr(self, 're_input'):
-                self.re_input.delete(0, 'end'); self.re_input.insert(0, 'a(b|c)+')
-            if hasattr(self, 're_test'):
-                self.re_test.delete(0, 'end'); self.re_test.insert(0, 'ab')
-            if hasattr(self, 'auto_output'):
-                self.auto_output.delete('1.0','end')
-                self.auto_output.insert('end', 'Exemplo 2 preenchido. Clique em "Construir" e depois "Testar Cadeia".\n')
+            self.re_input_var.set('a(b|c)+')
+            self.re_test_var.set('ab')
+            _set_text(self.auto_output, 'Exemplo 2 preenchido. Clique em "Construir" e depois "Testar Cadeia".\n')
         except Exception as e:
             try:
                 messagebox.showerror('Erro', f'Falha ao preencher exemplo 2: {e}')
@@ -2387,83 +3037,42 @@ msg = num
         self.cfg_input.pack(fill='x', padx=8)
         btns = ttk.Frame(frame)
         btns.pack(fill='x', padx=8, pady=6)
-        ttk.Button(btns, text='Gerar CFG', command=self.run_cfg).pack(side='left')
-        ttk.Button(btns, text='Vivacidade (IN/OUT)', command=self.run_liveness).pack(side='left', padx=6)
+        self.cfg_btn = ttk.Button(btns, text='Gerar CFG', command=partial(self.run_cfg, background=True))
+        self.cfg_btn.pack(side='left')
+        self.live_btn = ttk.Button(btns, text='Vivacidade (IN/OUT)', command=partial(self.run_liveness, background=True))
+        self.live_btn.pack(side='left', padx=6)
         ttk.Button(btns, text='Intervalos lineares', command=self.run_intervals).pack(side='left')
         ttk.Button(btns, text='Exemplo 1', command=self.fill_cfg_example).pack(side='right')
         ttk.Button(btns, text='Exemplo 2', command=self.fill_cfg_example2).pack(side='right', padx=6)
         ttk.Label(frame, text="Dica: gere CFG e depois Vivacidade; IN/OUT ajuda DCE e Intervalos ajudam na alocação de registradores.").pack(anchor='w', padx=8, pady=(2,0))
-        self.cfg_output = tk.Text(frame)
+        self.cfg_output = tk.Text(frame, **_LOG_TEXT)
         self.cfg_output.pack(fill='both', expand=True, padx=8, pady=6)
         return frame
 
-    def run_cfg(self):
-        self.cfg_output.delete('1.0','end')
-        try:
-            code = []
-            for line in self.cfg_input.get('1.0','end').splitlines():
-                s = line.strip()
-                if not s: continue
-                parts = s.split()
-                op = parts[0].upper()
-                args = tuple(parts[1:])
-                code.append((op, args))
-            lab12 = _load_module('labs/12_grafos/cfg_builder_template.py', 'lab12_cfg')
-            blocks = lab12.split_basic_blocks(code)
-            cfg = lab12.build_cfg(blocks)
-            for b in blocks:
-                self.cfg_output.insert('end', f"Bloco {b.label}: {len(b.instrs)} instrs\n")
-            self.cfg_output.insert('end', '\nCFG:\n')
-            for k,v in cfg.items():
-                self.cfg_output.insert('end', f"  {k} -> {sorted(list(v))}\n")
-        except Exception as e:
-            self.cfg_output.insert('end', f"Erro: {e}\n")
+    def run_cfg(self, background: bool = False):
+        work = partial(_cfg_work, self.cfg_input.get('1.0','end'))
+        self._dispatch(work, partial(_set_text, self.cfg_output), self.cfg_btn if background else None)
 
     def _parse_cfg_input(self):
-        code = []
-        for line in self.cfg_input.get('1.0','end').splitlines():
-            s = line.strip()
-            if not s:
-                continue
-            parts = s.split()
-            op = parts[0].upper()
-            args = tuple(parts[1:])
-            code.append((op, args))
-        return code
-
-    def run_liveness(self):
-        self.cfg_output.delete('1.0','end')
-        try:
-            code = self._parse_cfg_input()
-            lab12 = _load_module('labs/12_grafos/cfg_builder_template.py', 'lab12_cfg')
-            live = _load_module('labs/12_grafos/liveness_template.py', 'lab12_live')
-            blocks = lab12.split_basic_blocks(code)
-            cfg = lab12.build_cfg(blocks)
-            blocks_by_label = {b.label: b.instrs for b in blocks}
-            IN, OUT, USE, DEF = live.liveness(blocks_by_label, cfg)
-            self.cfg_output.insert('end', 'CFG:\n')
-            for k,v in cfg.items():
-                self.cfg_output.insert('end', f"  {k} -> {sorted(list(v))}\n")
-            self.cfg_output.insert('end', '\nUSE/DEF:\n')
-            for b in blocks_by_label:
-                self.cfg_output.insert('end', f"  {b}: USE={sorted(list(USE[b]))} DEF={sorted(list(DEF[b]))}\n")
-            self.cfg_output.insert('end', '\nIN/OUT:\n')
-            for b in blocks_by_label:
-                self.cfg_output.insert('end', f"  {b}: IN={sorted(list(IN[b]))} OUT={sorted(list(OUT[b]))}\n")
-        except Exception as e:
-            self.cfg_output.insert('end', f"Erro: {e}\n")
+        # lista nova a cada chamada; o parse em si fica no cache por texto
+        return list(_parse_cfg_text(self.cfg_input.get('1.0','end')))
+
+    def run_liveness(self, background: bool = False):
+        work = partial(_liveness_work, self.cfg_input.get('1.0','end'))
+        self._dispatch(work, partial(_set_text, self.cfg_output), self.live_btn if background else None)
 
     def run_intervals(self):
-        self.cfg_output.delete('1.0','end')
+        self._status('')
+        parts: List[str] = []
         try:
             code = self._parse_cfg_input()
             live = _load_module('labs/12_grafos/liveness_template.py', 'lab12_live')
             ivals = live.live_intervals_linear(code)
-            self.cfg_output.insert('end', 'Intervalos lineares (posições start..end):\n')
-            for t, (a,b) in sorted(ivals.items()):
-                self.cfg_output.insert('end', f"  {t}: {a}..{b}\n")
+            parts.append('Intervalos lineares (posições start..end):\n')
+            parts.extend(f"  {t}: {a}..{b}\n" for t, (a, b) in sorted(ivals.items()))
         except Exception as e:
-            self.cfg_output.insert('end', f"Erro: {e}\n")
+            parts.append(f"Erro: {e}\n")
+        _set_text(self.cfg_output, ''.join(parts))
 
     def fill_cfg_example(self):
         try:
@@ -2480,12 +3089,10 @@ ADD t1 t1 t4
 LABEL L2
 MOV t4 x
 """.strip()
-            self.cfg_input.delete('1.0','end')
-            self.cfg_input.insert('end', example + "\n")
-            self.cfg_output.delete('1.0','end')
-            self.cfg_output.insert('end', 'Exemplo preenchido. Clique em Gerar CFG ou Vivacidade.\n')
+            _set_text(self.cfg_input, example + "\n")
+            _set_text(self.cfg_output, 'Exemplo preenchido. Clique em Gerar CFG ou Vivacidade.\n')
         except Exception as e:
-            self.cfg_output.insert('end', f"Erro ao preencher exemplo: {e}\n")
+            _append_text(self.cfg_output, f"Erro ao preencher exemplo: {e}\n")
 
     def fill_cfg_example2(self):
         try:
@@ -2505,12 +3112,10 @@ MUL t1 t2 t3
 LABEL L2
 MOV t3 x
 """.strip()
-            self.cfg_input.delete('1.0','end')
-            self.cfg_input.insert('end', example + "\n")
-            self.cfg_output.delete('1.0','end')
-            self.cfg_output.insert('end', 'Exemplo 2 preenchido. Clique em Gerar CFG/Vivacidade/Intervalos.\n')
+            _set_text(self.cfg_input, example + "\n")
+            _set_text(self.cfg_output, 'Exemplo 2 preenchido. Clique em Gerar CFG/Vivacidade/Intervalos.\n')
         except Exception as e:
-            self.cfg_output.insert('end', f"Erro ao preencher exemplo 2: {e}\n")
+            _append_text(self.cfg_output, f"Erro ao preencher exemplo 2: {e}\n")
 
     # ===== Projeto =====
     def _build_project_tab(self, parent):
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Geração de TAC sem recursão (variante do `TacGen.gen_expr` do template).
+
+Ideia:
+- A expressão é percorrida em pós-ordem com uma pilha explícita: folhas viram
+  loadI/load, e um marcador (op,) na pilha emite a operação quando os dois
+  operandos já estão na pilha de valores.
+- Produz exatamente o mesmo TAC (mesmos temporários, mesma ordem) que
+  `TacGen.gen_assign`, mas expressões muito profundas não estouram o limite de
+  recursão do Python e não há um frame por nó.
+- Mesmo duck typing do template: funciona com os nós do Lab 06 ou com classes
+  mínimas que tenham value / name / op+left+right.
+"""
+from typing import List
+
+# Mesmo mapeamento de operadores do TacGen.gen_expr
+_TAC_OPS = {"+": "add", "*": "mul", "==": "cmpeq"}
+
+
+def gen_expr(gen, e) -> str:
+    """Emite o TAC de `e` em `gen` (um TacGen) e devolve o temporário do resultado."""
+    emit = gen.emit
+    newtmp = gen.newtmp
+    vals: List[str] = []
+    stack = [e]
+    while stack:
+        n = stack.pop()
+        if type(n) is tuple:
+            # marcador (op,): operandos esquerdo e direito já avaliados
+            b = vals.pop()
+            a = vals.pop()
+            t = newtmp()
+            emit(n[0], a, b, t)
+            vals.append(t)
+            continue
+        if not hasattr(n, 'op'):
+            if hasattr(n, 'value'):
+                t = newtmp()
+                emit("loadI", str(n.value), t)
+                vals.append(t)
+                continue
+            if hasattr(n, 'name'):
+                t = newtmp()
+                emit("load", n.name, t)
+                vals.append(t)
+                continue
+        elif hasattr(n, 'left') and hasattr(n, 'right'):
+            # direita empilhada antes: a esquerda sai primeiro (ordem do template)
+            stack.append((_TAC_OPS.get(n.op, n.op),))
+            stack.append(n.right)
+            stack.append(n.left)
+            continue
+        raise ValueError(f"Nó de expressão não suportado: {n!r}")
+    return vals[-1]
+
+
+def gen_assign(gen, name: str, e) -> None:
+    t = gen_expr(gen, e)
+    gen.emit("store", t, name)
+
+
+def demo():
+    import importlib.util, os
+    p = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tac_template.py')
+    spec = importlib.util.spec_from_file_location('tac_template', p)
+    tac = importlib.util.module_from_spec(spec); spec.loader.exec_module(tac)
+
+    class Num:
+        def __init__(self, v): self.value=v
+    class BinOp:
+        def __init__(self, op,l,r): self.op=op; self.left=l; self.right=r
+
+    # x = 1 + (1 + (1 + ...)): profundo demais para o gen_expr recursivo
+    e = Num(1)
+    for _ in range(5000):
+        e = BinOp("+", Num(1), e)
+    g = tac.TacGen()
+    gen_assign(g, "x", e)
+    print(f"{len(g.code)} instruções; últimas:")
+    for i in g.code[-2:]:
+        print(i.op, *i.args)
+
+
+if __name__ == "__main__":
+    demo()
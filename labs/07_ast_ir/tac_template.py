@@ -40,7 +40,7 @@ class TacGen:
             op = {"+": "add", "*": "mul", "==": "cmpeq"}.get(getattr(e, 'op'), getattr(e, 'op'))
             self.emit(op, a, b, t)
             return t
-        raise NotImplementedError(e)
+        raise ValueError(f"Nó de expressão não suportado: {e!r}")
 
     def gen_assign(self, name: str, e) -> None:
         t = self.gen_expr(e)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Otimização peephole sobre o assembly do Lab 08 (MOVI/MOV/ADD/MUL/CMPEQ).
+
+Ideia:
+- Uma varredura da esquerda para a direita com janela de 1 ou 2 instruções;
+  cada regra de PATTERNS devolve a sequência que substitui a janela (ou None).
+- Depois de uma troca a varredura recua uma posição: a instrução nova pode
+  casar com a anterior (ex.: MOVI propagado em cascata até virar uma constante).
+- Só temporários/registradores (t1, r0, ...) são eliminados, e apenas quando
+  não são lidos adiante; variáveis em memória (x, y, spill_tN) ficam intactas.
+  Os valores finais em memória no simulador (Lab 10) não mudam; registradores
+  eliminados simplesmente não aparecem mais.
+"""
+import re
+from typing import List, Optional, Tuple
+
+Instr = Tuple[str, Tuple[str, ...]]
+
+_TEMP_RE = re.compile(r"^[tr]\d+$")
+_ARITH = {'ADD': lambda a, b: a + b, 'MUL': lambda a, b: a * b,
+          'CMPEQ': lambda a, b: 1 if a == b else 0}
+
+
+def _is_temp(x: str) -> bool:
+    return bool(_TEMP_RE.match(x))
+
+
+def _is_imm(x: str) -> bool:
+    return x.lstrip('-').isdigit()
+
+
+def _reads(op: str, args: Tuple[str, ...]) -> Tuple[str, ...]:
+    if op == 'MOVI':
+        return ()
+    if op == 'MOV' or op in _ARITH:
+        return args[:-1]
+    return args  # desconhecida (;UNK ...): tudo conta como leitura
+
+
+def _dead_after(code: List[Instr], j: int, r: str) -> bool:
+    """r não é lido a partir de code[j] antes de ser redefinido."""
+    for op, args in code[j:]:
+        if r in _reads(op, args):
+            return False
+        if args and args[-1] == r and (op == 'MOVI' or op == 'MOV' or op in _ARITH):
+            return True
+    return True
+
+
+def _self_move(code: List[Instr], i: int) -> Optional[List[Instr]]:
+    # MOV a a -> (nada)
+    op, args = code[i]
+    if op == 'MOV' and args[0] == args[1]:
+        return []
+    return None
+
+
+def _fold_imm(code: List[Instr], i: int) -> Optional[List[Instr]]:
+    # ADD 1 2 d -> MOVI 3 d ; ADD a 0 d -> MOV a d ; MUL a 1 d -> MOV a d
+    op, args = code[i]
+    if op not in _ARITH:
+        return None
+    a, b, d = args
+    if _is_imm(a) and _is_imm(b):
+        return [('MOVI', (str(_ARITH[op](int(a), int(b))), d))]
+    neutral = '0' if op == 'ADD' else '1' if op == 'MUL' else None
+    if neutral is not None:
+        if b == neutral:
+            return [('MOV', (a, d))]
+        if a == neutral:
+            return [('MOV', (b, d))]
+    return None
+
+
+def _movi_forward(code: List[Instr], i: int) -> Optional[List[Instr]]:
+    # MOVI k t ; OP ... t ... -> OP ... k ...   (t morto depois)
+    op, args = code[i]
+    if op != 'MOVI' or not _is_temp(args[1]):
+        return None
+    k, t = args
+    op2, args2 = code[i + 1]
+    if t not in _reads(op2, args2) or not (op2 == 'MOV' or op2 in _ARITH):
+        return None
+    if not _dead_after(code, i + 2, t) and args2[-1] != t:
+        return None
+    if op2 == 'MOV':
+        return [('MOVI', (k, args2[1]))]
+    return [(op2, tuple(k if x == t else x for x in args2[:-1]) + (args2[-1],))]
+
+
+def _forward_dst(code: List[Instr], i: int) -> Optional[List[Instr]]:
+    # OP ... t ; MOV t x -> OP ... x   (t morto depois)
+    op, args = code[i]
+    if not (op == 'MOVI' or op == 'MOV' or op in _ARITH) or not _is_temp(args[-1]):
+        return None
+    t = args[-1]
+    op2, args2 = code[i + 1]
+    if op2 != 'MOV' or args2[0] != t or not _dead_after(code, i + 2, t):
+        return None
+    return [(op, args[:-1] + (args2[1],))]
+
+
+# (tamanho da janela, regra)
+PATTERNS = [
+    (1, _self_move),
+    (1, _fold_imm),
+    (2, _movi_forward),
+    (2, _forward_dst),
+]
+
+
+def run(prog: List[Instr]) -> List[Instr]:
+    """Aplica PATTERNS até nenhuma regra casar; devolve uma lista nova de (op, args)."""
+    code = list(prog)
+    i = 0
+    while i < len(code):
+        for size, rule in PATTERNS:
+            if i + size > len(code):
+                continue
+            rep = rule(code, i)
+            if rep is not None:
+                code[i:i + size] = rep
+                i = max(i - 1, 0)
+                break
+        else:
+            i += 1
+    return code
+
+
+def demo():
+    # x = (y + 0) * 1: as regras em cascata reduzem a um único MOV
+    prog = [
+        ('MOVI', ('0', 't2')),
+        ('ADD', ('y', 't2', 't3')),
+        ('MOVI', ('1', 't1')),
+        ('MUL', ('t3', 't1', 't4')),
+        ('MOV', ('t4', 'x')),
+        ('MOV', ('x', 'x')),
+    ]
+    for op, args in run(prog):
+        print(op, *args)
+
+
+if __name__ == '__main__':
+    demo()
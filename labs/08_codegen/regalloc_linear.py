@@ -12,6 +12,7 @@ Ideia:
 Observação: o simulador (Lab 10) foi ajustado para considerar nomes que começam
 com 't' ou 'r' como registradores.
 """
+from bisect import insort
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Iterable
 import re
@@ -87,29 +88,20 @@ def allocate_registers(tac: List[Tac], k: int = 3) -> Dict[str, str]:
     """Retorna um mapeamento temp->(rX|spill_tN) usando linear-scan com K registradores.
     """
     intervals = live_intervals(tac)
-    regs = [f"r{i}" for i in range(k)]
-    free: List[str] = regs.copy()
-    # active: list of (end, temp, reg) sorted by end
+    free: List[str] = [f"r{i}" for i in range(k)]
+    # active: (end, temp, reg) sempre ordenada por end (bisect.insort), então
+    # os intervalos que expiram estão no início e o de maior end no fim
     active: List[Tuple[int, str, str]] = []
     mapping: Dict[str, str] = {}
 
-    def expire_old(start: int):
-        nonlocal active, free
-        still: List[Tuple[int, str, str]] = []
-        for end, t, r in active:
-            if end >= start:
-                still.append((end, t, r))
-            else:
-                free.append(r)
-        active = sorted(still)
-
     for it in intervals:
-        expire_old(it.start)
+        # expira os que terminaram antes deste início, liberando os registradores
+        while active and active[0][0] < it.start:
+            free.append(active.pop(0)[2])
         if free:
             r = free.pop()
             mapping[it.temp] = r
-            active.append((it.end, it.temp, r))
-            active.sort()
+            insort(active, (it.end, it.temp, r))
         else:
             # spill o com maior end (último)
             spill_end, spill_t, spill_r = active[-1]
@@ -117,8 +109,8 @@ def allocate_registers(tac: List[Tac], k: int = 3) -> Dict[str, str]:
                 # troca: novo ocupa registrador, spill vai para memória
                 mapping[it.temp] = spill_r
                 mapping[spill_t] = f"spill_{spill_t}"
-                active[-1] = (it.end, it.temp, spill_r)
-                active.sort()
+                active.pop()
+                insort(active, (it.end, it.temp, spill_r))
             else:
                 # mantém spill do atual
                 mapping[it.temp] = f"spill_{it.temp}"
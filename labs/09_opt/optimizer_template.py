@@ -56,6 +56,20 @@ def dead_code_elim(tac: List[Tac], live_vars: List[str]) -> List[Tac]:
     return list(reversed(out))
 
 
+def fold_and_dce(tac: List[Tac], live_vars: List[str]) -> List[Tac]:
+    """Folding seguido de DCE, repetidos até o ponto fixo.
+
+    O folding pode deixar produtores sem uso (que o DCE remove) e o DCE nunca cria
+    trabalho novo para o folding, então em geral a segunda rodada já não muda nada.
+    """
+    cur = list(tac)
+    while True:
+        nxt = dead_code_elim(const_folding(cur), live_vars)
+        if nxt == cur:
+            return nxt
+        cur = nxt
+
+
 def demo():
     tac = [
         ('loadI', ('1','t1')),
@@ -74,6 +88,8 @@ def demo():
     for i in tac2: print(i)
     print('--- dce')
     for i in tac3: print(i)
+    print('--- fold+dce (ponto fixo)')
+    for i in fold_and_dce(tac, live_vars=['x']): print(i)
 
 
 if __name__ == '__main__':
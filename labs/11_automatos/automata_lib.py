@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+from array import array
 from dataclasses import dataclass
 from typing import Dict, Set, Tuple, List, Optional, Tuple as Tup
 
@@ -275,6 +276,11 @@ def nfa_to_dfa(nfa: NFA, alphabet: Set[str]) -> DFA:
 
 def nfa_to_dfa_steps(nfa: NFA, alphabet: Set[str]):
     """Gera passos (texto) da construção por subconjuntos."""
+    return nfa_to_dfa_with_steps(nfa, alphabet)[1]
+
+
+def nfa_to_dfa_with_steps(nfa: NFA, alphabet: Set[str]) -> Tup[DFA, List[str]]:
+    """Construção por subconjuntos com passos (texto); retorna (dfa, steps)."""
     steps: List[str] = []
     start_set = frozenset(_eclose(nfa, {nfa.start}))
     dfa_states: Dict[frozenset, State] = {start_set: State(0)}
@@ -301,20 +307,55 @@ def nfa_to_dfa_steps(nfa: NFA, alphabet: Set[str]):
                 dfa_states[T] = State(next_id); steps.append(f"Novo estado q{next_id} = ε-closure(move({[q.id for q in S]}, '{a}')) = {sorted([t.id for t in T])}"); next_id += 1; work.append(T)
             trans[(s_id, a)] = dfa_states[T]
             steps.append(f"Transição: q{s_id.id} --{a}--> q{dfa_states[T].id}")
-    return steps
+    return DFA(start=dfa_states[start_set], accepts=accepts, trans=trans), steps
+
+
+def dfa_table(dfa: DFA, alphabet: Set[str]):
+    """Tabela densa de transições do DFA: (states, syms, table).
+
+    table é um array('i') plano com uma linha por estado e uma coluna por símbolo
+    (syms ordenados); table[i*len(syms) + c] é o índice do destino ou -1.
+    """
+    states = list({dfa.start} | set(dfa.accepts) | {s for s,_ in dfa.trans.keys()} | set(dfa.trans.values()))
+    idx = {s:i for i,s in enumerate(states)}
+    syms = sorted(alphabet)
+    col = {a:c for c,a in enumerate(syms)}
+    m = len(syms)
+    table = array('i', [-1]) * (len(states) * m)
+    for (s,a), t in dfa.trans.items():
+        c = col.get(a)
+        if c is not None:
+            table[idx[s]*m + c] = idx[t]
+    return states, syms, table
+
+
+def _preimages(n: int, syms: List[str], table) -> Dict[str, List[List[int]]]:
+    """pre[a][j]: índices dos estados que vão para j pela letra a (uma coluna da tabela)."""
+    m = len(syms)
+    pre: Dict[str, List[List[int]]] = {}
+    for c, a in enumerate(syms):
+        pa: List[List[int]] = [[] for _ in range(n)]
+        for i, j in enumerate(table[c::m]):
+            if j >= 0:
+                pa[j].append(i)
+        pre[a] = pa
+    return pre
 
 
 def dfa_minimize(dfa: DFA, alphabet: Set[str]) -> DFA:
-    # Hopcroft
-    all_states = set([dfa.start]) | set([s for s,_ in dfa.trans.keys()]) | set(dfa.trans.values()) | set(dfa.accepts)
-    P = [set(dfa.accepts), all_states - set(dfa.accepts)]
-    W = [set(dfa.accepts)]
-    def trans_to(s: State, a: str) -> Optional[State]:
-        return dfa.trans.get((s, a))
+    # Hopcroft sobre índices densos da tabela (blocos = conjuntos de int)
+    states, syms, table = dfa_table(dfa, alphabet)
+    pre = _preimages(len(states), syms, table)
+    acc = set(dfa.accepts)
+    A0 = {i for i, s in enumerate(states) if s in acc}
+    P = [A0, set(range(len(states))) - A0]
+    W = [set(A0)]
     while W:
         A = W.pop()
         for a in alphabet:
-            X = set(s for s in all_states if trans_to(s,a) in A)
+            # X = estados que caem em A pela letra a: união das pré-imagens, sem varrer todos
+            pa = pre[a]
+            X = {s for t in A for s in pa[t]}
             newP = []
             for Y in P:
                 i = Y & X
@@ -328,13 +369,15 @@ def dfa_minimize(dfa: DFA, alphabet: Set[str]) -> DFA:
                 else:
                     newP.append(Y)
             P = newP
-    # construir DFA reduzido
-    rep = {next(iter(B)): idx for idx,B in enumerate(P) if B}
+    return _quotient(dfa, [{states[i] for i in B} for B in P])
+
+
+def _quotient(dfa: DFA, P: List[Set[State]]) -> DFA:
+    """DFA reduzido: um estado por bloco não vazio da partição P."""
     state_map: Dict[State, State] = {}
     for B in P:
         if not B: continue
         ridx = len(state_map)
-        srep = next(iter(B))
         snew = State(ridx)
         for s in B:
             state_map[s] = snew
@@ -351,20 +394,33 @@ def dfa_minimize_steps(dfa: DFA, alphabet: Set[str]) -> Tup[List[str], List[List
     Retorna (steps, snapshots), onde snapshots é uma lista de partições; cada partição é
     uma lista de blocos, e cada bloco é uma lista de ids de estados.
     """
+    _, steps, snaps = dfa_minimize_with_steps(dfa, alphabet)
+    return steps, snaps
+
+
+def dfa_minimize_with_steps(dfa: DFA, alphabet: Set[str]) -> Tup[DFA, List[str], List[List[List[int]]]]:
+    """Como dfa_minimize_steps, mas também retorna o DFA mínimo: (dfa, steps, snapshots)."""
     steps: List[str] = []
     snaps: List[List[List[int]]] = []
-    all_states = set([dfa.start]) | set([s for s,_ in dfa.trans.keys()]) | set(dfa.trans.values()) | set(dfa.accepts)
-    P = [set(dfa.accepts), all_states - set(dfa.accepts)]
-    W = [set(dfa.accepts)]
-    steps.append(f"Partição inicial: A={sorted([s.id for s in P[0]])}, N={sorted([s.id for s in P[1]])}")
-    snaps.append([sorted([s.id for s in B]) for B in P if B])
-    def trans_to(s: State, a: str) -> Optional[State]:
-        return dfa.trans.get((s, a))
+    states, syms, table = dfa_table(dfa, alphabet)
+    pre = _preimages(len(states), syms, table)
+    acc = set(dfa.accepts)
+    A0 = {i for i, s in enumerate(states) if s in acc}
+    P = [A0, set(range(len(states))) - A0]
+    W = [set(A0)]
+
+    def ids(B) -> List[int]:
+        return sorted([states[i].id for i in B])
+
+    steps.append(f"Partição inicial: A={ids(P[0])}, N={ids(P[1])}")
+    snaps.append([ids(B) for B in P if B])
     while W:
         A = W.pop()
-        steps.append(f"Refina com A={sorted([s.id for s in A])}")
+        steps.append(f"Refina com A={ids(A)}")
         for a in sorted(alphabet):
-            X = set(s for s in all_states if trans_to(s,a) in A)
+            # X = estados que caem em A pela letra a: união das pré-imagens, sem varrer todos
+            pa = pre[a]
+            X = {s for t in A for s in pa[t]}
             newP = []
             for Y in P:
                 i = Y & X
@@ -375,54 +431,58 @@ def dfa_minimize_steps(dfa: DFA, alphabet: Set[str]) -> Tup[List[str], List[List
                         W.remove(Y); W.extend([i,d])
                     else:
                         W.append(i if len(i) <= len(d) else d)
-                    steps.append(f"Divide {sorted([s.id for s in Y])} em {sorted([s.id for s in i])} e {sorted([s.id for s in d])} pela letra '{a}'")
+                    steps.append(f"Divide {ids(Y)} em {ids(i)} e {ids(d)} pela letra '{a}'")
                 else:
                     newP.append(Y)
             P = newP
-            snaps.append([sorted([s.id for s in B]) for B in P if B])
-    steps.append("Partição final: " + ", ".join([str(sorted([s.id for s in B])) for B in P if B]))
-    snaps.append([sorted([s.id for s in B]) for B in P if B])
-    return steps, snaps
+            snaps.append([ids(B) for B in P if B])
+    steps.append("Partição final: " + ", ".join([str(ids(B)) for B in P if B]))
+    snaps.append([ids(B) for B in P if B])
+    return _quotient(dfa, [{states[i] for i in B} for B in P]), steps, snaps
 
 
-def export_dot_nfa(nfa: NFA, path: str):
-    """Exporta NFA em formato DOT (Graphviz)."""
-    lines = ["digraph NFA {", "  rankdir=LR;", "  node [shape=circle];"]
-    # estados
-    states = list({nfa.start} | set(nfa.accepts) | {s for (s,_), _ in nfa.trans.items()} | {t for _, S in nfa.trans.items() for t in S})
-    idx = {s:i for i,s in enumerate(states)}
+def materialize(aut):
+    """Estados (ordem estável), índice e arestas (i, rótulo, j) de um NFA/DFA.
+
+    Calculado uma vez e compartilhado pelos exports DOT/SVG do mesmo autômato.
+    """
+    if isinstance(aut, NFA):
+        states = list({aut.start} | set(aut.accepts) | {s for (s,_), _ in aut.trans.items()} | {t for _, S in aut.trans.items() for t in S})
+        idx = {s:i for i,s in enumerate(states)}
+        edges = [(idx[s], sym if sym is not None else 'ε', idx[t]) for (s, sym), T in aut.trans.items() for t in T]
+    else:
+        states = list({aut.start} | {s for s,_ in aut.trans.keys()} | set(aut.trans.values()))
+        idx = {s:i for i,s in enumerate(states)}
+        edges = [(idx[s], a, idx[t]) for (s,a), t in aut.trans.items()]
+    return states, idx, edges
+
+
+def _export_dot(name: str, aut, graph, path: str):
+    states, idx, edges = graph or materialize(aut)
+    lines = [f"digraph {name} {{", "  rankdir=LR;", "  node [shape=circle];"]
     # início
     lines.append("  __start [shape=point];")
-    lines.append(f"  __start -> q{idx[nfa.start]};")
+    lines.append(f"  __start -> q{idx[aut.start]};")
     # finais
     for s in states:
-        shape = 'doublecircle' if s in nfa.accepts else 'circle'
+        shape = 'doublecircle' if s in aut.accepts else 'circle'
         lines.append(f"  q{idx[s]} [shape={shape}];")
     # transições
-    for (s, sym), T in nfa.trans.items():
-        for t in T:
-            label = sym if sym is not None else 'ε'
-            lines.append(f"  q{idx[s]} -> q{idx[t]} [label=\"{label}\"];")
+    for i, label, j in edges:
+        lines.append(f"  q{i} -> q{j} [label=\"{label}\"];")
     lines.append("}")
     with open(path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(lines))
 
 
-def export_dot_dfa(dfa: DFA, path: str):
-    """Exporta DFA em formato DOT (Graphviz)."""
-    lines = ["digraph DFA {", "  rankdir=LR;", "  node [shape=circle];"]
-    states = list({dfa.start} | {s for s,_ in dfa.trans.keys()} | set(dfa.trans.values()))
-    idx = {s:i for i,s in enumerate(states)}
-    lines.append("  __start [shape=point];")
-    lines.append(f"  __start -> q{idx[dfa.start]};")
-    for s in states:
-        shape = 'doublecircle' if s in dfa.accepts else 'circle'
-        lines.append(f"  q{idx[s]} [shape={shape}];")
-    for (s,a), t in dfa.trans.items():
-        lines.append(f"  q{idx[s]} -> q{idx[t]} [label=\"{a}\"];")
-    lines.append("}")
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+def export_dot_nfa(nfa: NFA, path: str, graph=None):
+    """Exporta NFA em formato DOT (Graphviz). graph: resultado de materialize(nfa)."""
+    _export_dot('NFA', nfa, graph, path)
+
+
+def export_dot_dfa(dfa: DFA, path: str, graph=None):
+    """Exporta DFA em formato DOT (Graphviz). graph: resultado de materialize(dfa)."""
+    _export_dot('DFA', dfa, graph, path)
 
 
 # ===== Execução e SVG =====
@@ -436,10 +496,9 @@ def dfa_accepts(dfa: DFA, s: List[str]) -> bool:
     return q in dfa.accepts
 
 
-def automaton_to_svg_dfa(dfa: DFA, alphabet: Set[str], path: str):
+def _export_svg(aut, graph, acc_color: str, path: str):
     # Layout simples em grade
-    states = list({dfa.start} | {s for s,_ in dfa.trans.keys()} | set(dfa.trans.values()))
-    idx = {s:i for i,s in enumerate(states)}
+    states, idx, edges = graph or materialize(aut)
     n = len(states)
     cols = max(1, int(n**0.5))
     HSPACE = 140; VSPACE = 120; R = 24
@@ -447,20 +506,20 @@ def automaton_to_svg_dfa(dfa: DFA, alphabet: Set[str], path: str):
         r = i // cols; c = i % cols
         return (60 + c*HSPACE, 60 + r*VSPACE)
     parts = ["<svg xmlns='http://www.w3.org/2000/svg' width='1000' height='800'>",
-             "<style>.st{fill:#fff;stroke:#111;stroke-width:2}.acc{stroke:#3b82f6;stroke-width:3}.txt{font:12px sans-serif}.edge{stroke:#555;stroke-width:1;fill:none;marker-end:url(#a)}.lbl{font:11px sans-serif;fill:#111}</style>",
+             f"<style>.st{{fill:#fff;stroke:#111;stroke-width:2}}.acc{{stroke:{acc_color};stroke-width:3}}.txt{{font:12px sans-serif}}.edge{{stroke:#555;stroke-width:1;fill:none;marker-end:url(#a)}}.lbl{{font:11px sans-serif;fill:#111}}</style>",
              "<defs><marker id='a' markerWidth='10' markerHeight='7' refX='10' refY='3.5' orient='auto'><polygon points='0 0, 10 3.5, 0 7' fill='#555'/></marker></defs>"]
     # edges
-    for (s,a),t in dfa.trans.items():
-        x1,y1 = pos(idx[s]); x2,y2 = pos(idx[t])
-        mx,my = (x1+x2)/2, (y1+y2)/2
+    for i, label, j in edges:
+        x1,y1 = pos(i); x2,y2 = pos(j)
+        mx = (x1+x2)/2
         parts.append(f"<path class='edge' d='M {x1} {y1} C {mx} {y1}, {mx} {y2}, {x2} {y2}' />")
-        parts.append(f"<text class='lbl' x='{mx}' y='{(y1+y2)/2 - 6}' text-anchor='middle'>{a}</text>")
+        parts.append(f"<text class='lbl' x='{mx}' y='{(y1+y2)/2 - 6}' text-anchor='middle'>{label}</text>")
     # nodes
     for s in states:
         x,y = pos(idx[s])
-        klass = 'st acc' if s in dfa.accepts else 'st'
+        klass = 'st acc' if s in aut.accepts else 'st'
         parts.append(f"<circle class='{klass}' cx='{x}' cy='{y}' r='{R}' />")
-        if s == dfa.start:
+        if s == aut.start:
             parts.append(f"<path class='edge' d='M {x-50} {y} L {x-R} {y}' />")
         parts.append(f"<text class='txt' x='{x}' y='{y+4}' text-anchor='middle'>q{idx[s]}</text>")
     parts.append("</svg>")
@@ -468,35 +527,10 @@ def automaton_to_svg_dfa(dfa: DFA, alphabet: Set[str], path: str):
         f.write('\n'.join(parts))
 
 
-def automaton_to_svg_nfa(nfa: NFA, alphabet: Set[str], path: str):
-    # Layout simples: enumerar estados e desenhar transições com rótulos (inclui ε)
-    states = list({nfa.start} | set(nfa.accepts) | {s for (s,_), _ in nfa.trans.items()} | {t for _, S in nfa.trans.items() for t in S})
-    idx = {s:i for i,s in enumerate(states)}
-    n = len(states)
-    cols = max(1, int(n**0.5))
-    HSPACE = 140; VSPACE = 120; R = 24
-    def pos(i):
-        r = i // cols; c = i % cols
-        return (60 + c*HSPACE, 60 + r*VSPACE)
-    parts = ["<svg xmlns='http://www.w3.org/2000/svg' width='1000' height='800'>",
-             "<style>.st{fill:#fff;stroke:#111;stroke-width:2}.acc{stroke:#16a34a;stroke-width:3}.txt{font:12px sans-serif}.edge{stroke:#555;stroke-width:1;fill:none;marker-end:url(#a)}.lbl{font:11px sans-serif;fill:#111}</style>",
-             "<defs><marker id='a' markerWidth='10' markerHeight='7' refX='10' refY='3.5' orient='auto'><polygon points='0 0, 10 3.5, 0 7' fill='#555'/></marker></defs>"]
-    # edges
-    for (s, sym), T in nfa.trans.items():
-        for t in T:
-            x1,y1 = pos(idx[s]); x2,y2 = pos(idx[t])
-            mx,my = (x1+x2)/2, (y1+y2)/2
-            parts.append(f"<path class='edge' d='M {x1} {y1} C {mx} {y1}, {mx} {y2}, {x2} {y2}' />")
-            label = sym if sym is not None else 'ε'
-            parts.append(f"<text class='lbl' x='{mx}' y='{(y1+y2)/2 - 6}' text-anchor='middle'>{label}</text>")
-    # nodes
-    for s in states:
-        x,y = pos(idx[s])
-        klass = 'st acc' if s in nfa.accepts else 'st'
-        parts.append(f"<circle class='{klass}' cx='{x}' cy='{y}' r='{R}' />")
-        if s == nfa.start:
-            parts.append(f"<path class='edge' d='M {x-50} {y} L {x-R} {y}' />")
-        parts.append(f"<text class='txt' x='{x}' y='{y+4}' text-anchor='middle'>q{idx[s]}</text>")
-    parts.append("</svg>")
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(parts))
+def automaton_to_svg_dfa(dfa: DFA, alphabet: Set[str], path: str, graph=None):
+    _export_svg(dfa, graph, '#3b82f6', path)
+
+
+def automaton_to_svg_nfa(nfa: NFA, alphabet: Set[str], path: str, graph=None):
+    # Enumera estados e desenha transições com rótulos (inclui ε)
+    _export_svg(nfa, graph, '#16a34a', path)
@@ -5,12 +5,14 @@ Template de vivacidade (liveness) e intervalos a partir de código (TAC/Assembly
 Fornece:
 - compute_use_def(block): USE/DEF por bloco básico.
 - liveness(blocks, succ): IN/OUT por bloco via iteração backward.
+- liveness_bits(blocks, succ, pred=None): o mesmo ponto fixo com conjuntos como
+  bitsets (int) e worklist em pós-ordem; liveness continua sendo a referência, com set.
 - live_intervals_linear(code): intervalos por posição para temporários tN.
 
 Integra com cfg_builder_template.py para gerar blocos e CFG a partir de código
 com rótulos e saltos ('LABEL', 'JMP', 'CJMP').
 """
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import re
 
 Instr = Tuple[str, Tuple[str, ...]]
@@ -77,6 +79,116 @@ def liveness(blocks: Dict[str, List[Instr]], succ: Dict[str, Set[str]]):
     return IN, OUT, USE, DEF
 
 
+def _postorder(succ: List[List[int]]) -> List[int]:
+    """Pós-ordem via DFS iterativa; raízes em ordem de id (entrada = 0)."""
+    order: List[int] = []
+    seen = bytearray(len(succ))
+    for r in range(len(succ)):
+        if seen[r]:
+            continue
+        seen[r] = 1
+        stack = [(r, iter(succ[r]))]
+        while stack:
+            b, it = stack[-1]
+            for s in it:
+                if not seen[s]:
+                    seen[s] = 1
+                    stack.append((s, iter(succ[s])))
+                    break
+            else:
+                stack.pop()
+                order.append(b)
+    return order
+
+
+def _live_kernel(use: List[int], kill: List[int], succ: List[List[int]],
+                 pred: List[List[int]], order: List[int]) -> Tuple[List[int], List[int]]:
+    """Ponto fixo da vivacidade só com inteiros (blocos 0..B-1, máscaras int).
+
+    Worklist em pilha semeada em pós-ordem (saídas primeiro); quando IN[b] muda,
+    só os predecessores de b voltam à pilha; in_work evita duplicatas.
+    """
+    n = len(use)
+    in_ = [0] * n
+    out = [0] * n
+    in_work = bytearray(n)
+    stack = order[::-1]
+    for b in stack:
+        in_work[b] = 1
+    while stack:
+        b = stack.pop()
+        in_work[b] = 0
+        m = 0
+        for s in succ[b]:
+            m |= in_[s]
+        out[b] = m
+        m = use[b] | (m & kill[b])
+        if m != in_[b]:
+            in_[b] = m
+            for p in pred[b]:
+                if not in_work[p]:
+                    in_work[p] = 1
+                    stack.append(p)
+    return in_, out
+
+
+def liveness_bits(blocks: Dict[str, List[Instr]], succ: Dict[str, Set[str]],
+                  pred: Optional[Dict[str, List[str]]] = None):
+    """Vivacidade com bitsets: retorna (IN, OUT, USE, DEF, names), com máscaras int.
+
+    O bit i representa names[i]; names está em ordem alfabética, então
+    bits_to_names já devolve as listas ordenadas. Blocos e variáveis viram ids
+    densos e o laço (_live_kernel) só mexe com listas de ints. pred (CFG reverso)
+    pode vir pronto de quem já o calculou; senão é montado a partir de succ.
+    """
+    label2id = {b: i for i, b in enumerate(blocks)}
+    n = len(label2id)
+    use_sets: List[Set[str]] = []
+    def_sets: List[Set[str]] = []
+    for instrs in blocks.values():
+        u, d = compute_use_def(instrs)
+        use_sets.append(u)
+        def_sets.append(d)
+    names = sorted(set().union(*use_sets, *def_sets))
+    bit = {x: 1 << i for i, x in enumerate(names)}
+
+    def mask(xs: Set[str]) -> int:
+        m = 0
+        for x in xs:
+            m |= bit[x]
+        return m
+
+    use = [mask(u) for u in use_sets]
+    defs = [mask(d) for d in def_sets]
+    succ_ids: List[List[int]] = [[] for _ in range(n)]
+    for b, ss in succ.items():
+        if b in label2id:
+            succ_ids[label2id[b]] = sorted(label2id[s] for s in ss if s in label2id)
+    if pred is None:
+        pred_ids: List[List[int]] = [[] for _ in range(n)]
+        for b, ss in enumerate(succ_ids):
+            for s in ss:
+                pred_ids[s].append(b)
+    else:
+        pred_ids = [[label2id[p] for p in pred.get(b, ()) if p in label2id] for b in blocks]
+    in_, out = _live_kernel(use, [~d for d in defs], succ_ids, pred_ids, _postorder(succ_ids))
+    labels = list(blocks)
+    return (dict(zip(labels, in_)), dict(zip(labels, out)),
+            dict(zip(labels, use)), dict(zip(labels, defs)), names)
+
+
+def bits_to_names(m: int, names: List[str]) -> List[str]:
+    """Nomes dos bits ligados em m, na ordem de names."""
+    out: List[str] = []
+    i = 0
+    while m:
+        if m & 1:
+            out.append(names[i])
+        m >>= 1
+        i += 1
+    return out
+
+
 def live_intervals_linear(code: List[Instr]) -> Dict[str, Tuple[int,int]]:
     starts: Dict[str, int] = {}
     ends: Dict[str, int] = {}
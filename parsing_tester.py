@@ -34,6 +34,11 @@ from dataclasses import dataclass
 from typing import Dict, List, Set, Tuple, Optional, Iterable, FrozenSet
 import json
 
+try:  # opcional: JSON mais rápido para árvores grandes
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 EPS = "ε"
 END = "$"
 
@@ -928,6 +933,10 @@ def export_tree_json(root: ParseTreeNode, path: str, derivations: Optional[List[
     }
     if derivations is not None:
         data["derivations"] = [{"A": A, "rhs": (rhs if rhs != [EPS] else [EPS])} for (A, rhs) in derivations]
+    if _orjson is not None:
+        with open(path, "wb") as f:
+            f.write(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
@@ -1408,7 +1417,7 @@ def main(argv=None):
     if args.auto_lex:
         tokens = auto_lex(args.input_str, g)
     else:
-        tokens = [t for t in args.input_str.strip().split() if t]
+        tokens = args.input_str.split()
 
     print("=== Gramática ===")
     print(g)